@@ -9,6 +9,11 @@ setup(
     package_dir={'': 'src'},
     packages=find_packages(where='src'),
     install_requires=requirements_list,
+    extras_require={
+        'numpy': ['numpy'],
+        'orjson': ['orjson'],
+        'ujson': ['ujson']
+    },
 
     author='Ben Keller',
     author_email='bjkeller@uw.edu',
@@ -22,3 +22,8 @@ from cp_request.experimental_request import (
 )
 
 from cp_request.visitor import RequestVisitor
+
+from cp_request.request_decoder import RequestDecoder
+from cp_request.request_encoder import RequestEncoder, dump_stream
+from cp_request.request_reader import RequestReader, read_request
+from cp_request.serialization import dumps, loads
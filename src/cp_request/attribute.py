@@ -1,10 +1,14 @@
+from __future__ import annotations
 import abc
 import json
 from cp_request import (
     Unit, UnitEncoder, UnitDecoder,
     Value, ValueEncoder, ValueDecoder
 )
-from transform import RequestTransformer
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from transform import RequestTransformer
 
 
 class Attribute:
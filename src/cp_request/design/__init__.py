@@ -11,6 +11,9 @@ from cp_request.design.replicate_block import ReplicateBlock
 
 from cp_request.design.sum_block import SumBlock
 from cp_request.design.design_block import DesignBlock
+from cp_request.design.sample_index import (
+    SampleIndex, quantize, sample_key, term_key
+)
 
 from cp_request.design.json_serialization import (
     BlockDefinitionEncoder, BlockDefinitionDecoder,
@@ -1,4 +1,5 @@
 import abc
+from typing import Iterator, Tuple
 
 
 class BlockDefinition:
@@ -7,7 +8,65 @@ class BlockDefinition:
 
     Allows deserialization to check for instances of this class rather than
     each of the subclasses.
+
+    The terms of the normal form of a block are numbered in the order given in
+    docs/normalization.md, in which the replicates of a term are adjacent.
+    Subclasses enumerate a range of terms as runs of replicates, so that a
+    term is only copied when the copies are requested.
     """
     @abc.abstractmethod
     def __init__(self):
         pass
+
+    @abc.abstractmethod
+    def cardinality(self) -> int:
+        """
+        Returns the number of samples in the normal form of this block,
+        computed without enumerating them.
+        """
+        pass
+
+    @abc.abstractmethod
+    def runs(self, start: int,
+             stop: int) -> Iterator[Tuple[tuple, int, int]]:
+        """
+        Returns an iterator over the runs of replicated terms of the normal
+        form of this block that overlap range(start, stop), which must lie
+        within the cardinality.
+
+        Each run is a triple of the product term, as a tuple of subject and
+        treatment references, the index of the first replicate of the term,
+        and the number of replicates.
+        Runs are not clipped to the range.
+        """
+        pass
+
+    def term_at(self, index: int) -> tuple:
+        """
+        Returns the product term at the given index of the normal form of this
+        block as a tuple of subject and treatment references.
+
+        The index is decoded through the structure of the block without
+        enumerating the terms before it.
+        """
+        term, _, _ = next(self.runs(index, index + 1))
+        return term
+
+    def weighted_terms(self, start: int,
+                       stop: int) -> Iterator[Tuple[tuple, int]]:
+        """
+        Returns an iterator over the product terms with indexes in
+        range(start, stop), each paired with the number of its replicates in
+        the range.
+        """
+        for term, first, count in self.runs(start, stop):
+            yield term, min(stop, first + count) - max(start, first)
+
+    def terms(self, start: int, stop: int) -> Iterator[tuple]:
+        """
+        Returns an iterator over the product terms with indexes in
+        range(start, stop), repeating a replicated term for each replicate.
+        """
+        for term, count in self.weighted_terms(start, stop):
+            for _ in range(count):
+                yield term
@@ -1,6 +1,10 @@
+from __future__ import annotations
 from cp_request.design.design_block import DesignBlock
 from cp_request.design.block_definition import BlockDefinition
-from transform import RequestTransformer
+from typing import TYPE_CHECKING, Iterator, Tuple
+
+if TYPE_CHECKING:
+    from transform import RequestTransformer
 
 
 class BlockReference(BlockDefinition):
@@ -28,6 +32,13 @@ class BlockReference(BlockDefinition):
     def transform(self, transformer: RequestTransformer):
         return transformer.transform_block_reference(self)
 
+    def cardinality(self) -> int:
+        return self.__block.cardinality()
+
+    def runs(self, start: int,
+             stop: int) -> Iterator[Tuple[tuple, int, int]]:
+        return self.__block.definition.runs(start, stop)
+
     @property
     def block(self):
         return self.__block
@@ -1,5 +1,10 @@
+from __future__ import annotations
+import random
 from cp_request.design.block_definition import BlockDefinition
-from transform import RequestTransformer
+from typing import TYPE_CHECKING, List
+
+if TYPE_CHECKING:
+    from transform import RequestTransformer
 
 
 class DesignBlock:
@@ -25,7 +30,7 @@ class DesignBlock:
         if not isinstance(other, DesignBlock):
             return False
         return (self.__label == other.__label and
-                self.__definition == self.__definition)
+                self.__definition == other.__definition)
 
     def apply(self, visitor):
         visitor.visit_design_block(self)
@@ -33,6 +38,114 @@ class DesignBlock:
     def transform(self, transformer: RequestTransformer):
         return transformer.transform_design_block(self)
 
+    def cardinality(self) -> int:
+        """
+        Returns the number of samples in the normal form of the definition.
+
+        The count is not cached, since the definition may be edited in place.
+        """
+        return self.__definition.cardinality()
+
+    def sample_at(self, index: int):
+        """
+        Returns the {Sample} at the given index of the normal form of the
+        definition.
+
+        The index is decoded through the structure of the definition, so no
+        samples before it are enumerated.
+        """
+        # imported here since cp_request.measurement depends on this module
+        from cp_request.measurement import Sample
+
+        if not 0 <= index < self.cardinality():
+            raise IndexError('sample index out of range')
+        return Sample.create_from(
+            block_list=self.__definition.term_at(index))
+
+    def samples(self, start: int = 0, stop: int = None):
+        """
+        Returns an iterator over the {Sample} objects with indexes in
+        range(start, stop) of the normal form of the definition.
+
+        With the default arguments, iterates over all of the samples.
+        """
+        return (
+            sample
+            for sample, count in self.weighted_samples(start, stop)
+            for _ in range(count)
+        )
+
+    def weighted_samples(self, start: int = 0, stop: int = None):
+        """
+        Returns an iterator over the distinct {Sample} objects with indexes in
+        range(start, stop) of the normal form of the definition, each paired
+        with the number of its replicates in the range.
+
+        Replicates of a sample are adjacent, and only one {Sample} object is
+        created for each run of replicates.
+        """
+        # imported here since cp_request.measurement depends on this module
+        from cp_request.measurement import Sample
+
+        if stop is None:
+            stop = self.cardinality()
+        if not 0 <= start <= stop <= self.cardinality():
+            raise IndexError('sample range out of range')
+        return (
+            (Sample.create_from(block_list=term), count)
+            for term, count in self.__definition.weighted_terms(start, stop)
+        )
+
+    def sample_random(self, k: int, *, seed=None):
+        """
+        Returns a list of k distinct {Sample} objects drawn uniformly at random
+        from the normal form of the definition, in the order drawn.
+
+        Indexes are drawn without replacement and decoded with {sample_at},
+        so the samples of the design are never enumerated.
+        The same seed gives the same samples.
+        Samples are distinct by index, so replicates of a sample may be drawn
+        more than once.
+        Raises ValueError if k is negative or larger than the cardinality.
+        """
+        size = self.cardinality()
+        if not 0 <= k <= size:
+            raise ValueError('sample size out of range')
+        rng = random.Random(seed)
+        # Floyd's algorithm draws k distinct indexes with k calls to
+        # randrange, which takes an int of any size, unlike random.sample
+        # over a range longer than sys.maxsize.
+        chosen = set()
+        indexes = list()
+        for bound in range(size - k, size):
+            index = rng.randrange(bound + 1)
+            if index in chosen:
+                index = bound
+            chosen.add(index)
+            indexes.append(index)
+        rng.shuffle(indexes)
+        return [self.sample_at(index) for index in indexes]
+
+    def shards(self, count: int) -> List[range]:
+        """
+        Splits the indexes of the samples of this block into the given number
+        of contiguous ranges of nearly equal size.
+
+        Each range can be enumerated on its own with {samples}, for instance
+        in a separate process, and concatenating the samples of the ranges in
+        order gives the samples of the block.
+        """
+        if count < 1:
+            raise ValueError('shard count must be positive')
+        size, remainder = divmod(self.cardinality(), count)
+        shard_list = list()
+        start = 0
+        for shard in range(count):
+            stop = start + size + (1 if shard < remainder else 0)
+            shard_list.append(range(start, stop))
+            start = stop
+        return shard_list
+
     @property
     def label(self):
         return self.__label
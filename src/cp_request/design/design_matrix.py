@@ -0,0 +1,234 @@
+"""
+Export of the samples of a design as a NumPy matrix of integer codes.
+
+Requires numpy, which is an optional dependency of this package.
+"""
+
+import numpy as np
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference,
+    TreatmentValueReference
+)
+from cp_request.design.block_definition import BlockDefinition
+from cp_request.measurement import CannotCreateSampleException
+from typing import Dict, List
+
+SUBJECT_FACTOR = 'subject'
+
+MISSING_CODE = -1
+
+
+class DesignMatrix:
+    """
+    Represents the samples of a design as a matrix of integer codes with a row
+    for each sample, in the order of {DesignBlock.samples}, and a column for
+    each factor.
+
+    The first factor is the subject of the sample, and there is a further
+    factor for each treatment named in the design.
+    The level table of a factor maps each code to the object it stands for:
+    a {NamedEntity} for the subject, the {Value} bound to a treatment, or the
+    {Treatment} itself where a treatment is used without a value.
+    A code of {MISSING_CODE} marks a factor that does not occur in the sample.
+
+    If the replicates of the design are not expanded, there is a row for each
+    run of replicates of a sample, and the multiplicities give the number of
+    replicates of each row.
+    Otherwise, every multiplicity is one.
+    """
+
+    def __init__(self, *, codes: np.ndarray, factors: List[str],
+                 levels: List[Dict[int, object]],
+                 multiplicities: np.ndarray = None):
+        self.__codes = codes
+        self.__factors = factors
+        self.__levels = levels
+        if multiplicities is None:
+            multiplicities = np.ones(codes.shape[0], dtype=np.int64)
+        self.__multiplicities = multiplicities
+
+    def __repr__(self):
+        pattern = ("DesignMatrix(codes={}, factors={}, levels={}, "
+                   "multiplicities={})")
+        return pattern.format(
+            repr(self.__codes), repr(self.__factors), repr(self.__levels),
+            repr(self.__multiplicities))
+
+    @property
+    def codes(self):
+        return self.__codes
+
+    @property
+    def factors(self):
+        return self.__factors
+
+    @property
+    def levels(self):
+        return self.__levels
+
+    @property
+    def multiplicities(self):
+        return self.__multiplicities
+
+    def column(self, factor: str):
+        """
+        Returns the column of codes for the named factor.
+        """
+        return self.__codes[:, self.__factors.index(factor)]
+
+
+def design_matrix(block: DesignBlock, *,
+                  expand_replicates: bool = True) -> DesignMatrix:
+    """
+    Builds the {DesignMatrix} for the samples of a design block.
+
+    Columns are built for each block of the design by repeating and tiling
+    the columns of its sub-blocks, so no per-sample objects are created.
+    Replicates are carried as a multiplicity of each row, and the rows are
+    only repeated at the end if expand_replicates is true.
+    Raises {CannotCreateSampleException} if a factor occurs more than once in
+    a product term, as {Sample.create_from} does for the subject.
+    """
+    builder = _MatrixBuilder()
+    size, columns, counts = builder.build(block.definition)
+    codes = np.full((size, len(builder.factors)), MISSING_CODE,
+                    dtype=np.int32)
+    for column, column_codes in columns.items():
+        codes[:, column] = column_codes
+    if expand_replicates:
+        codes = np.repeat(codes, counts, axis=0)
+        counts = None
+    return DesignMatrix(
+        codes=codes,
+        factors=builder.factors,
+        levels=[
+            dict(enumerate(table)) for table in builder.tables
+        ],
+        multiplicities=counts
+    )
+
+
+class _MatrixBuilder:
+    """
+    Builds the columns of a design matrix for a block definition.
+
+    The columns of a block are represented as the number of distinct rows, a
+    dictionary mapping the index of each factor occurring in the block to an
+    array of codes, and an array with the number of replicates of each row.
+    Columns of each referenced {DesignBlock} are built once and shared.
+    """
+
+    def __init__(self):
+        self.factors = [SUBJECT_FACTOR]
+        self.tables = [list()]
+        self.__columns = {SUBJECT_FACTOR: 0}
+        self.__level_codes = [dict()]
+        self.__blocks = dict()
+
+    def build(self, block: BlockDefinition):
+        if isinstance(block, BlockReference):
+            key = id(block.block)
+            if key not in self.__blocks:
+                self.__blocks[key] = self.build(block.block.definition)
+            return self.__blocks[key]
+        if isinstance(block, SubjectReference):
+            code = self.__code(SUBJECT_FACTOR, block.entity.name, block.entity)
+            return 1, {0: np.array([code], dtype=np.int32)}, _ones(1)
+        if isinstance(block, TreatmentValueReference):
+            return self.__value_columns(block.treatment_name, [block.value])
+        if isinstance(block, TreatmentReference):
+            column = self.__column(block.treatment_name)
+            code = self.__code(block.treatment_name, None, block.treatment)
+            return 1, {column: np.array([code], dtype=np.int32)}, _ones(1)
+        if isinstance(block, GenerateBlock):
+            return self.__value_columns(block.treatment.name, block.values)
+        if isinstance(block, ReplicateBlock):
+            size, columns, counts = self.build(block.block)
+            return size, columns, counts * block.count
+        if isinstance(block, ProductBlock):
+            return self.__product([self.build(sub_block)
+                                   for sub_block in block.block_list])
+        if isinstance(block, SumBlock):
+            return self.__sum([self.build(sub_block)
+                               for sub_block in block.block_list])
+        raise TypeError('unexpected block {}'.format(repr(block)))
+
+    def __value_columns(self, treatment_name, values):
+        column = self.__column(treatment_name)
+        codes = np.array([
+            self.__code(treatment_name,
+                        (value.value, value.unit.reference),
+                        value)
+            for value in values
+        ], dtype=np.int32)
+        return len(values), {column: codes}, _ones(len(values))
+
+    def __product(self, block_columns):
+        size = 1
+        columns = dict()
+        counts = _ones(1)
+        for block_size, block, block_counts in block_columns:
+            result = dict()
+            for column, codes in columns.items():
+                result[column] = np.repeat(codes, block_size)
+            for column, codes in block.items():
+                codes = np.tile(codes, size)
+                if column in result:
+                    if np.any((codes != MISSING_CODE) &
+                              (result[column] != MISSING_CODE)):
+                        raise CannotCreateSampleException(
+                            'Product term has more than one {}'.format(
+                                self.factors[column]))
+                    codes = np.where(
+                        codes == MISSING_CODE, result[column], codes)
+                result[column] = codes
+            counts = (np.repeat(counts, block_size) *
+                      np.tile(block_counts, size))
+            size *= block_size
+            columns = result
+        return size, columns, counts
+
+    @staticmethod
+    def __sum(block_columns):
+        size = sum(block_size for block_size, _, _ in block_columns)
+        factors = set()
+        for _, block, _ in block_columns:
+            factors.update(block.keys())
+        columns = dict()
+        for column in factors:
+            columns[column] = np.concatenate([
+                block.get(column,
+                          np.full(block_size, MISSING_CODE, dtype=np.int32))
+                for block_size, block, _ in block_columns
+            ])
+        counts = np.concatenate([_ones(0)] + [
+            block_counts for _, _, block_counts in block_columns
+        ])
+        return size, columns, counts
+
+    def __column(self, factor: str) -> int:
+        if factor not in self.__columns:
+            self.__columns[factor] = len(self.factors)
+            self.factors.append(factor)
+            self.tables.append(list())
+            self.__level_codes.append(dict())
+        return self.__columns[factor]
+
+    def __code(self, factor: str, key, level) -> int:
+        column = self.__column(factor)
+        level_codes = self.__level_codes[column]
+        if key not in level_codes:
+            level_codes[key] = len(self.tables[column])
+            self.tables[column].append(level)
+        return level_codes[key]
+
+
+def _ones(size: int) -> np.ndarray:
+    return np.ones(size, dtype=np.int64)
@@ -1,8 +1,11 @@
+from __future__ import annotations
 from cp_request import Value
-from cp_request.design import TreatmentReference
+from cp_request.design import TreatmentReference, TreatmentValueReference
 from cp_request.design.block_definition import BlockDefinition
-from transform import RequestTransformer
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    from transform import RequestTransformer
 
 
 class GenerateBlock(BlockDefinition):
@@ -46,6 +49,17 @@ class GenerateBlock(BlockDefinition):
     def transform(self, transformer: RequestTransformer):
         return transformer.transform_generate_block(self)
 
+    def cardinality(self) -> int:
+        return len(self.__values)
+
+    def runs(self, start: int,
+             stop: int) -> Iterator[Tuple[tuple, int, int]]:
+        for index in range(start, stop):
+            yield (TreatmentValueReference(
+                treatment=self.__treatment,
+                value=self.__values[index]
+            ),), index, 1
+
     @property
     def treatment(self):
         return self.__treatment
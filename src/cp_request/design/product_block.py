@@ -1,6 +1,9 @@
+from __future__ import annotations
 from cp_request.design.block_definition import BlockDefinition
-from transform import RequestTransformer
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    from transform import RequestTransformer
 
 
 class ProductBlock(BlockDefinition):
@@ -30,6 +33,59 @@ class ProductBlock(BlockDefinition):
     def transform(self, transformer: RequestTransformer):
         return transformer.transform_product_block(self)
 
+    def cardinality(self) -> int:
+        return self.__get_strides()[0]
+
+    def runs(self, start: int,
+             stop: int) -> Iterator[Tuple[tuple, int, int]]:
+        return self.__runs(self.__get_strides(), 0, start, stop)
+
+    def __runs(self, strides: List[int], position: int, start: int,
+               stop: int):
+        """
+        Yields the runs overlapping range(start, stop) of the product of the
+        blocks from the given position to the end of the list, where strides
+        are the strides of the blocks.
+
+        The index is decoded as a mixed-radix number with a digit for each
+        block, the last block being the least significant, except that the
+        replicates of a term are moved innermost: a run of count replicates of
+        a term of the first block covers count times the stride, in which each
+        term of the rest of the product occurs count times in a row.
+        """
+        if start >= stop:
+            return
+        if position == len(self.__block_list):
+            yield tuple(), 0, 1
+            return
+        stride = strides[position + 1]
+        first = start // stride
+        last = (stop - 1) // stride
+        block_runs = self.__block_list[position].runs(first, last + 1)
+        for term, run_start, count in block_runs:
+            offset = run_start * stride
+            rest_start = max(start - offset, 0)
+            rest_stop = min(stop - offset, stride * count)
+            rest_runs = self.__runs(strides, position + 1,
+                                    rest_start // count,
+                                    (rest_stop - 1) // count + 1)
+            for rest, rest_run_start, rest_count in rest_runs:
+                yield (term + rest,
+                       offset + count * rest_run_start,
+                       count * rest_count)
+
+    def __get_strides(self):
+        """
+        Returns the number of terms of the product of the blocks following each
+        position in the list, preceded by the cardinality of this block.
+
+        The strides are not cached, since the blocks may be edited in place.
+        """
+        strides = [1]
+        for block in reversed(self.__block_list):
+            strides.append(strides[-1] * block.cardinality())
+        return list(reversed(strides))
+
     @property
     def block_list(self):
         return self.__block_list
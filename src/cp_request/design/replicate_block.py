@@ -1,5 +1,9 @@
+from __future__ import annotations
 from cp_request.design.block_definition import BlockDefinition
-from transform import RequestTransformer
+from typing import TYPE_CHECKING, Iterator, Tuple
+
+if TYPE_CHECKING:
+    from transform import RequestTransformer
 
 
 class ReplicateBlock(BlockDefinition):
@@ -31,6 +35,22 @@ class ReplicateBlock(BlockDefinition):
     def transform(self, transformer: RequestTransformer):
         return transformer.transform_replicate_block(self)
 
+    def cardinality(self) -> int:
+        return self.__count * self.__block.cardinality()
+
+    def runs(self, start: int,
+             stop: int) -> Iterator[Tuple[tuple, int, int]]:
+        """
+        Scales the runs of the replicated block by the count, so the
+        replicates are represented as a multiplicity rather than copied.
+        """
+        if start >= stop:
+            return
+        first = start // self.__count
+        last = (stop - 1) // self.__count
+        for term, run_start, count in self.__block.runs(first, last + 1):
+            yield term, run_start * self.__count, count * self.__count
+
     @property
     def count(self):
         return self.__count
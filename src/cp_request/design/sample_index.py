@@ -0,0 +1,149 @@
+from __future__ import annotations
+from cp_request.design.design_block import DesignBlock
+from cp_request.design.subject_reference import SubjectReference
+from cp_request.design.treatment_reference import TreatmentValueReference
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from cp_request import NamedEntity, Value
+    from cp_request.design.block_definition import BlockDefinition
+    from cp_request.design.treatment_reference import TreatmentReference
+    from cp_request.measurement import Sample
+
+DEFAULT_DIGITS = 9
+
+SampleKey = Tuple[Optional[str], Tuple[tuple, ...]]
+
+
+def quantize(number, digits: int = DEFAULT_DIGITS):
+    """
+    Rounds the number to the given number of significant digits, so that
+    values that differ only by floating point error are equal.
+    """
+    if number == 0:
+        return 0.0
+    return float('{:.{}g}'.format(number, digits))
+
+
+def sample_key(*, subject: Optional[NamedEntity],
+               treatments: Iterable[TreatmentReference],
+               digits: int = DEFAULT_DIGITS) -> SampleKey:
+    """
+    Returns a hashable key for a sample consisting of the name of the subject
+    and the sorted tuple of (treatment name, unit reference, value) triples,
+    with values quantized to the given number of significant digits.
+
+    The unit reference and value are None for a treatment without a value.
+    """
+    subject_name = subject.name if subject is not None else None
+    return subject_name, tuple(sorted(
+        (_treatment_key(treatment, digits) for treatment in treatments),
+        key=repr))
+
+
+def term_key(term: Iterable[BlockDefinition], *,
+             digits: int = DEFAULT_DIGITS) -> SampleKey:
+    """
+    Returns the {sample_key} of the sample for a product term of a normalized
+    design, without creating the {Sample}.
+    """
+    subject = None
+    treatments = list()
+    for reference in term:
+        if isinstance(reference, SubjectReference):
+            subject = reference.entity
+        else:
+            treatments.append(reference)
+    return sample_key(subject=subject, treatments=treatments, digits=digits)
+
+
+def _treatment_key(treatment: TreatmentReference, digits: int):
+    if isinstance(treatment, TreatmentValueReference):
+        return _value_key(treatment.treatment_name, treatment.value, digits)
+    return treatment.treatment_name, None, None
+
+
+def _value_key(name: str, value: Optional[Value], digits: int):
+    if value is None:
+        return name, None, None
+    return name, value.unit.reference, quantize(value.value, digits)
+
+
+class SampleIndex:
+    """
+    Index from concrete samples to their positions in the normal form of a
+    {DesignBlock}.
+
+    The index is built in one pass over the runs of replicates of the design,
+    and maps the {sample_key} of each distinct sample to the ranges of its
+    indexes, so a lookup takes time proportional to the number of treatments
+    of the sample, and of the indexes returned.
+    """
+
+    def __init__(self, *, block: DesignBlock, digits: int = DEFAULT_DIGITS):
+        self.__block = block
+        self.__digits = digits
+        self.__ranges = dict()
+        definition = block.definition
+        for term, start, count in definition.runs(0, block.cardinality()):
+            self.__ranges.setdefault(
+                term_key(term, digits=digits), list()).append(
+                    range(start, start + count))
+
+    def __repr__(self):
+        return "SampleIndex(block={}, digits={})".format(
+            repr(self.__block), self.__digits)
+
+    def __len__(self):
+        return len(self.__ranges)
+
+    @property
+    def block(self):
+        return self.__block
+
+    @property
+    def digits(self):
+        return self.__digits
+
+    def indexes(self, sample: Sample) -> List[int]:
+        """
+        Returns the indexes of the sample in the design, in increasing order,
+        or an empty list if the design does not include the sample.
+        """
+        return self.__indexes(sample_key(
+            subject=sample.subject,
+            treatments=sample.treatments,
+            digits=self.__digits))
+
+    def lookup(self, *, subject: str = None,
+               treatments: Dict[str, Optional[Value]] = None) -> List[int]:
+        """
+        Returns the indexes of the sample with the named subject and with the
+        given treatments, mapping each treatment name to a {Value}, or to None
+        for a treatment without a value.
+        """
+        if treatments is None:
+            treatments = dict()
+        return self.__indexes((subject, tuple(sorted(
+            (_value_key(name, value, self.__digits)
+             for name, value in treatments.items()),
+            key=repr))))
+
+    def duplicates(self) -> Dict[SampleKey, List[int]]:
+        """
+        Returns the indexes of each sample that occurs in more than one run of
+        the design, that is, a sample produced by more than one branch of the
+        design rather than by replicating it.
+        """
+        return {
+            key: self.__indexes(key)
+            for key, ranges in self.__ranges.items()
+            if len(ranges) > 1
+        }
+
+    def __indexes(self, key: SampleKey) -> List[int]:
+        return [
+            index
+            for index_range in self.__ranges.get(key, list())
+            for index in index_range
+        ]
@@ -1,6 +1,10 @@
+from __future__ import annotations
 from cp_request import NamedEntity
 from cp_request.design.block_definition import BlockDefinition
-from transform import RequestTransformer
+from typing import TYPE_CHECKING, Iterator, Tuple
+
+if TYPE_CHECKING:
+    from transform import RequestTransformer
 
 
 class SubjectReference(BlockDefinition):
@@ -26,7 +30,14 @@ class SubjectReference(BlockDefinition):
         visitor.visit_subject_reference(self)
 
     def transform(self, transformer: RequestTransformer):
-        transformer.transform_subject_reference(self)
+        return transformer.transform_subject_reference(self)
+
+    def cardinality(self) -> int:
+        return 1
+
+    def runs(self, start: int,
+             stop: int) -> Iterator[Tuple[tuple, int, int]]:
+        return iter([((self,), 0, 1)][start:stop])
 
     @property
     def entity(self):
@@ -1,6 +1,11 @@
+from __future__ import annotations
+import bisect
+import itertools
 from cp_request.design.block_definition import BlockDefinition
-from transform import RequestTransformer
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    from transform import RequestTransformer
 
 
 class SumBlock(BlockDefinition):
@@ -30,6 +35,34 @@ class SumBlock(BlockDefinition):
     def transform(self, transformer: RequestTransformer):
         return transformer.transform_sum_block(self)
 
+    def cardinality(self) -> int:
+        return self.__get_offsets()[-1]
+
+    def runs(self, start: int,
+             stop: int) -> Iterator[Tuple[tuple, int, int]]:
+        offsets = self.__get_offsets()
+        position = bisect.bisect_right(offsets, start) - 1
+        while position < len(self.__block_list) and offsets[position] < stop:
+            block_start = offsets[position]
+            block_stop = min(stop, offsets[position + 1])
+            block_runs = self.__block_list[position].runs(
+                start - block_start, block_stop - block_start)
+            for term, run_start, count in block_runs:
+                yield term, block_start + run_start, count
+            start = block_stop
+            position += 1
+
+    def __get_offsets(self):
+        """
+        Returns the index of the first term of each block in the list, followed
+        by the cardinality of this block.
+
+        The offsets are not cached, since the blocks may be edited in place.
+        """
+        return list(itertools.accumulate(
+            (block.cardinality() for block in self.__block_list),
+            initial=0))
+
     @property
     def block_list(self):
         return self.__block_list
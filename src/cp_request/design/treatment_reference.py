@@ -1,7 +1,10 @@
+from __future__ import annotations
 from cp_request import Treatment, Value
 from cp_request.design.block_definition import BlockDefinition
-from transform import RequestTransformer
-from typing import Union
+from typing import TYPE_CHECKING, Iterator, Tuple, Union
+
+if TYPE_CHECKING:
+    from transform import RequestTransformer
 
 
 class TreatmentReference(BlockDefinition):
@@ -36,6 +39,13 @@ class TreatmentReference(BlockDefinition):
     def transform(self, transformer: RequestTransformer):
         return transformer.transform_treatment_reference(self)
 
+    def cardinality(self) -> int:
+        return 1
+
+    def runs(self, start: int,
+             stop: int) -> Iterator[Tuple[tuple, int, int]]:
+        return iter([((self,), 0, 1)][start:stop])
+
     @property
     def treatment(self):
         return self.__treatment
@@ -65,7 +75,7 @@ class TreatmentValueReference(TreatmentReference):
         visitor.visit_treatment_value_reference(self)
 
     def transform(self, transformer):
-        transformer.transform_treatment_value_reference(self)
+        return transformer.transform_treatment_value_reference(self)
 
     @property
     def value(self):
@@ -1,20 +1,17 @@
 
 import json
-from cp_request.design import (
-    DesignBlock, DesignBlockEncoder, DesignBlockDecoder
-)
-from cp_request import (
-    Measurement, MeasurementEncoder, MeasurementDecoder,
-    NamedEntity, NamedEntityEncoder, NamedEntityDecoder,
-    Treatment, TreatmentEncoder, TreatmentDecoder,
-    Version, VersionEncoder, VersionDecoder
-)
-from typing import List
+from cp_request.design import DesignBlock
+from cp_request import Measurement, NamedEntity, Treatment, Version
+from typing import Callable, List, Union
 
 
 class ExperimentalRequest:
     """
     Defines a structured experimental request
+
+    The designs and measurements may be given as functions that return them,
+    which are called when the designs or measurements are first used, the
+    designs first, so that the request can be loaded without decoding them.
     """
 
     def __init__(self, *, cp_name: str,
@@ -24,8 +21,12 @@ class ExperimentalRequest:
                  derived_from=None,
                  subjects: List[NamedEntity] = list(),
                  treatments: List[Treatment] = list(),
-                 designs: List[DesignBlock] = list(),
-                 measurements: List[Measurement] = list()):
+                 designs: Union[
+                     List[DesignBlock],
+                     Callable[[], List[DesignBlock]]] = list(),
+                 measurements: Union[
+                     List[Measurement],
+                     Callable[[], List[Measurement]]] = list()):
         self.challenge_problem = cp_name
         self.experiment_reference = reference_name
         self.experiment_reference_url = reference_url
@@ -33,8 +34,18 @@ class ExperimentalRequest:
         self.derived_from = derived_from
         self.subjects = list(subjects)
         self.treatments = list(treatments)
-        self.designs = list(designs)
-        self.measurements = list(measurements)
+        self.__designs = None
+        self.__measurements = None
+        self.__load_designs = None
+        self.__load_measurements = None
+        if callable(designs):
+            self.__load_designs = designs
+        else:
+            self.designs = designs
+        if callable(measurements):
+            self.__load_measurements = measurements
+        else:
+            self.measurements = measurements
 
     def __eq__(self, other):
         if not isinstance(other, ExperimentalRequest):
@@ -77,90 +88,90 @@ class ExperimentalRequest:
     def apply(self, visitor):
         visitor.visit_experiment(self)
 
+    @property
+    def designs(self) -> List[DesignBlock]:
+        if self.__load_designs is not None:
+            self.designs = self.__load_designs()
+        return self.__designs
+
+    @designs.setter
+    def designs(self, designs: List[DesignBlock]):
+        self.__load_designs = None
+        self.__designs = list(designs)
+
+    @property
+    def measurements(self) -> List[Measurement]:
+        if self.__load_measurements is not None:
+            # measurements refer to the design blocks
+            self.designs
+            self.measurements = self.__load_measurements()
+        return self.__measurements
+
+    @measurements.setter
+    def measurements(self, measurements: List[Measurement]):
+        self.__load_measurements = None
+        self.__measurements = list(measurements)
+
+    def is_loaded(self) -> bool:
+        """
+        Indicates whether the designs and measurements of this request have
+        been loaded.
+        """
+        return self.__load_designs is None and self.__load_measurements is None
+
+    def transform(self, transformer):
+        return transformer.transform_experiment(self)
+
 
 class ExperimentEncoder(json.JSONEncoder):
+    """
+    A JSONEncoder for the {ExperimentalRequest} class.
+
+    A request is encoded by a {RequestEncoder} with the same options, so
+    json.dump writes it one part at a time, as {dump_stream} does, without
+    building the representation of the whole request.
+    """
+
     def default(self, obj):
         # pylint: disable=E0202
         if isinstance(obj, ExperimentalRequest):
-            rep = dict()
-            rep['object_type'] = 'experimental_request'
-            rep['challenge_problem'] = obj.challenge_problem
-            rep['experiment_reference'] = obj.experiment_reference
-            rep['experiment_reference_url'] = obj.experiment_reference_url
-            rep['experiment_version'] = VersionEncoder().default(
-                obj.experiment_version)
-            if obj.derived_from:
-                rep['derived_from'] = obj.derived_from
-            rep['subjects'] = [NamedEntityEncoder().default(entity)
-                               for entity in obj.subjects]
-            rep['treatments'] = [TreatmentEncoder().default(treatment)
-                                 for treatment in obj.treatments]
-            rep['designs'] = [DesignBlockEncoder().default(design)
-                              for design in obj.designs]
-            rep['measurements'] = [MeasurementEncoder().default(measurement)
-                                   for measurement in obj.measurements]
-            return rep
+            return self.__request_encoder().convert(obj)
         return super().default(obj)
 
+    def iterencode(self, o, _one_shot=False):
+        if isinstance(o, ExperimentalRequest):
+            return self.__request_encoder().iterencode(o, _one_shot)
+        return super().iterencode(o, _one_shot)
+
+    def __request_encoder(self):
+        # imported here since the encoder depends on this module
+        from cp_request.request_encoder import RequestEncoder
+        return RequestEncoder(
+            skipkeys=self.skipkeys,
+            ensure_ascii=self.ensure_ascii,
+            check_circular=self.check_circular,
+            allow_nan=self.allow_nan,
+            sort_keys=self.sort_keys,
+            indent=self.indent,
+            separators=(self.item_separator, self.key_separator)
+        )
+
 
 class ExperimentDecoder(json.JSONDecoder):
+    """
+    A JSONDecoder for the {ExperimentalRequest} class.
+
+    If lazy, the designs and measurements of the request are decoded when
+    they are first used.
+    """
 
-    def __init__(self):
+    def __init__(self, *, lazy: bool = False):
+        self.__lazy = lazy
         super().__init__(object_hook=self.convert)
 
     def convert(self, d):
-        if 'object_type' not in d:
+        if d.get('object_type') != 'experimental_request':
             return d
-        if d['object_type'] != 'experimental_request':
-            return d
-        if 'challenge_problem' not in d:
-            return d
-        if 'experiment_reference' not in d:
-            return d
-        if 'experiment_reference_url' not in d:
-            return d
-        if 'experiment_version' not in d:
-            return d
-        if 'subjects' not in d:
-            return d
-        if 'treatments' not in d:
-            return d
-        if 'designs' not in d:
-            return d
-        if 'measurements' not in d:
-            return d
-        derived_from = None
-        if 'derived_from' in d:
-            derived_from = d['derived_from']
-
-        symbol_table = dict()
-        subjects = [NamedEntityDecoder().object_hook(entity)
-                    for entity in d['subjects']]
-        for subject in subjects:
-            symbol_table[subject.name] = subject
-        treatments = [TreatmentDecoder().object_hook(treatment)
-                      for treatment in d['treatments']]
-        for treatment in treatments:
-            symbol_table[treatment.name] = treatment
-
-        designs = list()
-        for design in d['designs']:
-            decoder = DesignBlockDecoder(symbol_table)
-            decoded_design = decoder.object_hook(design)
-            designs.append(decoded_design)
-            symbol_table[decoded_design.label] = decoded_design
-
-        return ExperimentalRequest(
-            cp_name=d['challenge_problem'],
-            reference_name=d['experiment_reference'],
-            reference_url=d['experiment_reference_url'],
-            version=VersionDecoder().object_hook(d['experiment_version']),
-            derived_from=derived_from,
-            subjects=subjects,
-            treatments=treatments,
-            designs=designs,
-            measurements=[
-                MeasurementDecoder(symbol_table).object_hook(measurement)
-                for measurement in d['measurements']
-            ]
-        )
+        # imported here since the decoder depends on this module
+        from cp_request.request_decoder import RequestDecoder
+        return RequestDecoder(lazy=self.__lazy).convert(d)
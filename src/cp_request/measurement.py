@@ -3,9 +3,14 @@ from cp_request import NamedEntity
 from cp_request.design.block_reference import (
     BlockReference
 )
+from cp_request.design.subject_reference import (
+    SubjectReference
+)
 from cp_request.design.treatment_reference import (
     TreatmentReference
 )
+from cp_request.design.block_definition import BlockDefinition
+from cp_request.design.sample_index import DEFAULT_DIGITS, sample_key
 from cp_request.design.json_serialization import (
     BlockReferenceDecoder, BlockReferenceEncoder,
     TreatmentReferenceDecoder, TreatmentReferenceEncoder
@@ -25,6 +30,26 @@ class Sample:
         self.__subject = subject
         self.__treatments = list(treatments)
 
+    @staticmethod
+    def create_from(*, block_list: List[BlockDefinition]):
+        """
+        Creates a Sample from a product term of a normalized design.
+
+        The term may include at most one {SubjectReference}, and each other
+        block is taken as a treatment of the sample.
+        """
+        subject = None
+        treatments = list()
+        for block in block_list:
+            if isinstance(block, SubjectReference):
+                if subject is not None:
+                    raise CannotCreateSampleException(
+                        'Product term has more than one subject')
+                subject = block.entity
+            else:
+                treatments.append(block)
+        return Sample(subject=subject, treatments=treatments)
+
     def __repr__(self):
         return "Sample(subject={}, treatments={})".format(
             repr(self.subject), repr(self.treatments))
@@ -33,11 +58,23 @@ class Sample:
         if not isinstance(other, Sample):
             return False
         return (self.subject == other.subject
-                and self.treatments == self.treatments)
+                and self.treatments == other.treatments)
 
     def apply(self, visitor):
         visitor.visit_sample(self)
 
+    def key(self, *, digits: int = DEFAULT_DIGITS):
+        """
+        Returns a hashable key that identifies the physical sample: the name of
+        the subject, and the sorted tuple of the treatments with their values
+        rounded to the given number of significant digits.
+
+        Samples with the same treatments listed in a different order have the
+        same key.
+        """
+        return sample_key(subject=self.subject, treatments=self.treatments,
+                          digits=digits)
+
     @property
     def subject(self):
         return self.__subject
@@ -47,6 +84,11 @@ class Sample:
         return self.__treatments
 
 
+class CannotCreateSampleException(Exception):
+    def __init__(self, message):
+        super().__init__(message)
+
+
 class SampleEncoder(json.JSONEncoder):
     def default(self, obj):
         # pylint: disable=E0202
@@ -179,6 +221,9 @@ class Measurement:
     def apply(self, visitor):
         visitor.visit_measurement(self)
 
+    def transform(self, transformer):
+        return transformer.transform_measurement(self)
+
     @property
     def type(self):
         return self.__type
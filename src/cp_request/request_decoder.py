@@ -0,0 +1,266 @@
+from cp_request import (
+    ExperimentalRequest,
+    NamedEntity,
+    Unit,
+    Value,
+    Version
+)
+from cp_request.attribute import BoundAttribute, UnboundAttribute
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference,
+    TreatmentValueReference
+)
+from cp_request.measurement import Control, Measurement, Sample
+from cp_request.treatment import AttributeTreatment, EntityTreatment
+from typing import Dict
+
+# The fields that hold the type of a JSON object, in the order they are tried.
+TYPE_FIELDS = ('object_type', 'block_type', 'attribute_type', 'treatment_type')
+
+
+class RequestDecoder:
+    """
+    Decoder that converts the JSON representation of an experimental request,
+    or of any of its parts, to objects in a single recursive pass.
+
+    Each object is dispatched on the value of its type field through a table
+    that maps the field and value to the fields the object requires and the
+    method that converts it, and the method converts the nested objects with
+    the same decoder.
+    As with the decoders of the individual classes, an object of unknown type
+    or without a required field is returned unchanged, as is a reference to a
+    subject or treatment that is not in the symbol table.
+
+    If lazy, the designs and measurements of a request are kept as
+    dictionaries and decoded when the request first uses them, while the
+    other fields, subjects and treatments are decoded immediately.
+
+    Used by {ExperimentDecoder}, and by the decoders in
+    cp_request.design.json_serialization.
+    """
+
+    def __init__(self, symbol_table: Dict[str, object] = None, *,
+                 lazy: bool = False):
+        if symbol_table is None:
+            symbol_table = dict()
+        self.__symbol_table = symbol_table
+        self.__lazy = lazy
+
+    @property
+    def lazy(self):
+        return self.__lazy
+
+    @property
+    def symbol_table(self):
+        return self.__symbol_table
+
+    def convert(self, d):
+        """
+        Returns the object represented by the dictionary, or the dictionary if
+        it does not represent an object.
+        """
+        if not isinstance(d, dict):
+            return d
+        for field in TYPE_FIELDS:
+            if field in d:
+                entry = self.__table.get((field, d[field]))
+                if entry is None:
+                    return d
+                required, method = entry
+                for name in required:
+                    if name not in d:
+                        return d
+                return method(self, d)
+        return d
+
+    def version(self, d):
+        """
+        Returns the {Version} represented by the dictionary, which has no type
+        field.
+        """
+        if 'major' not in d or 'minor' not in d or 'patch' not in d:
+            return d
+        return Version(major=d['major'], minor=d['minor'], patch=d['patch'])
+
+    def __unit(self, d):
+        return Unit.intern(reference=d['reference'])
+
+    def __value(self, d):
+        unit = self.convert(d['unit'])
+        if not isinstance(unit, Unit):
+            return Value(value=d['value'], unit=unit)
+        return Value.intern(value=d['value'], unit=unit)
+
+    def __bound_attribute(self, d):
+        return BoundAttribute(name=d['name'], value=self.convert(d['value']))
+
+    def __unbound_attribute(self, d):
+        return UnboundAttribute(name=d['name'], unit=self.convert(d['unit']))
+
+    def __named_entity(self, d):
+        attributes = list()
+        if 'attributes' in d:
+            attributes = [self.convert(attribute)
+                          for attribute in d['attributes']]
+        return NamedEntity(
+            name=d['name'],
+            reference=d['reference'],
+            attributes=attributes
+        )
+
+    def __attribute_treatment(self, d):
+        return AttributeTreatment(attribute=self.convert(d['attribute']))
+
+    def __entity_treatment(self, d):
+        return EntityTreatment(entity=self.convert(d['entity']))
+
+    def __design_block(self, d):
+        return DesignBlock(label=d['label'],
+                           definition=self.convert(d['definition']))
+
+    def __block_reference(self, d):
+        return BlockReference(block=self.__symbol_table[d['reference']])
+
+    def __generate_block(self, d):
+        if d['treatment_name'] not in self.__symbol_table:
+            return d
+        return GenerateBlock(
+            treatment=self.__symbol_table[d['treatment_name']],
+            attribute_name=d['attribute_name'],
+            values=[self.convert(value) for value in d['values']]
+        )
+
+    def __product_block(self, d):
+        return ProductBlock(block_list=[
+            self.convert(block) for block in d['block_list']
+        ])
+
+    def __sum_block(self, d):
+        return SumBlock(block_list=[
+            self.convert(block) for block in d['block_list']
+        ])
+
+    def __replicate_block(self, d):
+        return ReplicateBlock(count=d['count'], block=self.convert(d['block']))
+
+    def __subject_reference(self, d):
+        if d['reference'] not in self.__symbol_table:
+            return d
+        return SubjectReference(entity=self.__symbol_table[d['reference']])
+
+    def __treatment_reference(self, d):
+        if d['reference'] not in self.__symbol_table:
+            return d
+        return TreatmentReference(
+            treatment=self.__symbol_table[d['reference']])
+
+    def __treatment_value_reference(self, d):
+        if d['reference'] not in self.__symbol_table:
+            return d
+        return TreatmentValueReference(
+            treatment=self.__symbol_table[d['reference']],
+            value=self.convert(d['value'])
+        )
+
+    def __sample(self, d):
+        treatments = list()
+        if 'treatments' in d:
+            treatments = [self.convert(treatment)
+                          for treatment in d['treatments']]
+        return Sample(subject=self.__symbol_table[d['subject']],
+                      treatments=treatments)
+
+    def __control(self, d):
+        return Control(name=d['name'], sample=self.convert(d['sample']))
+
+    def __measurement(self, d):
+        controls = list()
+        if 'controls' in d:
+            controls = [self.convert(control) for control in d['controls']]
+        return Measurement(
+            type=d['type'],
+            block=self.convert(d['block']),
+            controls=controls,
+            performers=d['performers']
+        )
+
+    def __experiment(self, d):
+        subjects = [self.convert(entity) for entity in d['subjects']]
+        for subject in subjects:
+            self.__symbol_table[subject.name] = subject
+        treatments = [self.convert(treatment)
+                      for treatment in d['treatments']]
+        for treatment in treatments:
+            self.__symbol_table[treatment.name] = treatment
+
+        raw_designs = d['designs']
+        raw_measurements = d['measurements']
+
+        def designs():
+            decoded_designs = list()
+            for design in raw_designs:
+                decoded_design = self.convert(design)
+                decoded_designs.append(decoded_design)
+                self.__symbol_table[decoded_design.label] = decoded_design
+            return decoded_designs
+
+        def measurements():
+            return [self.convert(measurement)
+                    for measurement in raw_measurements]
+
+        return ExperimentalRequest(
+            cp_name=d['challenge_problem'],
+            reference_name=d['experiment_reference'],
+            reference_url=d['experiment_reference_url'],
+            version=self.version(d['experiment_version']),
+            derived_from=d.get('derived_from'),
+            subjects=subjects,
+            treatments=treatments,
+            designs=designs if self.__lazy else designs(),
+            measurements=measurements if self.__lazy else measurements()
+        )
+
+    __table = {
+        ('object_type', 'unit'): (('reference',), __unit),
+        ('object_type', 'value'): (('value', 'unit'), __value),
+        ('attribute_type', 'bound_attribute'):
+            (('name', 'value'), __bound_attribute),
+        ('attribute_type', 'unbound_attribute'):
+            (('name', 'unit'), __unbound_attribute),
+        ('object_type', 'named_entity'):
+            (('name', 'reference'), __named_entity),
+        ('treatment_type', 'attribute_treatment'):
+            (('attribute',), __attribute_treatment),
+        ('treatment_type', 'entity_treatment'):
+            (('entity',), __entity_treatment),
+        ('object_type', 'design_block'):
+            (('label', 'definition'), __design_block),
+        ('block_type', 'block_reference'): (('reference',), __block_reference),
+        ('block_type', 'generate_block'):
+            (('attribute_name', 'treatment_name'), __generate_block),
+        ('block_type', 'product_block'): (('block_list',), __product_block),
+        ('block_type', 'sum_block'): (('block_list',), __sum_block),
+        ('block_type', 'replicate_block'):
+            (('count', 'block'), __replicate_block),
+        ('block_type', 'subject_reference'):
+            (('reference',), __subject_reference),
+        ('block_type', 'treatment_reference'):
+            (('reference',), __treatment_reference),
+        ('block_type', 'value_treatment_reference'):
+            (('reference', 'value'), __treatment_value_reference),
+        ('object_type', 'sample'): (('subject',), __sample),
+        ('object_type', 'control'): (('name', 'sample'), __control),
+        ('object_type', 'measurement'):
+            (('type', 'block', 'performers'), __measurement),
+        ('object_type', 'experimental_request'):
+            (('challenge_problem', 'experiment_reference',
+              'experiment_reference_url', 'experiment_version', 'subjects',
+              'treatments', 'designs', 'measurements'), __experiment),
+    }
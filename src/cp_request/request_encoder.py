@@ -0,0 +1,310 @@
+import json
+from cp_request import (
+    ExperimentalRequest,
+    NamedEntity,
+    Unit,
+    Value,
+    Version
+)
+from cp_request.attribute import BoundAttribute, UnboundAttribute
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference,
+    TreatmentValueReference
+)
+from cp_request.measurement import Control, Measurement, Sample
+from cp_request.treatment import AttributeTreatment, EntityTreatment
+
+
+STREAMED_TYPES = (
+    ExperimentalRequest,
+    DesignBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SumBlock
+)
+
+
+def _unconverted(obj):
+    return obj
+
+
+class RequestEncoder(json.JSONEncoder):
+    """
+    A JSONEncoder for an experimental request, or any of its parts, that
+    converts each object with the method for its class in a table keyed by
+    type.
+
+    The default method converts only the object itself, and leaves the
+    designs, blocks, measurements and other nested parts for the encoder to
+    convert as it reaches them, so the encoder, and {dump_stream}, write a
+    request without building the representation of the whole request.
+    The convert method returns the complete representation.
+
+    The output is the same as that of the encoders of the individual
+    classes, which {ExperimentEncoder} and the encoders in
+    cp_request.design.json_serialization delegate to this one.
+    A subclass of a class in the table is converted by the method for the
+    nearest class in its method resolution order.
+    """
+
+    def default(self, obj):
+        # pylint: disable=E0202
+        method = self.__method(type(obj))
+        if method is None:
+            return super().default(obj)
+        return method(self, obj, _unconverted)
+
+    def convert(self, obj):
+        """
+        Returns the JSON representation of the object, with the nested parts
+        converted.
+        Raises TypeError if the object is not part of a request.
+        """
+        method = self.__method(type(obj))
+        if method is None:
+            return super().default(obj)
+        return method(self, obj, self.convert)
+
+    def iterencode(self, o, _one_shot=False):
+        """
+        Encodes the object, yielding the representation in chunks.
+
+        Unless the output is indented or has sorted keys, a request, design
+        block, or product, sum or replicate block is written one part at a
+        time, and other objects are encoded in one piece.
+        """
+        if (_one_shot or self.indent is not None or self.sort_keys
+                or not isinstance(o, STREAMED_TYPES)):
+            return super().iterencode(o, _one_shot)
+        return self.__stream(o)
+
+    def __stream(self, obj):
+        if not isinstance(obj, STREAMED_TYPES):
+            yield self.encode(obj)
+            return
+        yield '{'
+        for position, (key, value) in enumerate(self.default(obj).items()):
+            if position:
+                yield self.item_separator
+            yield self.encode(key) + self.key_separator
+            if isinstance(value, list):
+                yield '['
+                for index, item in enumerate(value):
+                    if index:
+                        yield self.item_separator
+                    yield from self.__stream(item)
+                yield ']'
+            else:
+                yield from self.__stream(value)
+        yield '}'
+
+    @classmethod
+    def __method(cls, obj_type):
+        if obj_type in cls.__table:
+            return cls.__table[obj_type]
+        method = None
+        for base in obj_type.__mro__:
+            if base in cls.__table:
+                method = cls.__table[base]
+                break
+        cls.__table[obj_type] = method
+        return method
+
+    def __unit(self, obj, part):
+        return {'object_type': 'unit', 'reference': obj.reference}
+
+    def __value(self, obj, part):
+        return {
+            'object_type': 'value',
+            'value': obj.value,
+            'unit': self.__unit(obj.unit, part)
+        }
+
+    def __version(self, obj, part):
+        return {'major': obj.major, 'minor': obj.minor, 'patch': obj.patch}
+
+    def __bound_attribute(self, obj, part):
+        return {
+            'attribute_type': 'bound_attribute',
+            'name': obj.name,
+            'value': self.__value(obj.value, part)
+        }
+
+    def __unbound_attribute(self, obj, part):
+        return {
+            'attribute_type': 'unbound_attribute',
+            'name': obj.name,
+            'unit': self.__unit(obj.unit, part)
+        }
+
+    def __named_entity(self, obj, part):
+        rep = {
+            'object_type': 'named_entity',
+            'name': obj.name,
+            'reference': obj.reference
+        }
+        if obj.attributes:
+            rep['attributes'] = [self.convert(attribute)
+                                 for attribute in obj.attributes]
+        return rep
+
+    def __attribute_treatment(self, obj, part):
+        return {
+            'treatment_type': 'attribute_treatment',
+            'attribute': self.convert(obj.attribute)
+        }
+
+    def __entity_treatment(self, obj, part):
+        return {
+            'treatment_type': 'entity_treatment',
+            'entity': self.__named_entity(obj.entity, part)
+        }
+
+    def __design_block(self, obj, part):
+        return {
+            'object_type': 'design_block',
+            'label': obj.label,
+            'definition': part(obj.definition)
+        }
+
+    def __block_reference(self, obj, part):
+        return {'block_type': 'block_reference', 'reference': obj.block_label}
+
+    def __generate_block(self, obj, part):
+        return {
+            'block_type': 'generate_block',
+            'treatment_name': obj.treatment.name,
+            'attribute_name': obj.attribute_name,
+            'values': [self.__value(value, part) for value in obj.values]
+        }
+
+    def __product_block(self, obj, part):
+        return {
+            'block_type': 'product_block',
+            'block_list': [part(block) for block in obj.block_list]
+        }
+
+    def __sum_block(self, obj, part):
+        return {
+            'block_type': 'sum_block',
+            'block_list': [part(block) for block in obj.block_list]
+        }
+
+    def __replicate_block(self, obj, part):
+        return {
+            'block_type': 'replicate_block',
+            'count': obj.count,
+            'block': part(obj.block)
+        }
+
+    def __subject_reference(self, obj, part):
+        return {'block_type': 'subject_reference',
+                'reference': obj.entity.name}
+
+    def __treatment_reference(self, obj, part):
+        return {'block_type': 'treatment_reference',
+                'reference': obj.treatment_name}
+
+    def __treatment_value_reference(self, obj, part):
+        return {
+            'block_type': 'value_treatment_reference',
+            'reference': obj.treatment_name,
+            'value': self.__value(obj.value, part)
+        }
+
+    def __sample(self, obj, part):
+        rep = {'object_type': 'sample', 'subject': obj.subject.name}
+        if obj.treatments:
+            rep['treatments'] = [part(treatment)
+                                 for treatment in obj.treatments]
+        return rep
+
+    def __control(self, obj, part):
+        return {
+            'object_type': 'control',
+            'name': obj.name,
+            'sample': self.__sample(obj.sample, part)
+        }
+
+    def __measurement(self, obj, part):
+        rep = {
+            'object_type': 'measurement',
+            'type': obj.type,
+            'block': self.__block_reference(obj.block, part)
+        }
+        if obj.controls:
+            rep['controls'] = [part(control) for control in obj.controls]
+        rep['performers'] = obj.performers
+        return rep
+
+    def __experiment(self, obj, part):
+        rep = {
+            'object_type': 'experimental_request',
+            'challenge_problem': obj.challenge_problem,
+            'experiment_reference': obj.experiment_reference,
+            'experiment_reference_url': obj.experiment_reference_url,
+            'experiment_version': self.__version(obj.experiment_version, part)
+        }
+        if obj.derived_from:
+            rep['derived_from'] = obj.derived_from
+        rep['subjects'] = [part(entity) for entity in obj.subjects]
+        rep['treatments'] = [part(treatment) for treatment in obj.treatments]
+        rep['designs'] = [part(design) for design in obj.designs]
+        rep['measurements'] = [part(measurement)
+                               for measurement in obj.measurements]
+        return rep
+
+    __table = {
+        Unit: __unit,
+        Value: __value,
+        Version: __version,
+        BoundAttribute: __bound_attribute,
+        UnboundAttribute: __unbound_attribute,
+        NamedEntity: __named_entity,
+        AttributeTreatment: __attribute_treatment,
+        EntityTreatment: __entity_treatment,
+        DesignBlock: __design_block,
+        BlockReference: __block_reference,
+        GenerateBlock: __generate_block,
+        ProductBlock: __product_block,
+        SumBlock: __sum_block,
+        ReplicateBlock: __replicate_block,
+        SubjectReference: __subject_reference,
+        TreatmentReference: __treatment_reference,
+        TreatmentValueReference: __treatment_value_reference,
+        Sample: __sample,
+        Control: __control,
+        Measurement: __measurement,
+        ExperimentalRequest: __experiment,
+    }
+
+
+def dump_stream(obj, fp, *, buffer_size: int = 1 << 16, **kwargs):
+    """
+    Writes the JSON representation of the request, or part of a request, to
+    the file object, as json.dump would with {RequestEncoder}.
+
+    The representation is written in chunks of about the buffer size as it is
+    converted, so only the blocks enclosing the part being written, and the
+    buffered chunks, are held in memory besides the request.
+    The keyword arguments are passed to the {RequestEncoder}, and the output
+    is the same as that of json.dumps with the same arguments.
+    """
+    chunks = list()
+    size = 0
+    for chunk in RequestEncoder(**kwargs).iterencode(obj):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= buffer_size:
+            fp.write(''.join(chunks))
+            chunks = list()
+            size = 0
+    if chunks:
+        fp.write(''.join(chunks))
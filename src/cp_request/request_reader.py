@@ -0,0 +1,290 @@
+import codecs
+import json
+from cp_request import ExperimentalRequest, Measurement
+from cp_request.design import DesignBlock
+from cp_request.request_decoder import RequestDecoder
+from typing import Iterator, Union
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# The lists of an experimental request that are read one element at a time.
+STREAMED_LISTS = ('subjects', 'treatments', 'designs', 'measurements')
+
+# The lists that must be read before an element of a list can be decoded.
+REQUIRED_LISTS = {
+    'subjects': (),
+    'treatments': (),
+    'designs': ('subjects', 'treatments'),
+    'measurements': ('subjects', 'treatments', 'designs')
+}
+
+WHITESPACE = ' \t\n\r'
+
+
+class RequestReader:
+    """
+    Reader that decodes the JSON representation of an experimental request
+    from a file incrementally, and yields its design blocks and measurements
+    one at a time, in the order they occur in the file.
+
+    The file is read in chunks, and the lists of subjects, treatments, designs
+    and measurements of the request are parsed one element at a time with the
+    raw_decode method of a json.JSONDecoder, so only the element being decoded
+    is held as text and as a dictionary.
+    The subjects and treatments are added to the symbol table of a
+    {RequestDecoder} as they are read, and each design block once it is
+    decoded, so that later blocks and measurements can refer to them.
+    An element that occurs before the lists it may refer to is kept until
+    they are read, which never happens for a file written by
+    {ExperimentEncoder} or {RequestEncoder}.
+
+    The other fields of the request are available from {fields} as they are
+    read, and the file may be opened in text or binary mode.
+    """
+
+    def __init__(self, fp, *, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.__fp = fp
+        self.__chunk_size = chunk_size
+        self.__decoder = RequestDecoder()
+        self.__json_decoder = json.JSONDecoder()
+        self.__text_decoder = None
+        self.__buffer = ''
+        self.__position = 0
+        self.__offset = 0
+        self.__eof = False
+        self.__fields = dict()
+        self.__subjects = list()
+        self.__treatments = list()
+        self.__read_lists = set()
+        self.__pending = list()
+
+    @property
+    def fields(self):
+        """
+        The fields of the request other than its lists, as read so far.
+        """
+        return self.__fields
+
+    @property
+    def subjects(self):
+        return self.__subjects
+
+    @property
+    def treatments(self):
+        return self.__treatments
+
+    @property
+    def symbol_table(self):
+        return self.__decoder.symbol_table
+
+    def __iter__(self) -> Iterator[Union[DesignBlock, Measurement]]:
+        self.__expect('{')
+        if self.__peek() == '}':
+            self.__position += 1
+        else:
+            while True:
+                key = self.__value()
+                if not isinstance(key, str):
+                    raise ValueError('expected a field name at position {}'
+                                     .format(self.__location()))
+                self.__expect(':')
+                if key in STREAMED_LISTS:
+                    yield from self.__list(key)
+                else:
+                    self.__field(key, self.__value())
+                if self.__separator('}'):
+                    break
+        yield from self.__release(force=True)
+
+    def __field(self, key: str, value):
+        if (key == 'object_type'
+                and value != 'experimental_request'):
+            raise ValueError('not an experimental request: {}'.format(value))
+        self.__fields[key] = value
+
+    def __list(self, key: str):
+        """
+        Reads the list with the given key one element at a time, and yields
+        the decoded elements that can be released.
+        """
+        self.__expect('[')
+        if self.__peek() == ']':
+            self.__position += 1
+        else:
+            while True:
+                self.__pending.append((key, self.__value()))
+                yield from self.__release()
+                if self.__separator(']'):
+                    break
+        self.__read_lists.add(key)
+        yield from self.__release()
+
+    def __release(self, force: bool = False):
+        """
+        Decodes the pending elements in order, when the lists they may refer
+        to have been read and decoded, or all of them if forced.
+        Yields the design blocks and measurements.
+        """
+        while self.__pending:
+            position = self.__ready(force)
+            if position is None:
+                return
+            key, raw = self.__pending.pop(position)
+            element = self.__decoder.convert(raw)
+            if key == 'subjects':
+                self.__subjects.append(element)
+                self.symbol_table[element.name] = element
+            elif key == 'treatments':
+                self.__treatments.append(element)
+                self.symbol_table[element.name] = element
+            else:
+                if key == 'designs':
+                    self.symbol_table[element.label] = element
+                yield element
+
+    def __ready(self, force: bool):
+        """
+        Returns the position of the first pending element that can be
+        decoded, or None if there is none.
+        """
+        if force:
+            return 0
+        pending_lists = {key for key, _ in self.__pending}
+        for position, (key, _) in enumerate(self.__pending):
+            if all(required in self.__read_lists
+                   and required not in pending_lists
+                   for required in REQUIRED_LISTS[key]):
+                return position
+        return None
+
+    def __value(self):
+        """
+        Decodes the JSON value at the current position, reading more of the
+        file until the value is complete.
+        """
+        self.__skip_whitespace()
+        while True:
+            try:
+                value, end = self.__json_decoder.raw_decode(
+                    self.__buffer, self.__position)
+            except json.JSONDecodeError:
+                if not self.__fill(len(self.__buffer) - self.__position):
+                    raise
+                continue
+            # a number at the end of the buffer may continue in the file
+            if end < len(self.__buffer) or not self.__fill(0):
+                self.__position = end
+                return value
+
+    def __separator(self, closing: str) -> bool:
+        """
+        Reads a comma or the closing bracket, and indicates whether it was the
+        closing bracket.
+        """
+        character = self.__peek()
+        self.__position += 1
+        if character == closing:
+            return True
+        if character != ',':
+            raise ValueError("expected ',' or '{}' at position {}".format(
+                closing, self.__location() - 1))
+        return False
+
+    def __expect(self, character: str):
+        if self.__peek() != character:
+            raise ValueError("expected '{}' at position {}".format(
+                character, self.__location()))
+        self.__position += 1
+
+    def __location(self) -> int:
+        """
+        Returns the position in the text of the file.
+        """
+        return self.__offset + self.__position
+
+    def __peek(self) -> str:
+        self.__skip_whitespace()
+        if self.__position == len(self.__buffer):
+            raise ValueError('unexpected end of the request')
+        return self.__buffer[self.__position]
+
+    def __skip_whitespace(self):
+        while True:
+            while (self.__position < len(self.__buffer)
+                   and self.__buffer[self.__position] in WHITESPACE):
+                self.__position += 1
+            if self.__position < len(self.__buffer) or not self.__fill(0):
+                return
+
+    def __fill(self, pending: int) -> bool:
+        """
+        Reads at least the chunk size, or the size of the pending text, from
+        the file into the buffer, and drops the text before the current
+        position.
+        Reading as much as is pending keeps the number of attempts to decode
+        a long value logarithmic in its length.
+        Returns False at the end of the file.
+        """
+        if self.__eof:
+            return False
+        chunk = self.__read(max(self.__chunk_size, pending))
+        if not chunk:
+            self.__eof = True
+            return False
+        self.__buffer = self.__buffer[self.__position:] + chunk
+        self.__offset += self.__position
+        self.__position = 0
+        return True
+
+    def __read(self, size: int) -> str:
+        """
+        Reads text from the file, decoding it as UTF-8 if the file is binary.
+        Returns an empty string at the end of the file.
+        """
+        chunk = self.__fp.read(size)
+        if not isinstance(chunk, bytes):
+            return chunk
+        if self.__text_decoder is None:
+            self.__text_decoder = codecs.getincrementaldecoder('utf-8')()
+        text = self.__text_decoder.decode(chunk, final=not chunk)
+        # a chunk may end within the encoding of a character
+        while chunk and not text:
+            chunk = self.__fp.read(size)
+            text = self.__text_decoder.decode(chunk, final=not chunk)
+        return text
+
+
+def read_request(fp, *,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> ExperimentalRequest:
+    """
+    Reads the experimental request from the file with a {RequestReader}.
+
+    Gives the same request as json.load with {ExperimentDecoder}, without
+    holding the text or the dictionaries of the whole request in memory.
+    Raises ValueError if a field of the request is missing.
+    """
+    reader = RequestReader(fp, chunk_size=chunk_size)
+    designs = list()
+    measurements = list()
+    for element in reader:
+        if isinstance(element, DesignBlock):
+            designs.append(element)
+        else:
+            measurements.append(element)
+
+    fields = reader.fields
+    for key in ('challenge_problem', 'experiment_reference',
+                'experiment_reference_url', 'experiment_version'):
+        if key not in fields:
+            raise ValueError('request has no {}'.format(key))
+    return ExperimentalRequest(
+        cp_name=fields['challenge_problem'],
+        reference_name=fields['experiment_reference'],
+        reference_url=fields['experiment_reference_url'],
+        version=RequestDecoder().version(fields['experiment_version']),
+        derived_from=fields.get('derived_from'),
+        subjects=reader.subjects,
+        treatments=reader.treatments,
+        designs=designs,
+        measurements=measurements
+    )
@@ -0,0 +1,93 @@
+"""
+Conversion of experimental requests to and from JSON text with the fastest
+JSON library that is installed.
+
+orjson and ujson are optional dependencies of this package, and the json
+module is used if neither is installed.
+Objects are converted with the same mapping as {ExperimentEncoder} and
+{ExperimentDecoder}, by {RequestEncoder} and {RequestDecoder}.
+"""
+
+import json
+from cp_request.request_decoder import RequestDecoder
+from cp_request.request_encoder import RequestEncoder
+from typing import Dict, List, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# The backends, fastest first.
+BACKENDS = ('orjson', 'ujson', 'json')
+
+
+def available_backends() -> List[str]:
+    """
+    Returns the names of the installed backends, fastest first.
+    """
+    installed = {'orjson': orjson, 'ujson': ujson, 'json': json}
+    return [name for name in BACKENDS if installed[name] is not None]
+
+
+def default_backend() -> str:
+    """
+    Returns the name of the fastest installed backend.
+    """
+    return available_backends()[0]
+
+
+def dumps(obj, *, backend: str = None) -> str:
+    """
+    Returns the JSON text for the request, or part of a request, written with
+    the given backend, by default the fastest installed one.
+
+    The text represents the same JSON value with every backend, but only the
+    json backend writes the same text as json.dumps with {ExperimentEncoder};
+    the others write it without whitespace.
+    Raises ValueError if the backend is unknown or not installed.
+    """
+    backend = _backend(backend)
+    if backend == 'orjson':
+        return orjson.dumps(obj, default=RequestEncoder().default).decode()
+    if backend == 'ujson':
+        return ujson.dumps(RequestEncoder().convert(obj),
+                           escape_forward_slashes=False)
+    return json.dumps(obj, cls=RequestEncoder)
+
+
+def loads(text: Union[str, bytes], *, backend: str = None,
+          symbol_table: Dict[str, object] = None, lazy: bool = False):
+    """
+    Returns the request, or part of a request, for the JSON text, parsed with
+    the given backend, by default the fastest installed one.
+
+    The symbol table gives the subjects, treatments and design blocks that
+    the part refers to, and is not needed for a whole request.
+    If lazy, the designs and measurements of a request are decoded when they
+    are first used.
+    Raises ValueError if the backend is unknown or not installed.
+    """
+    backend = _backend(backend)
+    if backend == 'orjson':
+        value = orjson.loads(text)
+    elif backend == 'ujson':
+        value = ujson.loads(text)
+    else:
+        value = json.loads(text)
+    return RequestDecoder(symbol_table, lazy=lazy).convert(value)
+
+
+def _backend(backend: str) -> str:
+    if backend is None:
+        return default_backend()
+    if backend not in BACKENDS:
+        raise ValueError('unknown JSON backend {}'.format(backend))
+    if backend not in available_backends():
+        raise ValueError('JSON backend {} is not installed'.format(backend))
+    return backend
@@ -1,4 +1,5 @@
 import json
+import weakref
 
 
 class Unit:
@@ -9,9 +10,27 @@ class Unit:
     with {UnitDecoder}.
     """
 
+    # The interned units by reference, kept while they are in use.
+    __interned = weakref.WeakValueDictionary()
+
     def __init__(self, *, reference):
         self.__reference = reference
 
+    @staticmethod
+    def intern(*, reference) -> 'Unit':
+        """
+        Returns the shared {Unit} with the reference, creating it if no unit
+        with the reference is in use.
+
+        Units are not modified once created, so interned units can be shared
+        by all values with the same unit.
+        """
+        unit = Unit.__interned.get(reference)
+        if unit is None:
+            unit = Unit(reference=reference)
+            Unit.__interned[reference] = unit
+        return unit
+
     def __repr__(self):
         return "Unit(reference={})".format(repr(self.__reference))
 
@@ -19,6 +38,8 @@ class Unit:
         return self.__reference
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Unit):
             return False
 
@@ -64,4 +85,4 @@ class UnitDecoder(json.JSONDecoder):
             return d
         if 'reference' not in d:
             return d
-        return Unit(reference=d['reference'])
+        return Unit.intern(reference=d['reference'])
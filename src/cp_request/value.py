@@ -1,4 +1,5 @@
 import json
+import weakref
 from cp_request import Unit, UnitEncoder, UnitDecoder
 from typing import Union
 
@@ -11,15 +12,42 @@ class Value:
     {ValueDecoder}.
     """
 
+    # The interned values by key, kept while they are in use.
+    __interned = weakref.WeakValueDictionary()
+
     def __init__(self, *, value: Union[int, float], unit: Unit):
         self.__value = value
         self.__unit = unit
 
+    @staticmethod
+    def intern(*, value: Union[int, float], unit: Unit) -> 'Value':
+        """
+        Returns the shared {Value} with the number and unit, creating it if no
+        such value is in use.
+
+        The unit of the value is the interned unit with the reference of the
+        given unit.
+        Numbers of different types, such as 1 and 1.0, give different values.
+        A value with a number that is not hashable is not interned.
+        """
+        unit = Unit.intern(reference=unit.reference)
+        key = _key(value, unit)
+        try:
+            interned = Value.__interned.get(key)
+        except TypeError:
+            return Value(value=value, unit=unit)
+        if interned is None:
+            interned = Value(value=value, unit=unit)
+            Value.__interned[key] = interned
+        return interned
+
     def __repr__(self):
         return "Value(value={}, unit={})".format(
             self.value, repr(self.unit))
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Value):
             return False
         return self.value == other.value and self.unit == other.unit
@@ -71,6 +99,17 @@ class ValueDecoder(json.JSONDecoder):
             return d
         if 'unit' not in d:
             return d
-        return Value(
-            value=d['value'],
-            unit=UnitDecoder().object_hook(d['unit']))
+        unit = UnitDecoder().object_hook(d['unit'])
+        if not isinstance(unit, Unit):
+            return Value(value=d['value'], unit=unit)
+        return Value.intern(value=d['value'], unit=unit)
+
+
+def _key(value, unit: Unit):
+    """
+    Returns the key of the interned value, which distinguishes the types of
+    numbers, and 0.0 from -0.0.
+    """
+    if isinstance(value, float):
+        return float, value.hex(), unit.reference
+    return type(value), value, unit.reference
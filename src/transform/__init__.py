@@ -1,2 +1,17 @@
 from transform.transformer import RequestTransformer
 from transform.normalize import NormalizeTransformer
+from transform.factor import (
+    Factor, FactoredTerm, FactoredForm, FactorTransformer
+)
+from transform.filter import (
+    SamplePredicate, SubjectPredicate, TreatmentPredicate,
+    FilterTransformer, filter_design, subject_is, value_between
+)
+from transform.delta import DesignDelta, design_delta
+from transform.parallel import (
+    BlockDependencyVisitor, dependency_levels, normalize_request
+)
+from transform.equivalence import FingerprintTransformer, designs_equivalent
+from transform.simplify import SimplifyTransformer
+from transform.intern import InternTransformer
+from transform.hoist import HoistTransformer, hoist_common_blocks
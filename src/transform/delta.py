@@ -0,0 +1,252 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SumBlock
+)
+
+if TYPE_CHECKING:
+    from cp_request.design.block_definition import BlockDefinition
+
+# The parts of a pair of block definitions: the samples the blocks have in
+# common, the samples only in the new block, and the samples only in the old
+# block, each counted with multiplicity.
+# None stands for a part without samples.
+Parts = Tuple[Optional['BlockDefinition'],
+              Optional['BlockDefinition'],
+              Optional['BlockDefinition']]
+
+
+class DesignDelta:
+    """
+    Represents the difference between two revisions of a design as the
+    {DesignBlock} of the samples that were added and the {DesignBlock} of the
+    samples that were removed.
+
+    Samples are counted with multiplicity, so adding a replicate adds one copy
+    of each replicated sample.
+    """
+
+    def __init__(self, *, added: DesignBlock, removed: DesignBlock):
+        self.__added = added
+        self.__removed = removed
+
+    def __repr__(self):
+        return "DesignDelta(added={}, removed={})".format(
+            repr(self.__added), repr(self.__removed))
+
+    def __eq__(self, other):
+        if not isinstance(other, DesignDelta):
+            return False
+        return (self.__added.definition == other.__added.definition and
+                self.__removed.definition == other.__removed.definition)
+
+    @property
+    def added(self):
+        return self.__added
+
+    @property
+    def removed(self):
+        return self.__removed
+
+    def added_samples(self):
+        """
+        Returns an iterator over the {Sample} objects in the new design but not
+        the old.
+        """
+        return self.__added.samples()
+
+    def removed_samples(self):
+        """
+        Returns an iterator over the {Sample} objects in the old design but not
+        the new.
+        """
+        return self.__removed.samples()
+
+
+def design_delta(old: DesignBlock, new: DesignBlock) -> DesignDelta:
+    """
+    Returns the {DesignDelta} from the old to the new revision of a design.
+
+    The two definitions are compared block by block, and only the blocks that
+    differ contribute to the delta, so neither design is expanded.
+    For a product, the samples added are those with an added term of some
+    block, common terms for the blocks before it and any new term for the
+    blocks after it; removed samples are found in the same way.
+    Blocks that cannot be matched, such as blocks of different types, are
+    treated as removing every old sample and adding every new one.
+    The order of the samples of the delta is that of the normal forms of its
+    blocks, and not their order in either design.
+    """
+    _, added, removed = _Differ().diff(old.definition, new.definition)
+    return DesignDelta(
+        added=DesignBlock(label=new.label, definition=_block(added)),
+        removed=DesignBlock(label=old.label, definition=_block(removed))
+    )
+
+
+class _Differ:
+    """
+    Computes the parts of pairs of block definitions, keeping the parts of
+    each pair of referenced design blocks with the same label.
+    """
+
+    def __init__(self):
+        self.__references = dict()
+
+    def diff(self, old: BlockDefinition, new: BlockDefinition) -> Parts:
+        if old is new:
+            return old, None, None
+        if isinstance(old, BlockReference) and isinstance(new, BlockReference):
+            return self.__diff_references(old, new)
+        if type(old) is not type(new):
+            return None, new, old
+        if isinstance(old, GenerateBlock):
+            return self.__diff_generate(old, new)
+        if isinstance(old, ReplicateBlock):
+            return self.__diff_replicate(old, new)
+        if isinstance(old, ProductBlock):
+            return self.__diff_product(old, new)
+        if isinstance(old, SumBlock):
+            return self.__diff_sum(old, new)
+        if old == new:
+            return old, None, None
+        return None, new, old
+
+    def __diff_references(self, old: BlockReference,
+                          new: BlockReference) -> Parts:
+        if old.block_label != new.block_label:
+            return None, new, old
+        key = old.block_label
+        if key not in self.__references:
+            common, added, removed = self.diff(old.block.definition,
+                                               new.block.definition)
+            if common is old.block.definition:
+                common = old
+            self.__references[key] = common, added, removed
+        return self.__references[key]
+
+    @staticmethod
+    def __diff_generate(old: GenerateBlock, new: GenerateBlock) -> Parts:
+        """
+        Matches the values of the blocks as multisets, keeping the order of the
+        values of the new block.
+        """
+        if (old.treatment != new.treatment or
+                old.attribute_name != new.attribute_name):
+            return None, new, old
+        removed = list(old.values)
+        common = list()
+        added = list()
+        for value in new.values:
+            if value in removed:
+                removed.remove(value)
+                common.append(value)
+            else:
+                added.append(value)
+        if not added and not removed:
+            return old, None, None
+        return tuple(
+            GenerateBlock(
+                treatment=new.treatment,
+                attribute_name=new.attribute_name,
+                values=values
+            ) if values else None
+            for values in [common, added, removed]
+        )
+
+    def __diff_replicate(self, old: ReplicateBlock,
+                         new: ReplicateBlock) -> Parts:
+        common, added, removed = self.diff(old.block, new.block)
+        if (old.count == new.count and common is old.block and
+                added is None and removed is None):
+            return old, None, None
+        count = min(old.count, new.count)
+        return (
+            _replicate(count, common),
+            _sum([_replicate(new.count, added),
+                  _replicate(new.count - count, common)]),
+            _sum([_replicate(old.count, removed),
+                  _replicate(old.count - count, common)])
+        )
+
+    def __diff_product(self, old: ProductBlock, new: ProductBlock) -> Parts:
+        if len(old.block_list) != len(new.block_list):
+            return None, new, old
+        parts = [
+            self.diff(old_block, new_block)
+            for old_block, new_block in zip(old.block_list, new.block_list)
+        ]
+        common_list = [common for common, _, _ in parts]
+        added = list()
+        removed = list()
+        for position, (_, added_part, removed_part) in enumerate(parts):
+            if added_part is not None:
+                added.append(_product(
+                    common_list[:position] + [added_part] +
+                    new.block_list[position + 1:]))
+            if removed_part is not None:
+                removed.append(_product(
+                    common_list[:position] + [removed_part] +
+                    old.block_list[position + 1:]))
+        if not added and not removed:
+            return old, None, None
+        return _product(common_list), _sum(added), _sum(removed)
+
+    def __diff_sum(self, old: SumBlock, new: SumBlock) -> Parts:
+        """
+        Compares the blocks of the sums position by position, so blocks
+        appended to the new sum are added and blocks dropped from the end are
+        removed.
+        """
+        parts = [
+            self.diff(old_block, new_block)
+            for old_block, new_block in zip(old.block_list, new.block_list)
+        ]
+        if (len(old.block_list) == len(new.block_list) and
+                all(common is old_block and added is None and removed is None
+                    for (common, added, removed), old_block
+                    in zip(parts, old.block_list))):
+            return old, None, None
+        count = len(parts)
+        return (
+            _sum([common for common, _, _ in parts]),
+            _sum([added for _, added, _ in parts] + new.block_list[count:]),
+            _sum([removed for _, _, removed in parts] + old.block_list[count:])
+        )
+
+
+def _block(block: Optional[BlockDefinition]) -> BlockDefinition:
+    if block is None:
+        return SumBlock(block_list=[])
+    return block
+
+
+def _sum(block_list: List[Optional[BlockDefinition]]):
+    block_list = [block for block in block_list if block is not None]
+    if not block_list:
+        return None
+    if len(block_list) == 1:
+        return block_list[0]
+    return SumBlock(block_list=block_list)
+
+
+def _product(block_list: List[Optional[BlockDefinition]]):
+    if any(block is None for block in block_list):
+        return None
+    if len(block_list) == 1:
+        return block_list[0]
+    return ProductBlock(block_list=block_list)
+
+
+def _replicate(count: int, block: Optional[BlockDefinition]):
+    if block is None or count == 0:
+        return None
+    if count == 1:
+        return block
+    return ReplicateBlock(count=count, block=block)
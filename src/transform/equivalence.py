@@ -0,0 +1,166 @@
+from __future__ import annotations
+import hashlib
+from typing import TYPE_CHECKING, Tuple, Union
+
+from cp_request.design import (
+    DesignBlock,
+    TreatmentValueReference,
+    term_key
+)
+from cp_request.design.sample_index import DEFAULT_DIGITS
+
+if TYPE_CHECKING:
+    from cp_request.design import (
+        BlockReference,
+        GenerateBlock,
+        ProductBlock,
+        ReplicateBlock,
+        SubjectReference,
+        SumBlock,
+        TreatmentReference
+    )
+    from cp_request.design.block_definition import BlockDefinition
+
+from transform import RequestTransformer
+
+# A Mersenne prime, the modulus of the fingerprints.
+MODULUS = 2 ** 61 - 1
+
+DEFAULT_ROUNDS = 2
+
+Fingerprint = Tuple[int, ...]
+
+
+class FingerprintTransformer(RequestTransformer):
+    """
+    Transformer that computes a fingerprint of the multiset of samples of a
+    block definition without expanding it.
+
+    The normal form of a block is read as a polynomial with a variable for
+    each subject and treatment value: a sample is the product of the
+    variables of its references, and the normal form the sum of its samples.
+    The fingerprint is the value of this polynomial modulo {MODULUS}, with
+    each variable set to a pseudo-random value derived from the {sample_key}
+    of the reference, once for each of a number of rounds.
+    It is computed directly from the block: sums add, products multiply,
+    replicates scale, and a {GenerateBlock} adds its values.
+
+    Since sums and products commute, blocks with the same samples in any
+    order have the same fingerprint, and by the Schwartz-Zippel lemma blocks
+    with different samples have the same fingerprint with probability at most
+    the number of references of a sample over {MODULUS} in each round.
+    The fingerprint of each referenced design block is computed once and
+    kept in the symbol table under its label.
+    """
+
+    def __init__(self, *, rounds: int = DEFAULT_ROUNDS,
+                 digits: int = DEFAULT_DIGITS):
+        super().__init__(dict())
+        self.__rounds = rounds
+        self.__digits = digits
+        self.__variables = dict()
+
+    @property
+    def rounds(self):
+        return self.__rounds
+
+    def transform_design_block(self, block: DesignBlock) -> Fingerprint:
+        return block.definition.transform(self)
+
+    def transform_block_reference(self,
+                                  reference: BlockReference) -> Fingerprint:
+        if reference.block_label not in self.symbol_table:
+            self.symbol_table[reference.block_label] = \
+                reference.block.definition.transform(self)
+        return self.symbol_table[reference.block_label]
+
+    def transform_product_block(self, block: ProductBlock) -> Fingerprint:
+        result = self.__constant(1)
+        for sub_block in block.block_list:
+            result = tuple(
+                (left * right) % MODULUS
+                for left, right in zip(result, sub_block.transform(self))
+            )
+        return result
+
+    def transform_sum_block(self, block: SumBlock) -> Fingerprint:
+        result = self.__constant(0)
+        for sub_block in block.block_list:
+            result = _add(result, sub_block.transform(self))
+        return result
+
+    def transform_replicate_block(self,
+                                  block: ReplicateBlock) -> Fingerprint:
+        return tuple(
+            (block.count * value) % MODULUS
+            for value in block.block.transform(self)
+        )
+
+    def transform_generate_block(self, block: GenerateBlock) -> Fingerprint:
+        result = self.__constant(0)
+        for value in block.values:
+            result = _add(result, self.__variable(TreatmentValueReference(
+                treatment=block.treatment, value=value)))
+        return result
+
+    def transform_subject_reference(self, reference: SubjectReference):
+        return self.__variable(reference)
+
+    def transform_treatment_reference(self, reference: TreatmentReference):
+        return self.__variable(reference)
+
+    def transform_treatment_value_reference(
+            self,
+            reference: TreatmentValueReference):
+        return self.__variable(reference)
+
+    def __constant(self, value: int) -> Fingerprint:
+        return (value,) * self.__rounds
+
+    def __variable(self, reference: BlockDefinition) -> Fingerprint:
+        """
+        Returns the values of the variable for the reference in each round.
+        """
+        key = repr(term_key((reference,), digits=self.__digits))
+        if key not in self.__variables:
+            self.__variables[key] = tuple(
+                int.from_bytes(hashlib.blake2b(
+                    '{}:{}'.format(position, key).encode(),
+                    digest_size=16).digest(), 'big') % MODULUS
+                for position in range(self.__rounds)
+            )
+        return self.__variables[key]
+
+
+def _add(left: Fingerprint, right: Fingerprint) -> Fingerprint:
+    return tuple((a + b) % MODULUS for a, b in zip(left, right))
+
+
+def designs_equivalent(a: Union[DesignBlock, BlockDefinition],
+                       b: Union[DesignBlock, BlockDefinition], *,
+                       rounds: int = DEFAULT_ROUNDS,
+                       digits: int = DEFAULT_DIGITS) -> bool:
+    """
+    Indicates whether the two designs denote the same multiset of samples,
+    regardless of their order.
+
+    Samples are compared by {sample_key}, so the order of the treatments of a
+    sample does not matter and values are rounded to the given number of
+    significant digits.
+    The designs are compared by cardinality and by the fingerprints of a
+    {FingerprintTransformer}, so neither is expanded.
+    Equivalent designs are always reported as equivalent, and different
+    designs are wrongly reported as equivalent with a probability that is
+    negligible for a few rounds.
+    Each design is fingerprinted with its own transformer, since the two may
+    use the same label for different blocks.
+    """
+    if isinstance(a, DesignBlock):
+        a = a.definition
+    if isinstance(b, DesignBlock):
+        b = b.definition
+    if a.cardinality() != b.cardinality():
+        return False
+    return (a.transform(FingerprintTransformer(rounds=rounds, digits=digits))
+            == b.transform(FingerprintTransformer(rounds=rounds,
+                                                  digits=digits)))
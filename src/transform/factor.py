@@ -0,0 +1,297 @@
+from __future__ import annotations
+import itertools
+import math
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+from cp_request import Sample
+from cp_request.design import SubjectReference, TreatmentValueReference
+
+if TYPE_CHECKING:
+    from cp_request.design import (
+        DesignBlock,
+        BlockReference,
+        GenerateBlock,
+        ProductBlock,
+        ReplicateBlock,
+        SumBlock,
+        TreatmentReference
+    )
+    from cp_request.design.block_definition import BlockDefinition
+
+from transform import RequestTransformer
+
+Term = Tuple['BlockDefinition', ...]
+
+
+class Factor:
+    """
+    Represents a factor of a product as the list of its levels.
+
+    Each level is a product term given as a tuple of subject and treatment
+    references.
+    """
+
+    def __init__(self, *, levels: List[Term]):
+        self.__levels = levels
+
+    def __repr__(self):
+        return "Factor(levels={})".format(repr(self.__levels))
+
+    def __eq__(self, other):
+        if not isinstance(other, Factor):
+            return False
+        return self.__levels == other.__levels
+
+    @property
+    def levels(self):
+        return self.__levels
+
+    def cardinality(self) -> int:
+        return len(self.__levels)
+
+
+class FactoredTerm:
+    """
+    Represents the product of a list of factors without expanding it.
+
+    The multiplicity is the number of replicates of each product term of the
+    expansion.
+    """
+
+    def __init__(self, *, factors: List[Factor], multiplicity: int = 1):
+        self.__factors = factors
+        self.__multiplicity = multiplicity
+
+    def __repr__(self):
+        return "FactoredTerm(factors={}, multiplicity={})".format(
+            repr(self.__factors), self.__multiplicity)
+
+    def __eq__(self, other):
+        if not isinstance(other, FactoredTerm):
+            return False
+        return (self.__factors == other.__factors and
+                self.__multiplicity == other.__multiplicity)
+
+    @property
+    def factors(self):
+        return self.__factors
+
+    @property
+    def multiplicity(self):
+        return self.__multiplicity
+
+    def cardinality(self) -> int:
+        return self.__multiplicity * math.prod(
+            factor.cardinality() for factor in self.__factors)
+
+    def terms(self) -> Iterator[Term]:
+        """
+        Returns an iterator over the product terms of the expansion of this
+        term, with the last factor varying fastest and the replicates of each
+        term adjacent.
+        """
+        for levels in itertools.product(
+                *[factor.levels for factor in self.__factors]):
+            term = tuple(itertools.chain.from_iterable(levels))
+            for _ in range(self.__multiplicity):
+                yield term
+
+
+class FactoredForm:
+    """
+    Represents a design in a factored normal form: a sum of products of
+    factors, each of which is a list of levels.
+
+    Unlike the normal form, the cross product of the factors of a term is
+    only expanded when the terms or samples are requested.
+    Counts and marginals are computed from the factors.
+    The expansion has the same samples as the normal form of the design,
+    though not necessarily in the same order.
+    """
+
+    def __init__(self, *, term_list: List[FactoredTerm]):
+        self.__term_list = term_list
+
+    def __repr__(self):
+        return "FactoredForm(term_list={})".format(repr(self.__term_list))
+
+    def __eq__(self, other):
+        if not isinstance(other, FactoredForm):
+            return False
+        return self.__term_list == other.__term_list
+
+    @property
+    def term_list(self):
+        return self.__term_list
+
+    def cardinality(self) -> int:
+        return sum(term.cardinality() for term in self.__term_list)
+
+    def terms(self) -> Iterator[Term]:
+        """
+        Returns an iterator over the product terms of the expansion of this
+        form.
+        """
+        for term in self.__term_list:
+            yield from term.terms()
+
+    def samples(self) -> Iterator[Sample]:
+        """
+        Returns an iterator over the {Sample} objects of the expansion of this
+        form.
+        """
+        return (Sample.create_from(block_list=term) for term in self.terms())
+
+    def marginal(self, name: str) -> List[Tuple[BlockDefinition, int]]:
+        """
+        Returns the number of samples that include each reference to the named
+        subject or treatment, as a list of (reference, count) pairs in order of
+        first occurrence.
+
+        Counts are computed from the sizes of the factors, without expanding
+        the terms.
+        """
+        counts = list()
+        for term in self.__term_list:
+            cardinality = term.cardinality()
+            if cardinality == 0:
+                continue
+            for factor in term.factors:
+                count = cardinality // factor.cardinality()
+                for level in factor.levels:
+                    for reference in level:
+                        if _reference_name(reference) == name:
+                            _add_count(counts, reference, count)
+        return counts
+
+
+def _product_factors(factors: List[Factor],
+                     other: List[Factor]) -> List[Factor]:
+    """
+    Returns the factors of the product of two terms, merging the last factor
+    of the first with the first factor of the second if both have one level.
+    """
+    if (factors and other
+            and factors[-1].cardinality() == 1
+            and other[0].cardinality() == 1):
+        merged = Factor(levels=[factors[-1].levels[0] + other[0].levels[0]])
+        return factors[:-1] + [merged] + other[1:]
+    return factors + other
+
+
+def _reference_name(reference: BlockDefinition) -> str:
+    if isinstance(reference, SubjectReference):
+        return reference.entity.name
+    return reference.treatment_name
+
+
+def _add_count(counts, reference, count):
+    for position, (counted, total) in enumerate(counts):
+        if counted == reference and type(counted) is type(reference):
+            counts[position] = (counted, total + count)
+            return
+    counts.append((reference, count))
+
+
+class FactorTransformer(RequestTransformer):
+    """
+    Transformer that converts design blocks to a {FactoredForm}.
+
+    Products are distributed over sums as in the normal form, but the levels
+    of each factor are kept as a list rather than being multiplied out.
+    A sum of terms that each have a single factor becomes one factor with the
+    levels of all of them, so that a product of such sums is a single term,
+    and adjacent factors with a single level are merged into one.
+    A referenced design block is factored once and the form is kept in the
+    symbol table under its label.
+    """
+
+    def __init__(self):
+        super().__init__(dict())
+
+    def transform_design_block(self, block: DesignBlock):
+        return block.definition.transform(self)
+
+    def transform_product_block(self, block: ProductBlock):
+        term_list = [FactoredTerm(factors=[])]
+        for sub_block in block.block_list:
+            form = sub_block.transform(self)
+            term_list = [
+                FactoredTerm(
+                    factors=_product_factors(term.factors, sub_term.factors),
+                    multiplicity=term.multiplicity * sub_term.multiplicity)
+                for term in term_list
+                for sub_term in form.term_list
+            ]
+        return FactoredForm(term_list=term_list)
+
+    def transform_block_reference(self, reference: BlockReference):
+        if reference.block_label not in self.symbol_table:
+            self.symbol_table[reference.block_label] = \
+                reference.block.transform(self)
+        return self.symbol_table[reference.block_label]
+
+    def transform_sum_block(self, block: SumBlock):
+        """
+        Merges the terms of the sum into a single factor if each term has one
+        factor and the terms have the same multiplicity, and otherwise keeps
+        the terms of each block in the list.
+        """
+        term_list = [
+            term
+            for sub_block in block.block_list
+            for term in sub_block.transform(self).term_list
+        ]
+        if len(term_list) < 2 or any(
+                len(term.factors) != 1
+                or term.multiplicity != term_list[0].multiplicity
+                for term in term_list):
+            return FactoredForm(term_list=term_list)
+        return FactoredForm(term_list=[
+            FactoredTerm(
+                factors=[Factor(levels=[
+                    level
+                    for term in term_list
+                    for level in term.factors[0].levels
+                ])],
+                multiplicity=term_list[0].multiplicity)
+        ])
+
+    def transform_subject_reference(self, reference: SubjectReference):
+        return self.__reference_form(reference)
+
+    def transform_treatment_reference(self, reference: TreatmentReference):
+        return self.__reference_form(reference)
+
+    def transform_treatment_value_reference(
+            self,
+            reference: TreatmentValueReference):
+        return self.__reference_form(reference)
+
+    @staticmethod
+    def __reference_form(reference: BlockDefinition):
+        return FactoredForm(term_list=[
+            FactoredTerm(factors=[Factor(levels=[(reference,)])])
+        ])
+
+    def transform_replicate_block(self, block: ReplicateBlock):
+        """
+        Multiplies the multiplicity of each term of the replicated block by the
+        count, rather than adding a factor for the replicates.
+        """
+        return FactoredForm(term_list=[
+            FactoredTerm(factors=term.factors,
+                         multiplicity=term.multiplicity * block.count)
+            for term in block.block.transform(self).term_list
+        ])
+
+    def transform_generate_block(self, block: GenerateBlock):
+        return FactoredForm(term_list=[
+            FactoredTerm(factors=[
+                Factor(levels=[
+                    (TreatmentValueReference(
+                        treatment=block.treatment, value=value),)
+                    for value in block.values
+                ])
+            ])
+        ])
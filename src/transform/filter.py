@@ -0,0 +1,298 @@
+from __future__ import annotations
+import abc
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference,
+    TreatmentValueReference
+)
+
+if TYPE_CHECKING:
+    from cp_request import Unit
+    from cp_request.design.block_definition import BlockDefinition
+
+from transform import RequestTransformer
+
+# The parts of the normal form of a block for a predicate: the terms that
+# satisfy the predicate, the terms that do not mention its subject or
+# treatment, and all terms without a reference that fails the predicate.
+# None stands for a part without terms.
+Parts = Tuple[Optional['BlockDefinition'],
+              Optional['BlockDefinition'],
+              Optional['BlockDefinition']]
+
+
+class SamplePredicate(abc.ABC):
+    """
+    Abstract condition on the subject or on a treatment of a sample.
+
+    A sample satisfies the predicate if it has a reference to which the
+    predicate applies, and every such reference is accepted by the test.
+    """
+
+    def __init__(self, *, test: Callable[[BlockDefinition], bool]):
+        self.__test = test
+
+    @abc.abstractmethod
+    def applies_to(self, reference: BlockDefinition) -> bool:
+        """
+        Indicates whether the subject or treatment reference is constrained by
+        this predicate.
+        """
+        pass
+
+    def accepts(self, reference: BlockDefinition) -> bool:
+        return self.__test(reference)
+
+
+class SubjectPredicate(SamplePredicate):
+    """
+    A condition on the {SubjectReference} of a sample.
+    """
+
+    def __init__(self, *, test: Callable[[SubjectReference], bool]):
+        super().__init__(test=test)
+
+    def __repr__(self):
+        return "SubjectPredicate()"
+
+    def applies_to(self, reference: BlockDefinition) -> bool:
+        return isinstance(reference, SubjectReference)
+
+
+class TreatmentPredicate(SamplePredicate):
+    """
+    A condition on the references to the named treatment in a sample.
+    """
+
+    def __init__(self, *, treatment_name: str,
+                 test: Callable[[TreatmentReference], bool]):
+        super().__init__(test=test)
+        self.__treatment_name = treatment_name
+
+    def __repr__(self):
+        return "TreatmentPredicate(treatment_name={})".format(
+            repr(self.__treatment_name))
+
+    def applies_to(self, reference: BlockDefinition) -> bool:
+        return (isinstance(reference, TreatmentReference) and
+                reference.treatment_name == self.__treatment_name)
+
+    @property
+    def treatment_name(self):
+        return self.__treatment_name
+
+
+def subject_is(name: str) -> SubjectPredicate:
+    """
+    Returns a predicate for samples with the named subject.
+    """
+    return SubjectPredicate(
+        test=lambda reference: reference.entity.name == name)
+
+
+def value_between(treatment_name: str, *,
+                  minimum: float = None,
+                  maximum: float = None,
+                  unit: Unit = None) -> TreatmentPredicate:
+    """
+    Returns a predicate for samples in which the named treatment has a value
+    in the closed interval from minimum to maximum, either bound being
+    optional.
+
+    If a unit is given, values with a different unit are rejected.
+    """
+    def test(reference: TreatmentReference) -> bool:
+        if not isinstance(reference, TreatmentValueReference):
+            return False
+        value = reference.value
+        if unit is not None and value.unit != unit:
+            return False
+        if minimum is not None and value.value < minimum:
+            return False
+        if maximum is not None and value.value > maximum:
+            return False
+        return True
+
+    return TreatmentPredicate(treatment_name=treatment_name, test=test)
+
+
+def filter_design(block: DesignBlock, *,
+                  predicates: List[SamplePredicate]) -> DesignBlock:
+    """
+    Returns a {DesignBlock} with the same label, whose samples are the samples
+    of the block that satisfy all of the predicates.
+
+    Each predicate is pushed into the definition by a {FilterTransformer},
+    so the pruned design is built without enumerating samples.
+    """
+    definition = block.definition
+    for predicate in predicates:
+        matching, _, _ = DesignBlock(
+            label=block.label, definition=definition).transform(
+                FilterTransformer(predicate=predicate))
+        if matching is None:
+            matching = SumBlock(block_list=[])
+        definition = matching
+    return DesignBlock(label=block.label, definition=definition)
+
+
+class FilterTransformer(RequestTransformer):
+    """
+    Transformer that prunes a design to the samples that satisfy a
+    {SamplePredicate}.
+
+    Transforming a block returns the {Parts} of the block: the pruned
+    definition of the samples that satisfy the predicate, of the samples that
+    do not mention the constrained subject or treatment, and of all samples
+    without a rejected reference.
+    References and generated values rejected by the predicate are removed
+    from sums, and a product with a block without terms is removed, so no
+    product of rejected terms is formed.
+
+    Blocks that the predicate does not constrain are kept as they are, and a
+    {BlockReference} whose block is unchanged is kept, so shared blocks stay
+    shared.
+    If only one block of each product mentions the constrained subject or
+    treatment, the samples are in the same relative order as in the original
+    design.
+    The parts of each referenced {DesignBlock} are computed once and kept in
+    the symbol table under its label.
+    """
+
+    def __init__(self, *, predicate: SamplePredicate):
+        super().__init__(dict())
+        self.__predicate = predicate
+
+    @property
+    def predicate(self):
+        return self.__predicate
+
+    def transform_design_block(self, block: DesignBlock) -> Parts:
+        return block.definition.transform(self)
+
+    def transform_block_reference(self, reference: BlockReference) -> Parts:
+        if reference.block_label not in self.symbol_table:
+            definition = reference.block.definition
+            self.symbol_table[reference.block_label] = tuple(
+                reference if part is definition else part
+                for part in definition.transform(self)
+            )
+        return self.symbol_table[reference.block_label]
+
+    def transform_product_block(self, block: ProductBlock) -> Parts:
+        """
+        The samples of the product that satisfy the predicate are split by the
+        first block in the list that mentions the constrained subject or
+        treatment.
+        """
+        parts = [sub_block.transform(self) for sub_block in block.block_list]
+        lacking = [part for _, part, _ in parts]
+        kept = [part for _, _, part in parts]
+        matching = list()
+        for position, (part, _, _) in enumerate(parts):
+            if part is not None:
+                matching.append(_product(
+                    block,
+                    lacking[:position] + [part] + kept[position + 1:]))
+        return (_sum(None, matching),
+                _product(block, lacking),
+                _product(block, kept))
+
+    def transform_sum_block(self, block: SumBlock) -> Parts:
+        parts = [sub_block.transform(self) for sub_block in block.block_list]
+        return tuple(
+            _sum(block, [sub_parts[index] for sub_parts in parts])
+            for index in range(3)
+        )
+
+    def transform_replicate_block(self, block: ReplicateBlock) -> Parts:
+        return tuple(
+            _replicate(block, part) for part in block.block.transform(self))
+
+    def transform_subject_reference(self, reference: SubjectReference):
+        return self.__reference_parts(reference)
+
+    def transform_treatment_reference(self, reference: TreatmentReference):
+        return self.__reference_parts(reference)
+
+    def transform_treatment_value_reference(
+            self,
+            reference: TreatmentValueReference):
+        return self.__reference_parts(reference)
+
+    def __reference_parts(self, reference: BlockDefinition) -> Parts:
+        if not self.__predicate.applies_to(reference):
+            return None, reference, reference
+        if self.__predicate.accepts(reference):
+            return reference, None, reference
+        return None, None, None
+
+    def transform_generate_block(self, block: GenerateBlock) -> Parts:
+        """
+        Drops the values of the block rejected by the predicate.
+        """
+        if not self.__predicate.applies_to(
+                TreatmentReference(treatment=block.treatment)):
+            return None, block, block
+        values = [
+            value for value in block.values
+            if self.__predicate.accepts(TreatmentValueReference(
+                treatment=block.treatment, value=value))
+        ]
+        if not values:
+            return None, None, None
+        if len(values) < len(block.values):
+            block = GenerateBlock(
+                treatment=block.treatment,
+                attribute_name=block.attribute_name,
+                values=values
+            )
+        return block, None, block
+
+
+def _sum(block: Optional[SumBlock],
+         block_list: List[Optional[BlockDefinition]]):
+    """
+    Returns the sum of the blocks other than None, or the original block if
+    the list is unchanged.
+    """
+    if block is not None and all(
+            part is sub_block
+            for part, sub_block in zip(block_list, block.block_list)):
+        return block
+    block_list = [part for part in block_list if part is not None]
+    if not block_list:
+        return None
+    if len(block_list) == 1:
+        return block_list[0]
+    return SumBlock(block_list=block_list)
+
+
+def _product(block: ProductBlock,
+             block_list: List[Optional[BlockDefinition]]):
+    """
+    Returns the product of the blocks, None if any block is None, or the
+    original block if the list is unchanged.
+    """
+    if any(part is None for part in block_list):
+        return None
+    if all(part is sub_block
+           for part, sub_block in zip(block_list, block.block_list)):
+        return block
+    return ProductBlock(block_list=block_list)
+
+
+def _replicate(block: ReplicateBlock, part: Optional[BlockDefinition]):
+    if part is None:
+        return None
+    if part is block.block:
+        return block
+    return ReplicateBlock(count=block.count, block=part)
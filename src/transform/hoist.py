@@ -0,0 +1,258 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+from cp_request import ExperimentalRequest, Measurement
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SumBlock
+)
+
+if TYPE_CHECKING:
+    from cp_request.design import (
+        SubjectReference,
+        TreatmentReference,
+        TreatmentValueReference
+    )
+    from cp_request.design.block_definition import BlockDefinition
+
+from transform import RequestTransformer
+from transform.intern import InternTransformer
+
+DEFAULT_MINIMUM_SIZE = 3
+
+
+class HoistTransformer(RequestTransformer):
+    """
+    Transformer that moves the block definitions repeated inline in an
+    experimental request into new labeled {DesignBlock} objects, and replaces
+    each repetition with a {BlockReference} to the new block.
+
+    The request is first interned with an {InternTransformer}, and a
+    definition is hoisted if it is still used inline more than once after
+    the definitions enclosing it are hoisted, and if its size, the number of
+    blocks and generated values in it, is at least the minimum size.
+    A hoisted definition that is also the definition of a design block is
+    referred to by that block, unless a repetition comes before the block.
+
+    The new blocks are labeled with the prefix and a number, skipping the
+    labels of the request, and are placed in the designs of the request before
+    the first block that refers to them.
+    """
+
+    def __init__(self, *, minimum_size: int = DEFAULT_MINIMUM_SIZE,
+                 label_prefix: str = 'shared'):
+        super().__init__(dict())
+        self.__minimum_size = minimum_size
+        self.__label_prefix = label_prefix
+        self.__hoisted = set()
+        self.__labels = set()
+        self.__blocks = dict()
+        self.__designs = list()
+        self.__hoisted_blocks = list()
+
+    @property
+    def hoisted_blocks(self) -> List[DesignBlock]:
+        """
+        The design blocks created by this transformer.
+        """
+        return self.__hoisted_blocks
+
+    def transform_experiment(self, experiment: ExperimentalRequest):
+        """
+        Creates the request with the repeated definitions of its design
+        blocks hoisted into new design blocks.
+        """
+        interner = InternTransformer()
+        experiment = experiment.transform(interner)
+        blocks = list(interner.symbol_table.values())
+        self.__hoisted = _hoisted(blocks, self.__minimum_size)
+        self.__labels = {
+            block.label for block in blocks if isinstance(block, DesignBlock)
+        }
+
+        designs = [block.transform(self) for block in experiment.designs]
+        measurements = [
+            Measurement(
+                type=measurement.type,
+                block=measurement.block.transform(self),
+                controls=measurement.controls,
+                performers=measurement.performers
+            )
+            for measurement in experiment.measurements
+        ]
+        kept = {id(block) for block in designs + self.__hoisted_blocks}
+        return ExperimentalRequest(
+            cp_name=experiment.challenge_problem,
+            reference_name=experiment.experiment_reference,
+            reference_url=experiment.experiment_reference_url,
+            version=experiment.experiment_version,
+            derived_from=experiment.derived_from,
+            subjects=experiment.subjects,
+            treatments=experiment.treatments,
+            designs=[
+                block for block in self.__designs if id(block) in kept
+            ],
+            measurements=measurements
+        )
+
+    def transform_design_block(self, block: DesignBlock):
+        if id(block) in self.__blocks:
+            return self.__blocks[id(block)]
+        definition = block.definition
+        if id(definition) in self.__blocks:
+            # hoisted from a repetition before this block
+            result = DesignBlock(label=block.label,
+                                 definition=self.__blocks[id(definition)])
+        else:
+            result = DesignBlock(label=block.label,
+                                 definition=self.__definition(definition))
+            if id(definition) in self.__hoisted:
+                self.__blocks[id(definition)] = BlockReference(block=result)
+        self.__blocks[id(block)] = result
+        self.symbol_table[result.label] = result
+        self.__designs.append(result)
+        return result
+
+    def transform_block_reference(self, reference: BlockReference):
+        return BlockReference(block=reference.block.transform(self))
+
+    def transform_product_block(self, block: ProductBlock):
+        return self.__hoist(block, lambda: self.__product(block))
+
+    def transform_sum_block(self, block: SumBlock):
+        return self.__hoist(block, lambda: self.__sum(block))
+
+    def transform_replicate_block(self, block: ReplicateBlock):
+        return self.__hoist(block, lambda: self.__replicate(block))
+
+    def transform_generate_block(self, block: GenerateBlock):
+        return self.__hoist(block, lambda: block)
+
+    def transform_subject_reference(self, reference: SubjectReference):
+        return reference
+
+    def transform_treatment_reference(self, reference: TreatmentReference):
+        return reference
+
+    def transform_treatment_value_reference(
+            self,
+            reference: TreatmentValueReference):
+        return reference
+
+    def __definition(self, block: BlockDefinition) -> BlockDefinition:
+        """
+        Transforms the definition of a design block, which is not replaced by
+        a reference even if it is hoisted.
+        """
+        if isinstance(block, ProductBlock):
+            return self.__product(block)
+        if isinstance(block, SumBlock):
+            return self.__sum(block)
+        if isinstance(block, ReplicateBlock):
+            return self.__replicate(block)
+        if isinstance(block, GenerateBlock):
+            return block
+        return block.transform(self)
+
+    def __product(self, block: ProductBlock) -> ProductBlock:
+        return ProductBlock(block_list=[
+            sub_block.transform(self) for sub_block in block.block_list
+        ])
+
+    def __sum(self, block: SumBlock) -> SumBlock:
+        return SumBlock(block_list=[
+            sub_block.transform(self) for sub_block in block.block_list
+        ])
+
+    def __replicate(self, block: ReplicateBlock) -> ReplicateBlock:
+        return ReplicateBlock(count=block.count,
+                              block=block.block.transform(self))
+
+    def __hoist(self, block: BlockDefinition,
+                create: Callable[[], BlockDefinition]) -> BlockDefinition:
+        """
+        Returns the transformed block, or a reference to a new design block
+        with the transformed block if the block is hoisted.
+        Each interned block is transformed once.
+        """
+        if id(block) in self.__blocks:
+            return self.__blocks[id(block)]
+        result = create()
+        if id(block) in self.__hoisted:
+            design = DesignBlock(label=self.__new_label(), definition=result)
+            self.symbol_table[design.label] = design
+            self.__designs.append(design)
+            self.__hoisted_blocks.append(design)
+            result = BlockReference(block=design)
+        self.__blocks[id(block)] = result
+        return result
+
+    def __new_label(self) -> str:
+        number = len(self.__hoisted_blocks) + 1
+        label = '{}-{}'.format(self.__label_prefix, number)
+        while label in self.__labels:
+            number += 1
+            label = '{}-{}'.format(self.__label_prefix, number)
+        self.__labels.add(label)
+        return label
+
+
+def _hoisted(blocks: List[BlockDefinition], minimum_size: int) -> set:
+    """
+    Returns the identities of the interned blocks to hoist.
+
+    The blocks are in the order they were interned, so each block comes after
+    the blocks it contains.
+    The inline uses of a block are counted from its enclosing blocks, where
+    a hoisted block, or the definition of a design block, is used once.
+    """
+    sizes: Dict[int, int] = dict()
+    for block in blocks:
+        sizes[id(block)] = 1 + sum(
+            sizes[id(child)] for child in _children(block))
+        if isinstance(block, GenerateBlock):
+            sizes[id(block)] += len(block.values)
+
+    uses = {id(block): 0 for block in blocks}
+    hoisted = set()
+    for block in reversed(blocks):
+        if isinstance(block, DesignBlock):
+            weight = 1
+        elif (uses[id(block)] > 1 and sizes[id(block)] >= minimum_size
+                and not isinstance(block, BlockReference)):
+            hoisted.add(id(block))
+            weight = 1
+        else:
+            weight = uses[id(block)]
+        for child in _children(block):
+            uses[id(child)] += weight
+    return hoisted
+
+
+def _children(block) -> List[BlockDefinition]:
+    """
+    Returns the blocks contained in the block, not including the block
+    referred to by a {BlockReference}.
+    """
+    if isinstance(block, DesignBlock):
+        return [block.definition]
+    if isinstance(block, (ProductBlock, SumBlock)):
+        return block.block_list
+    if isinstance(block, ReplicateBlock):
+        return [block.block]
+    return []
+
+
+def hoist_common_blocks(experiment: ExperimentalRequest, *,
+                        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+                        label_prefix: str = 'shared') -> ExperimentalRequest:
+    """
+    Returns the experimental request with the block definitions repeated
+    inline hoisted into new design blocks by a {HoistTransformer}.
+    """
+    return experiment.transform(HoistTransformer(minimum_size=minimum_size,
+                                                 label_prefix=label_prefix))
@@ -0,0 +1,196 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Callable, Hashable, List, Tuple
+
+from cp_request import ExperimentalRequest, Measurement
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SumBlock
+)
+
+if TYPE_CHECKING:
+    from cp_request.design import (
+        SubjectReference,
+        TreatmentReference,
+        TreatmentValueReference
+    )
+    from cp_request.design.block_definition import BlockDefinition
+
+from transform import RequestTransformer
+
+
+class InternTransformer(RequestTransformer):
+    """
+    Transformer that hash-conses design blocks, so that structurally equal
+    blocks are one shared object.
+
+    Each block is identified by a structural key made of its type, its own
+    fields, and the identities of its interned sub-blocks, so the key of a
+    block is computed from its children without comparing subtrees.
+    The structural hash of a block is computed in the same way from its own
+    fields and the structural hashes of its sub-blocks, so it does not depend
+    on the identities of the blocks, and equal blocks interned by different
+    transformers have the same hash.
+    The first occurrence of a block is kept as the shared object, and a
+    composite block is only rebuilt if one of its sub-blocks was replaced.
+
+    The blocks returned by {shared_blocks} can be passed to a
+    {NormalizeTransformer}, which then decodes their terms from the block at
+    each occurrence rather than normalizing them again.
+    The table of blocks persists across calls, so several designs or
+    requests transformed by one transformer share their common blocks.
+    A {DesignBlock} is traversed only the first time it is transformed, and
+    counts as one more occurrence each later time.
+    """
+
+    def __init__(self):
+        super().__init__(dict())
+        self.__hashes = dict()
+        self.__counts = dict()
+        self.__design_blocks = dict()
+
+    def __len__(self):
+        return len(self.symbol_table)
+
+    def structural_hash(self, block) -> int:
+        """
+        Returns the structural hash of a block interned by this transformer.
+        Structurally equal blocks have the same hash.
+        """
+        return self.__hashes[id(block)]
+
+    def occurrences(self, block) -> int:
+        """
+        Returns the number of times the interned block occurs in the blocks
+        transformed so far.
+        """
+        return self.__counts.get(id(block), 0)
+
+    def shared_blocks(self) -> List[BlockDefinition]:
+        """
+        Returns the interned blocks that occur more than once.
+        """
+        return [
+            block for block in self.symbol_table.values()
+            if self.__counts[id(block)] > 1
+        ]
+
+    def __intern(self, fields: Tuple[Hashable, ...], sub_blocks: list,
+                 create: Callable[[], object]):
+        """
+        Returns the block with the given fields and interned sub-blocks,
+        creating it if there is none.
+        """
+        key = fields + tuple(id(sub_block) for sub_block in sub_blocks)
+        if key not in self.symbol_table:
+            block = create()
+            self.symbol_table[key] = block
+            self.__hashes[id(block)] = hash(fields + tuple(
+                self.__hashes[id(sub_block)] for sub_block in sub_blocks))
+            self.__counts[id(block)] = 0
+        block = self.symbol_table[key]
+        self.__counts[id(block)] += 1
+        return block
+
+    def transform_design_block(self, block: DesignBlock):
+        if id(block) in self.__design_blocks:
+            _, interned = self.__design_blocks[id(block)]
+            self.__counts[id(interned)] += 1
+            return interned
+        definition = block.definition.transform(self)
+        interned = self.__intern(
+            ('design', block.label), [definition],
+            lambda: block if definition is block.definition else DesignBlock(
+                label=block.label, definition=definition))
+        # the original is kept so that its id is not reused
+        self.__design_blocks[id(block)] = block, interned
+        return interned
+
+    def transform_block_reference(self, reference: BlockReference):
+        block = reference.block.transform(self)
+        return self.__intern(
+            ('reference',), [block],
+            lambda: reference if block is reference.block else BlockReference(
+                block=block))
+
+    def transform_product_block(self, block: ProductBlock):
+        block_list = [sub_block.transform(self)
+                      for sub_block in block.block_list]
+        return self.__intern(
+            ('product',), block_list,
+            lambda: _rebuilt(block, block_list, ProductBlock))
+
+    def transform_sum_block(self, block: SumBlock):
+        block_list = [sub_block.transform(self)
+                      for sub_block in block.block_list]
+        return self.__intern(
+            ('sum',), block_list,
+            lambda: _rebuilt(block, block_list, SumBlock))
+
+    def transform_replicate_block(self, block: ReplicateBlock):
+        sub_block = block.block.transform(self)
+        return self.__intern(
+            ('replicate', block.count), [sub_block],
+            lambda: block if sub_block is block.block else ReplicateBlock(
+                count=block.count, block=sub_block))
+
+    def transform_generate_block(self, block: GenerateBlock):
+        return self.__intern(
+            ('generate', repr(block.treatment), block.attribute_name,
+             tuple(_value_key(value) for value in block.values)), [],
+            lambda: block)
+
+    def transform_subject_reference(self, reference: SubjectReference):
+        return self.__intern(('subject', repr(reference.entity)), [],
+                             lambda: reference)
+
+    def transform_treatment_reference(self, reference: TreatmentReference):
+        return self.__intern(('treatment', repr(reference.treatment)), [],
+                             lambda: reference)
+
+    def transform_treatment_value_reference(
+            self,
+            reference: TreatmentValueReference):
+        return self.__intern(
+            ('treatment_value', repr(reference.treatment),
+             _value_key(reference.value)), [],
+            lambda: reference)
+
+    def transform_experiment(self, experiment: ExperimentalRequest):
+        """
+        Creates the request with the design blocks interned, and the
+        measurements referring to the interned blocks.
+        """
+        return ExperimentalRequest(
+            cp_name=experiment.challenge_problem,
+            reference_name=experiment.experiment_reference,
+            reference_url=experiment.experiment_reference_url,
+            version=experiment.experiment_version,
+            derived_from=experiment.derived_from,
+            subjects=experiment.subjects,
+            treatments=experiment.treatments,
+            designs=[block.transform(self) for block in experiment.designs],
+            measurements=[
+                Measurement(
+                    type=measurement.type,
+                    block=measurement.block.transform(self),
+                    controls=measurement.controls,
+                    performers=measurement.performers
+                )
+                for measurement in experiment.measurements
+            ]
+        )
+
+
+def _value_key(value):
+    return type(value.value).__name__, value.value, value.unit.reference
+
+
+def _rebuilt(block, block_list, block_type):
+    if all(sub_block is original
+           for sub_block, original in zip(block_list, block.block_list)):
+        return block
+    return block_type(block_list=block_list)
@@ -1,9 +1,20 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator, List, Tuple
+
+from cp_request import ExperimentalRequest, Measurement
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SumBlock,
+    TreatmentValueReference,
+    term_key
+)
+from cp_request.design.sample_index import DEFAULT_DIGITS
 
 if TYPE_CHECKING:
     from cp_request import (
-        Measurement,
         NamedEntity,
         Sample,
         Treatment,
@@ -13,63 +24,225 @@ if TYPE_CHECKING:
     )
 
     from cp_request.design import (
-        DesignBlock,
-        BlockReference,
         GenerateBlock,
-        ProductBlock,
-        ReplicateBlock,
-        SumBlock,
         SubjectReference,
-        TreatmentReference,
-        TreatmentValueReference
+        TreatmentReference
     )
+    from cp_request.design.block_definition import BlockDefinition
 
 from transform import RequestTransformer
 
+Term = Tuple['BlockDefinition', ...]
+
+WeightedTerm = Tuple[Term, int]
+
+REPORT_DUPLICATES = 'report'
+
+COLLAPSE_DUPLICATES = 'collapse'
+
 
 class NormalizeTransformer(RequestTransformer):
     """
-    Visitor that creates a normalized request object so that all design blocks
-    are fully enumerated.
+    Transformer that normalizes design blocks to a sum of products using the
+    rewrite rules in docs/normalization.md.
+
+    The normal form is never built as a {SumBlock}.
+    Instead, transforming a {DesignBlock} returns a lazy iterator over the
+    product terms of the sum, each a {ProductBlock} whose block list consists
+    of {SubjectReference}, {TreatmentReference} and {TreatmentValueReference}
+    objects.
+    Transforming any other block definition returns a lazy iterator over the
+    distinct terms of that block, each a pair of a tuple of references and the
+    number of its replicates.
+
+    Replicates are kept as a multiplicity of a term rather than copied, with
+    the replicates of a term adjacent in the order of the normal form.
+    If expand_replicates is true, transforming a {DesignBlock} or a
+    {Measurement} yields the same {ProductBlock} once for each replicate,
+    and otherwise yields (product, multiplicity) pairs.
+
+    Only the terms currently being combined are held in memory, so a design
+    can be walked without materializing its expansion.
+    This holds for design blocks referenced by a {BlockReference} or a
+    {Measurement}: the request is treated as a DAG, and each referenced block
+    is kept in the symbol table under its label, with its terms enumerated
+    again for every reference rather than kept.
+    The block under a label may be replaced by an equivalent block, such as
+    the normalized block, whose terms are then used for each reference.
+
+    Different branches of a design can produce the same physical sample,
+    identified by its {sample_key} with values rounded to digits significant
+    digits.
+    If deduplicate is {REPORT_DUPLICATES}, the terms of each design block and
+    measurement are unchanged, but the multiplicity of each occurrence of a
+    duplicated sample is recorded in {duplicates} under the label of the
+    block as the terms are enumerated, which holds the key and multiplicities
+    of each distinct sample, but not its term, in memory.
+    If deduplicate is {COLLAPSE_DUPLICATES}, the duplicates are also collapsed
+    into the first occurrence, with the sum of the multiplicities, which
+    requires holding the distinct terms of the block in memory as well.
+
+    The terms of each of the shared_blocks, such as the blocks shared by an
+    {InternTransformer}, are decoded from the block with
+    {BlockDefinition.weighted_terms} at each occurrence, rather than
+    normalized again, and are not kept either.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, *, expand_replicates: bool = True,
+                 deduplicate: str = None,
+                 digits: int = DEFAULT_DIGITS,
+                 shared_blocks: List[BlockDefinition] = None):
+        super().__init__(dict())
+        if deduplicate not in (None, REPORT_DUPLICATES, COLLAPSE_DUPLICATES):
+            raise ValueError(
+                'unknown deduplicate mode {}'.format(repr(deduplicate)))
+        self.__expand_replicates = expand_replicates
+        self.__deduplicate = deduplicate
+        self.__digits = digits
+        self.__duplicates = dict()
+        self.__shared_blocks = {
+            id(block): block for block in (shared_blocks or list())
+        }
+
+    @property
+    def expand_replicates(self):
+        return self.__expand_replicates
+
+    @property
+    def deduplicate(self):
+        return self.__deduplicate
+
+    @property
+    def duplicates(self):
+        """
+        The duplicated samples found in each block, as a dictionary mapping
+        the label of the block to a dictionary from the key of each duplicated
+        sample to the multiplicities of its occurrences.
+        """
+        return {
+            label: {
+                key: counts
+                for key, counts in occurrences.items()
+                if len(counts) > 1
+            }
+            for label, occurrences in self.__duplicates.items()
+        }
 
     def transform_design_block(self, block: DesignBlock):
-        # normalize block.definition and create new design block
-        return
+        return self.__products(self.__deduplicated(
+            block.label, self.__terms(block.definition)))
+
+    def __terms(self, block: BlockDefinition) -> Iterator[WeightedTerm]:
+        """
+        Returns the weighted terms of the block, decoding the terms of a
+        shared block from its structure.
+        """
+        if id(block) not in self.__shared_blocks:
+            return block.transform(self)
+        return block.weighted_terms(0, block.cardinality())
+
+    def __deduplicated(self, label: str,
+                       weighted_terms: Iterator[WeightedTerm]):
+        """
+        Applies the deduplicate mode to the terms of the labeled block.
+        """
+        if self.__deduplicate is None:
+            return weighted_terms
+        occurrences = dict()
+        self.__duplicates[label] = occurrences
+        if self.__deduplicate == REPORT_DUPLICATES:
+            return self.__reported(occurrences, weighted_terms)
+        first_terms = dict()
+        for term, count in weighted_terms:
+            key = self.__add_occurrence(occurrences, term, count)
+            first_terms.setdefault(key, term)
+        return iter([
+            (term, sum(occurrences[key])) for key, term in first_terms.items()
+        ])
+
+    def __reported(self, occurrences, weighted_terms: Iterator[WeightedTerm]):
+        for term, count in weighted_terms:
+            self.__add_occurrence(occurrences, term, count)
+            yield term, count
+
+    def __add_occurrence(self, occurrences, term: Term, count: int):
+        """
+        Records the multiplicity of an occurrence of the term under its key,
+        and returns the key.
+        """
+        key = term_key(term, digits=self.__digits)
+        occurrences.setdefault(key, list()).append(count)
+        return key
+
+    def __products(self, weighted_terms: Iterator[WeightedTerm]):
+        for term, count in weighted_terms:
+            product = ProductBlock(block_list=list(term))
+            if not self.__expand_replicates:
+                yield product, count
+                continue
+            for _ in range(count):
+                yield product
 
     def transform_product_block(self, block: ProductBlock):
-        return
+        """
+        Distributes the product over the terms of each block in the list,
+        flattening nested products.
+        """
+        return self.__product_terms(block.block_list, 0)
+
+    def __product_terms(self, block_list: List[BlockDefinition],
+                        position: int) -> Iterator[WeightedTerm]:
+        if position == len(block_list):
+            yield tuple(), 1
+            return
+        for term, count in self.__terms(block_list[position]):
+            for rest, rest_count in self.__product_terms(block_list,
+                                                         position + 1):
+                yield term + rest, count * rest_count
 
     def transform_block_reference(self, reference: BlockReference):
-        return
+        return self.__block_terms(reference.block)
+
+    def __block_terms(self, block: DesignBlock) -> Iterator[WeightedTerm]:
+        """
+        Returns the weighted terms of the block kept in the symbol table under
+        the label of the design block.
+        """
+        if block.label not in self.symbol_table:
+            self.symbol_table[block.label] = block
+        return self.__terms(self.symbol_table[block.label].definition)
 
     def transform_sum_block(self, block: SumBlock):
-        return
+        for sub_block in block.block_list:
+            yield from self.__terms(sub_block)
 
     def transform_subject_reference(self, reference: SubjectReference):
-        return
+        return iter([((reference,), 1)])
 
     def transform_treatment_reference(self, reference: TreatmentReference):
-        return
+        return iter([((reference,), 1)])
 
     def transform_treatment_value_reference(self,
                                             reference: TreatmentValueReference):
-        return
+        return iter([((reference,), 1)])
 
     def transform_replicate_block(self, block: ReplicateBlock):
-        return
+        """
+        Yields each term of the replicated block with its multiplicity scaled
+        by the count, without copying the term.
+        """
+        for term, count in self.__terms(block.block):
+            yield term, count * block.count
 
     def transform_generate_block(self, block: GenerateBlock):
         """
-        Creates the equivalent SumBlock, and adds it to the normalized request.
+        Yields a term binding the treatment to each of the values of the block.
         """
-        treatment_list = list()
-        # using block.treatment
-        # iterate over block.values and instantiate attribute
-        sum_block = SumBlock(block_list=treatment_list)
+        for value in block.values:
+            yield (TreatmentValueReference(
+                treatment=block.treatment,
+                value=value
+            ),), 1
 
     def transform_attribute(self, attribute: Attribute):
         return
@@ -87,7 +260,13 @@ class NormalizeTransformer(RequestTransformer):
         return
 
     def transform_measurement(self, measurement: Measurement):
-        return
+        """
+        Returns an iterator over the product terms of the block of the
+        measurement.
+        """
+        return self.__products(self.__deduplicated(
+            measurement.block.block_label,
+            measurement.block.transform(self)))
 
     def transform_unit(self, unit: Unit):
         return
@@ -98,5 +277,55 @@ class NormalizeTransformer(RequestTransformer):
     def transform_named_entity(self, entity: NamedEntity):
         return
 
+    @staticmethod
+    def __replicated_product(term: Term, count: int):
+        product = ProductBlock(block_list=list(term))
+        if count == 1:
+            return product
+        return ReplicateBlock(count=count, block=product)
+
     def transform_experiment(self, experiment: ExperimentalRequest):
-        return
+        """
+        Creates the normalized request, in which the definition of each design
+        block is a {SumBlock} of the product terms of the block.
+        A replicated term is kept as a {ReplicateBlock} of the product term.
+
+        Each design block is normalized once, and the measurements refer to the
+        normalized blocks.
+        """
+        normalized_blocks = dict()
+
+        def normalize_block(block: DesignBlock):
+            if block.label not in normalized_blocks:
+                normalized_blocks[block.label] = DesignBlock(
+                    label=block.label,
+                    definition=SumBlock(block_list=[
+                        self.__replicated_product(term, count)
+                        for term, count in self.__deduplicated(
+                            block.label, self.__block_terms(block))
+                    ])
+                )
+            return normalized_blocks[block.label]
+
+        designs = [normalize_block(block) for block in experiment.designs]
+        measurements = [
+            Measurement(
+                type=measurement.type,
+                block=BlockReference(
+                    block=normalize_block(measurement.block.block)),
+                controls=measurement.controls,
+                performers=measurement.performers
+            )
+            for measurement in experiment.measurements
+        ]
+        return ExperimentalRequest(
+            cp_name=experiment.challenge_problem,
+            reference_name=experiment.experiment_reference,
+            reference_url=experiment.experiment_reference_url,
+            version=experiment.experiment_version,
+            derived_from=experiment.derived_from,
+            subjects=experiment.subjects,
+            treatments=experiment.treatments,
+            designs=designs,
+            measurements=measurements
+        )
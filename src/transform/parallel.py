@@ -0,0 +1,148 @@
+from __future__ import annotations
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List
+
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    ReplicateBlock,
+    SumBlock
+)
+from cp_request.design.sample_index import DEFAULT_DIGITS
+from cp_request.visitor import RequestVisitor
+
+if TYPE_CHECKING:
+    from cp_request import ExperimentalRequest
+    from cp_request.design import ProductBlock
+
+from transform.normalize import NormalizeTransformer
+
+
+class BlockDependencyVisitor(RequestVisitor):
+    """
+    Visitor that collects the design blocks referenced by a block definition
+    through a {BlockReference}, keyed by label.
+
+    Referenced blocks are not visited, so only the direct dependencies of the
+    visited block are collected.
+    """
+
+    def __init__(self):
+        self.__dependencies = dict()
+
+    @property
+    def dependencies(self):
+        return self.__dependencies
+
+    def visit_design_block(self, block: DesignBlock):
+        block.definition.apply(self)
+
+    def visit_block_reference(self, reference: BlockReference):
+        self.__dependencies[reference.block_label] = reference.block
+
+    def visit_product_block(self, block: ProductBlock):
+        for sub_block in block.block_list:
+            sub_block.apply(self)
+
+    def visit_sum_block(self, block: SumBlock):
+        for sub_block in block.block_list:
+            sub_block.apply(self)
+
+    def visit_replicate_block(self, block: ReplicateBlock):
+        block.block.apply(self)
+
+
+def dependency_levels(blocks: List[DesignBlock]) -> List[List[DesignBlock]]:
+    """
+    Returns the design blocks, and the blocks they reference, grouped into
+    levels, such that each block only references blocks of earlier levels.
+
+    Blocks of the same level are independent of each other.
+    Raises ValueError if the references are cyclic.
+    """
+    dependencies = dict()
+    pending = list(blocks)
+    while pending:
+        block = pending.pop(0)
+        if block.label in dependencies:
+            continue
+        visitor = BlockDependencyVisitor()
+        block.apply(visitor)
+        dependencies[block.label] = (block, visitor.dependencies)
+        pending.extend(visitor.dependencies.values())
+
+    levels = list()
+    done = set()
+    remaining = [label for label in dependencies]
+    while remaining:
+        level = [
+            label for label in remaining
+            if all(dependency in done
+                   for dependency in dependencies[label][1])
+        ]
+        if not level:
+            raise ValueError('cyclic references between design blocks {}'
+                             .format(remaining))
+        levels.append([dependencies[label][0] for label in level])
+        done.update(level)
+        remaining = [label for label in remaining if label not in done]
+    return levels
+
+
+def normalize_request(experiment: ExperimentalRequest, *,
+                      executor: Executor = None,
+                      max_workers: int = None,
+                      deduplicate: str = None,
+                      digits: int = DEFAULT_DIGITS) -> ExperimentalRequest:
+    """
+    Normalizes the experimental request as {NormalizeTransformer} does, but
+    normalizes independent design blocks concurrently.
+
+    The design blocks are grouped by {dependency_levels}, and the blocks of
+    each level are normalized in the executor, by default a
+    {ProcessPoolExecutor} with the given number of workers.
+    The normalized blocks that a block references are passed to its worker in
+    the symbol table, so each block is normalized only once.
+    """
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return normalize_request(experiment, executor=pool,
+                                     deduplicate=deduplicate, digits=digits)
+
+    blocks = list(experiment.designs) + [
+        measurement.block.block for measurement in experiment.measurements
+    ]
+    normalized_blocks = dict()
+    for level in dependency_levels(blocks):
+        futures = list()
+        for block in level:
+            visitor = BlockDependencyVisitor()
+            block.apply(visitor)
+            futures.append(executor.submit(_normalize_block, block, {
+                label: normalized_blocks[label]
+                for label in visitor.dependencies
+            }))
+        for block, future in zip(level, futures):
+            normalized_blocks[block.label] = future.result()
+
+    transformer = NormalizeTransformer(deduplicate=deduplicate, digits=digits)
+    transformer.symbol_table.update(normalized_blocks)
+    return experiment.transform(transformer)
+
+
+def _normalize_block(block: DesignBlock,
+                     dependency_blocks: Dict[str, DesignBlock]) -> DesignBlock:
+    """
+    Returns the design block normalized to a {SumBlock} of product terms,
+    using the normalized blocks it references.
+    """
+    transformer = NormalizeTransformer(expand_replicates=False)
+    transformer.symbol_table.update(dependency_blocks)
+    return DesignBlock(
+        label=block.label,
+        definition=SumBlock(block_list=[
+            product if count == 1 else ReplicateBlock(count=count,
+                                                      block=product)
+            for product, count in block.transform(transformer)
+        ])
+    )
@@ -0,0 +1,139 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, List
+
+from cp_request import ExperimentalRequest, Measurement
+from cp_request.design import (
+    BlockReference,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SumBlock
+)
+
+if TYPE_CHECKING:
+    from cp_request.design.block_definition import BlockDefinition
+
+from transform import RequestTransformer
+
+
+class SimplifyTransformer(RequestTransformer):
+    """
+    Transformer that rewrites design blocks to simpler blocks with the same
+    samples in the same order, using the identities in
+    docs/normalization.md:
+
+    - nested products and nested sums are flattened,
+    - a product or sum of a single block is replaced by the block,
+    - a product with an empty sum is empty, and an empty product in a product
+      is dropped,
+    - a replicate with count one is replaced by its block, and nested
+      replicates are folded into one,
+    - adjacent {GenerateBlock} objects of a sum with the same treatment and
+      attribute are merged.
+
+    An empty design is represented by an empty {SumBlock}.
+    Referenced design blocks are simplified once, and references to them are
+    kept.
+    """
+
+    def __init__(self):
+        super().__init__(dict())
+
+    def transform_product_block(self, block: ProductBlock):
+        block_list = list()
+        for sub_block in _flatten(ProductBlock, [
+                sub_block.transform(self) for sub_block in block.block_list]):
+            if _is_empty(sub_block):
+                return sub_block
+            block_list.append(sub_block)
+        if len(block_list) == 1:
+            return block_list[0]
+        return ProductBlock(block_list=block_list)
+
+    def transform_sum_block(self, block: SumBlock):
+        block_list = list()
+        for sub_block in _flatten(SumBlock, [
+                sub_block.transform(self) for sub_block in block.block_list]):
+            if block_list and _same_generator(block_list[-1], sub_block):
+                sub_block = GenerateBlock(
+                    treatment=sub_block.treatment,
+                    attribute_name=sub_block.attribute_name,
+                    values=block_list.pop().values + sub_block.values
+                )
+            block_list.append(sub_block)
+        if len(block_list) == 1:
+            return block_list[0]
+        return SumBlock(block_list=block_list)
+
+    def transform_replicate_block(self, block: ReplicateBlock):
+        count = block.count
+        sub_block = block.block.transform(self)
+        if isinstance(sub_block, ReplicateBlock):
+            count *= sub_block.count
+            sub_block = sub_block.block
+        if count == 0 or _is_empty(sub_block):
+            return SumBlock(block_list=[])
+        if count == 1:
+            return sub_block
+        return ReplicateBlock(count=count, block=sub_block)
+
+    def transform_generate_block(self, block: GenerateBlock):
+        if not block.values:
+            return SumBlock(block_list=[])
+        return super().transform_generate_block(block)
+
+    def transform_experiment(self, experiment: ExperimentalRequest):
+        """
+        Creates the request with each design block simplified, and the
+        measurements referring to the simplified blocks.
+        """
+        def simplify_block(block):
+            return self.transform_block_reference(
+                BlockReference(block=block)).block
+
+        return ExperimentalRequest(
+            cp_name=experiment.challenge_problem,
+            reference_name=experiment.experiment_reference,
+            reference_url=experiment.experiment_reference_url,
+            version=experiment.experiment_version,
+            derived_from=experiment.derived_from,
+            subjects=experiment.subjects,
+            treatments=experiment.treatments,
+            designs=[simplify_block(block) for block in experiment.designs],
+            measurements=[
+                Measurement(
+                    type=measurement.type,
+                    block=BlockReference(
+                        block=simplify_block(measurement.block.block)),
+                    controls=measurement.controls,
+                    performers=measurement.performers
+                )
+                for measurement in experiment.measurements
+            ]
+        )
+
+
+def _flatten(block_type: type,
+             block_list: List[BlockDefinition]) -> List[BlockDefinition]:
+    """
+    Replaces each block of the given type in the list by its block list.
+    The block lists of simplified blocks are already flat.
+    """
+    result = list()
+    for block in block_list:
+        if type(block) is block_type:
+            result.extend(block.block_list)
+        else:
+            result.append(block)
+    return result
+
+
+def _is_empty(block: BlockDefinition) -> bool:
+    return isinstance(block, SumBlock) and not block.block_list
+
+
+def _same_generator(left: BlockDefinition, right: BlockDefinition) -> bool:
+    return (isinstance(left, GenerateBlock) and
+            isinstance(right, GenerateBlock) and
+            left.treatment == right.treatment and
+            left.attribute_name == right.attribute_name)
@@ -2,6 +2,18 @@ from __future__ import annotations
 import abc
 from typing import TYPE_CHECKING
 
+from cp_request.design.design_block import DesignBlock
+from cp_request.design.block_reference import BlockReference
+from cp_request.design.generate_block import GenerateBlock
+from cp_request.design.product_block import ProductBlock
+from cp_request.design.replicate_block import ReplicateBlock
+from cp_request.design.sum_block import SumBlock
+from cp_request.design.subject_reference import SubjectReference
+from cp_request.design.treatment_reference import (
+    TreatmentReference,
+    TreatmentValueReference
+)
+
 if TYPE_CHECKING:
     from cp_request.attribute import Attribute
     from cp_request.measurement import Control, Measurement, Sample
@@ -12,23 +24,13 @@ if TYPE_CHECKING:
     from cp_request.version import Version
     from cp_request.experimental_request import ExperimentalRequest
 
-    from cp_request.design.design_block import DesignBlock
-    from cp_request.design.block_reference import BlockReference
-    from cp_request.design.generate_block import GenerateBlock
-    from cp_request.design.product_block import ProductBlock
-    from cp_request.design.replicate_block import ReplicateBlock
-    from cp_request.design.sum_block import SumBlock
-    from cp_request.design.subject_reference import SubjectReference
-    from cp_request.design.treatment_reference import (
-        TreatmentReference,
-        TreatmentValueReference
-    )
-
 
 class RequestTransformer(abc.ABC):
     """
     Abstract transformer for structured request classes.
-    Includes stubbed methods for each class, with each returning a deep copy.
+    Includes stubbed methods for each class, with each block method returning
+    a copy of the block with transformed sub-blocks.
+    Subjects, treatments and values are not copied.
 
     To create a transformer, inherit from this class, define an initializer, and
     each appropriate visit method.
@@ -38,16 +40,24 @@ class RequestTransformer(abc.ABC):
     def __init__(self, symbol_table):
         self.__symbol_table = symbol_table
 
+    @property
+    def symbol_table(self):
+        """
+        The table of transformed objects, keyed by name or label, that allows
+        objects referenced more than once to be transformed only once.
+        """
+        return self.__symbol_table
+
     def transform_design_block(self, block: DesignBlock):
         return DesignBlock(
             label=block.label,
-            definition=block.transform(self)
+            definition=block.definition.transform(self)
         )
 
     def transform_product_block(self, block: ProductBlock):
         block_list = list()
-        for block in block.block_list:
-            block_list.append(block.transform(self))
+        for sub_block in block.block_list:
+            block_list.append(sub_block.transform(self))
         return ProductBlock(block_list=block_list)
 
     def transform_block_reference(self, reference: BlockReference):
@@ -61,39 +71,21 @@ class RequestTransformer(abc.ABC):
 
     def transform_sum_block(self, block: SumBlock):
         block_list = list()
-        for block in block.block_list:
-            block_list.append(block.transform(self))
+        for sub_block in block.block_list:
+            block_list.append(sub_block.transform(self))
         return SumBlock(block_list=block_list)
 
     def transform_subject_reference(self, reference: SubjectReference):
-        if reference.entity.name in self.__symbol_table:
-            entity = self.__symbol_table[reference.entity.name]
-            # TODO: check type of object?
-        else:
-            entity = reference.entity.transform(self)
-            self.__symbol_table[reference.entity.name] = entity
-        return SubjectReference(entity=entity)
+        return SubjectReference(entity=reference.entity)
 
     def transform_treatment_reference(self, reference: TreatmentReference):
-        if reference.treatment_name in self.__symbol_table:
-            treatment = self.__symbol_table[reference.treatment_name]
-            # TODO: check type of object?
-        else:
-            treatment = reference.treatment.transform(self)
-            self.__symbol_table[reference.treatment_name] = treatment
-        return TreatmentReference(treatment=treatment)
+        return TreatmentReference(treatment=reference.treatment)
 
     def transform_treatment_value_reference(
             self,
             reference: TreatmentValueReference):
-        if reference.treatment_name in self.__symbol_table:
-            treatment = self.__symbol_table[reference.treatment_name]
-            # TODO: check type of object?
-        else:
-            treatment = reference.treatment.transform(self)
-            self.__symbol_table[reference.treatment_name] = treatment
         return TreatmentValueReference(
-            treatment=treatment,
+            treatment=reference.treatment,
             value=reference.value
         )
 
@@ -104,14 +96,10 @@ class RequestTransformer(abc.ABC):
         )
 
     def transform_generate_block(self, block: GenerateBlock):
-        value_list = list()
-        for value in block.values:
-            value_list.append(value.transform(self))
-
         return GenerateBlock(
-            treatment=block.treatment.transform(self),
+            treatment=block.treatment,
             attribute_name=block.attribute_name,
-            values=value_list
+            values=list(block.values)
         )
 
     def transform_attribute(self, attribute: Attribute):
@@ -0,0 +1,124 @@
+import pytest
+
+from cp_request import (
+    Attribute,
+    NamedEntity,
+    Treatment,
+    Unit,
+    Value
+)
+from cp_request.design import (
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference
+)
+
+
+@pytest.fixture
+def micromolar_unit():
+    return Unit(reference='http://purl.obolibrary.org/obo/UO_0000064')
+
+
+@pytest.fixture
+def hour_unit():
+    return Unit(reference='http://purl.obolibrary.org/obo/UO_0000032')
+
+
+@pytest.fixture
+def nand_circuit():
+    return NamedEntity(
+        name="MG1655_NAND_Circuit",
+        reference="https://hub.sd2e.org/user/sd2e/design/MG1655_NAND_Circuit/1"
+    )
+
+
+@pytest.fixture
+def empty_landing_pads():
+    return NamedEntity(
+        name="MG1655_empty_landing_pads",
+        reference="https://hub.sd2e.org/user/sd2e/design/MG1655_empty_landing_pads/1"
+    )
+
+
+@pytest.fixture
+def kan():
+    return Treatment.create_from(
+        entity=NamedEntity(
+            name='Kan',
+            reference='https://hub.sd2e.org/user/sd2e/design/Kan/1'
+        ))
+
+
+@pytest.fixture
+def iptg(micromolar_unit):
+    return Treatment.create_from(
+        entity=NamedEntity(
+            name='IPTG',
+            reference='https://hub.sd2e.org/user/sd2e/design/IPTG/1',
+            attributes=[
+                Attribute.create_from(
+                    name='concentration', unit=micromolar_unit)
+            ])
+    )
+
+
+@pytest.fixture
+def l_arabinose(micromolar_unit):
+    return Treatment.create_from(
+        entity=NamedEntity(
+            name='L-arabinose',
+            reference='https://hub.sd2e.org/user/sd2e/design/Larabinose/1',
+            attributes=[
+                Attribute.create_from(
+                    name='concentration', unit=micromolar_unit)
+            ])
+    )
+
+
+@pytest.fixture
+def timepoint(hour_unit):
+    return Treatment.create_from(
+        attribute=Attribute.create_from(
+            name='timepoint',
+            unit=hour_unit)
+    )
+
+
+@pytest.fixture
+def strain_block(nand_circuit, empty_landing_pads, kan):
+    return DesignBlock(
+        label='strains',
+        definition=SumBlock(block_list=[
+            ProductBlock(block_list=[
+                SubjectReference(entity=nand_circuit),
+                TreatmentReference(treatment=kan)
+            ]),
+            SubjectReference(entity=empty_landing_pads)
+        ])
+    )
+
+
+@pytest.fixture
+def condition_block(iptg, l_arabinose, micromolar_unit):
+    return DesignBlock(
+        label='conditions',
+        definition=ProductBlock(block_list=[
+            GenerateBlock(
+                treatment=iptg,
+                attribute_name='concentration',
+                values=[
+                    Value(value=value, unit=micromolar_unit)
+                    for value in [0, 0.25, 2.5, 25, 250]
+                ]),
+            GenerateBlock(
+                treatment=l_arabinose,
+                attribute_name='concentration',
+                values=[
+                    Value(value=value, unit=micromolar_unit)
+                    for value in [0, 5, 50, 500, 5000, 25000]
+                ])
+        ])
+    )
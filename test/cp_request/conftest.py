@@ -0,0 +1,95 @@
+import pytest
+
+from cp_request import (
+    Attribute,
+    Control,
+    ExperimentalRequest,
+    Measurement,
+    NamedEntity,
+    Sample,
+    Treatment,
+    Unit,
+    Value,
+    Version
+)
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference
+)
+
+
+@pytest.fixture
+def bound_kan():
+    microgram_per_milliliter_unit = Unit(
+        reference='http://purl.obolibrary.org/obo/UO_0000274')
+    return Treatment.create_from(
+        entity=NamedEntity(
+            name='Kan',
+            reference='https://hub.sd2e.org/user/sd2e/design/Kan/1',
+            attributes=[
+                Attribute.create_from(
+                    name='concentration',
+                    value=Value(
+                        value=50, unit=microgram_per_milliliter_unit))
+            ])
+    )
+
+
+@pytest.fixture
+def request_object(nand_circuit, bound_kan, timepoint, hour_unit):
+    strain_block = DesignBlock(
+        label='strains',
+        definition=SumBlock(block_list=[
+            ProductBlock(block_list=[
+                SubjectReference(entity=nand_circuit),
+                TreatmentReference(treatment=bound_kan)
+            ])
+        ])
+    )
+    experiment_block = DesignBlock(
+        label='experiment',
+        definition=ProductBlock(block_list=[
+            ReplicateBlock(count=2, block=BlockReference(block=strain_block)),
+            GenerateBlock(
+                treatment=timepoint,
+                attribute_name='timepoint',
+                values=[
+                    Value(value=5, unit=hour_unit),
+                    Value(value=6.5, unit=hour_unit)
+                ])
+        ])
+    )
+    return ExperimentalRequest(
+        cp_name='NOVEL_CHASSIS',
+        reference_name='NovelChassis-NAND-Ecoli-Titration',
+        reference_url='https://example.org/titration',
+        version=Version(major=1, minor=0, patch=0),
+        derived_from='NovelChassis-NAND-Ecoli',
+        subjects=[nand_circuit],
+        treatments=[bound_kan, timepoint],
+        designs=[strain_block, experiment_block],
+        measurements=[
+            Measurement(
+                type='FLOW',
+                block=BlockReference(block=experiment_block),
+                controls=[
+                    Control(
+                        name='positive_gfp',
+                        sample=Sample(
+                            subject=nand_circuit,
+                            treatments=[
+                                TreatmentReference.create_from(
+                                    treatment=timepoint,
+                                    value=Value(value=18, unit=hour_unit)),
+                                TreatmentReference(treatment=bound_kan)
+                            ]))
+                ],
+                performers=['Ginkgo'])
+        ]
+    )
@@ -0,0 +1,39 @@
+import pytest
+
+from cp_request import Value
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SumBlock,
+    TreatmentValueReference
+)
+
+
+@pytest.fixture
+def experiment_block(strain_block, iptg, l_arabinose, micromolar_unit):
+    return DesignBlock(
+        label='experiment',
+        definition=ProductBlock(block_list=[
+            ReplicateBlock(
+                count=3,
+                block=BlockReference(block=strain_block)),
+            GenerateBlock(
+                treatment=iptg,
+                attribute_name='concentration',
+                values=[
+                    Value(value=0, unit=micromolar_unit),
+                    Value(value=25, unit=micromolar_unit),
+                    Value(value=250, unit=micromolar_unit)
+                ]),
+            SumBlock(block_list=[
+                TreatmentValueReference(
+                    treatment=l_arabinose,
+                    value=Value(value=5, unit=micromolar_unit)),
+                SumBlock(block_list=[]),
+                ProductBlock(block_list=[])
+            ])
+        ])
+    )
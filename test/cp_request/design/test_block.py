@@ -1,13 +1,15 @@
 import pytest
 
 import json
+from concurrent.futures import ProcessPoolExecutor
 from cp_request import (
     Unit,
-    Value, NamedEntity, Attribute, Treatment
+    Value, NamedEntity, Attribute, Treatment, Sample
 )
 from cp_request.design import (
     GenerateBlock, ProductBlock, ReplicateBlock, SumBlock,
     BlockReference, SubjectReference, TreatmentReference,
+    TreatmentValueReference,
     BlockDefinitionEncoder, BlockDefinitionDecoder,
     DesignBlock, DesignBlockEncoder, DesignBlockDecoder
 )
@@ -468,6 +470,8 @@ class TestDesignBlock:
         assert b1 == b1
         assert b1 == b2
         assert b1 != {}
+        assert b1 != DesignBlock(
+            label="test", definition=SumBlock(block_list=[]))
 
         assert repr(
             b1) == "DesignBlock(label='test', definition=TreatmentReference(treatment=EntityTreatment(entity=NamedEntity(name='Kan', reference='https://hub.sd2e.org/user/sd2e/design/Kan/1', attributes=[UnboundAttribute(name='concentration', unit=Unit(reference='http://purl.obolibrary.org/obo/UO_0000274'))]))))"
@@ -479,3 +483,228 @@ class TestDesignBlock:
         assert b_json == '{"object_type": "design_block", "label": "test", "definition": {"block_type": "treatment_reference", "reference": "Kan"}}'
         b2 = json.loads(b_json, cls=dummy_design_decoder)
         assert b1 == b2
+
+
+class TestCardinality:
+    def test_references(self, strain_block, kan, nand_circuit):
+        assert SubjectReference(entity=nand_circuit).cardinality() == 1
+        assert TreatmentReference(treatment=kan).cardinality() == 1
+        assert BlockReference(block=strain_block).cardinality() == 2
+
+    def test_generate_block(self, condition_block):
+        for block in condition_block.definition.block_list:
+            assert block.cardinality() == len(block.values)
+
+    def test_composite_blocks(self, condition_block, strain_block):
+        assert strain_block.cardinality() == 2
+        assert condition_block.cardinality() == 30
+        assert ProductBlock(block_list=[]).cardinality() == 1
+        assert SumBlock(block_list=[]).cardinality() == 0
+
+        b1 = ProductBlock(block_list=[
+            ReplicateBlock(
+                count=4,
+                block=ProductBlock(block_list=[
+                    BlockReference(block=strain_block),
+                    BlockReference(block=condition_block)
+                ])),
+            SumBlock(block_list=[
+                BlockReference(block=strain_block),
+                BlockReference(block=condition_block)
+            ])
+        ])
+        assert b1.cardinality() == 4 * 2 * 30 * (2 + 30)
+        assert DesignBlock(
+            label='experiment', definition=b1).cardinality() == 7680
+
+    def test_edited_in_place(self, iptg, micromolar_unit):
+        generate = GenerateBlock(
+            treatment=iptg,
+            attribute_name='concentration',
+            values=[Value(value=0, unit=micromolar_unit)])
+        block = DesignBlock(
+            label='conditions',
+            definition=ProductBlock(block_list=[
+                ReplicateBlock(count=2, block=generate),
+                SumBlock(block_list=[generate])
+            ]))
+        assert block.cardinality() == 2
+        assert len(list(block.samples())) == 2
+
+        generate.values.append(Value(value=25, unit=micromolar_unit))
+        assert block.cardinality() == 8
+        assert len(list(block.samples())) == 8
+        assert 'value=25' in repr(block.sample_at(7))
+
+
+class TestSampleAt:
+    def test_sum_block(self, strain_block, nand_circuit, empty_landing_pads,
+                       kan):
+        assert strain_block.sample_at(0) == Sample(
+            subject=nand_circuit,
+            treatments=[TreatmentReference(treatment=kan)])
+        assert strain_block.sample_at(1) == Sample(
+            subject=empty_landing_pads)
+
+    def test_product_block(self, condition_block, iptg):
+        micromolar_unit = Unit(
+            reference='http://purl.obolibrary.org/obo/UO_0000064')
+        sample = condition_block.sample_at(3 * 6 + 4)
+        assert sample.subject is None
+        assert sample.treatments[0] == TreatmentValueReference(
+            treatment=iptg,
+            value=Value(value=25, unit=micromolar_unit))
+        assert sample.treatments[1].value == Value(
+            value=5000, unit=micromolar_unit)
+
+    def test_replicate_block(self, strain_block, empty_landing_pads):
+        block = DesignBlock(
+            label='replicates',
+            definition=ReplicateBlock(
+                count=3,
+                block=BlockReference(block=strain_block)))
+        assert block.cardinality() == 6
+        for index in range(3, 6):
+            assert block.sample_at(index) == Sample(
+                subject=empty_landing_pads)
+
+    def test_index_out_of_range(self, strain_block):
+        with pytest.raises(IndexError):
+            strain_block.sample_at(2)
+        with pytest.raises(IndexError):
+            strain_block.sample_at(-1)
+
+
+class TestReplicateRuns:
+    def test_replicates_adjacent(self, strain_block, condition_block):
+        block = DesignBlock(
+            label='replicated',
+            definition=ProductBlock(block_list=[
+                ReplicateBlock(
+                    count=2,
+                    block=BlockReference(block=strain_block)),
+                ReplicateBlock(
+                    count=3,
+                    block=BlockReference(block=condition_block))
+            ]))
+        assert block.cardinality() == 2 * 2 * 3 * 30
+        runs = list(block.definition.runs(0, block.cardinality()))
+        assert len(runs) == 2 * 30
+        assert all(count == 6 for _, _, count in runs)
+        assert [start for _, start, _ in runs] == list(range(0, 360, 6))
+        assert block.sample_at(5) == block.sample_at(0)
+        assert block.sample_at(6) != block.sample_at(5)
+
+    def test_weighted_samples(self, replicated_block):
+        count = replicated_block.cardinality()
+        expected = list(replicated_block.samples())
+        for start, stop in [(0, count), (4, 5), (5, 100), (89, 270)]:
+            weighted = list(replicated_block.weighted_samples(start, stop))
+            assert sum(count for _, count in weighted) == stop - start
+            assert [
+                sample for sample, count in weighted for _ in range(count)
+            ] == expected[start:stop]
+        runs = list(replicated_block.weighted_samples())
+        assert len(runs) == count // 3
+        assert all(count == 3 for _, count in runs)
+
+
+class TestSampleRandom:
+    def test_sample_random(self, replicated_block):
+        samples = replicated_block.sample_random(20, seed=7)
+        assert len(samples) == 20
+        assert samples == replicated_block.sample_random(20, seed=7)
+        expected = list(replicated_block.samples())
+        assert all(sample in expected for sample in samples)
+
+    def test_distinct_indexes(self, strain_block):
+        samples = strain_block.sample_random(2, seed=1)
+        assert sorted(repr(sample) for sample in samples) == sorted(
+            repr(sample) for sample in strain_block.samples())
+        assert strain_block.sample_random(0) == []
+
+    def test_too_many(self, strain_block):
+        with pytest.raises(ValueError):
+            strain_block.sample_random(3)
+        with pytest.raises(ValueError):
+            strain_block.sample_random(-1)
+
+    def test_larger_than_maxsize(self, timepoint):
+        hour_unit = Unit(reference='http://purl.obolibrary.org/obo/UO_0000032')
+        large_block = DesignBlock(
+            label='large',
+            definition=ProductBlock(block_list=[
+                GenerateBlock(
+                    treatment=timepoint,
+                    attribute_name='timepoint',
+                    values=[Value(value=hour, unit=hour_unit)
+                            for hour in range(10)])
+                for _ in range(20)
+            ])
+        )
+        assert large_block.cardinality() == 10**20 > 2**63
+        samples = large_block.sample_random(50, seed=3)
+        assert len(samples) == 50
+        assert len({repr(sample) for sample in samples}) == 50
+        assert samples == large_block.sample_random(50, seed=3)
+
+
+def collect_samples(block, shard):
+    return list(block.samples(shard.start, shard.stop))
+
+
+@pytest.fixture
+def replicated_block(strain_block, condition_block, temperature):
+    return DesignBlock(
+        label='replicated',
+        definition=ProductBlock(block_list=[
+            ReplicateBlock(
+                count=3,
+                block=SumBlock(block_list=[
+                    BlockReference(block=strain_block),
+                    SumBlock(block_list=[]),
+                    TreatmentReference(treatment=temperature)
+                ])),
+            BlockReference(block=condition_block)
+        ])
+    )
+
+
+class TestShards:
+    def test_sample_ranges(self, replicated_block):
+        count = replicated_block.cardinality()
+        assert count == 3 * 3 * 30
+        expected = [replicated_block.sample_at(index)
+                    for index in range(count)]
+        assert list(replicated_block.samples()) == expected
+        for start in range(0, count, 7):
+            for stop in range(start, count + 1, 11):
+                assert list(replicated_block.samples(start, stop)) \
+                    == expected[start:stop]
+
+    def test_sample_range_out_of_range(self, strain_block):
+        with pytest.raises(IndexError):
+            list(strain_block.samples(0, 3))
+        with pytest.raises(IndexError):
+            list(strain_block.samples(2, 1))
+
+    def test_shards(self, replicated_block, strain_block):
+        shards = replicated_block.shards(4)
+        assert [len(shard) for shard in shards] == [68, 68, 67, 67]
+        assert shards[0].start == 0
+        assert shards[-1].stop == replicated_block.cardinality()
+        for previous, shard in zip(shards, shards[1:]):
+            assert previous.stop == shard.start
+
+        assert strain_block.shards(3) == [range(0, 1), range(1, 2),
+                                          range(2, 2)]
+        with pytest.raises(ValueError):
+            strain_block.shards(0)
+
+    def test_parallel_shards(self, replicated_block):
+        shards = replicated_block.shards(3)
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            results = executor.map(
+                collect_samples, [replicated_block] * len(shards), shards)
+            samples = [sample for result in results for sample in result]
+        assert samples == list(replicated_block.samples())
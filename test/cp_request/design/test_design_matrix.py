@@ -0,0 +1,134 @@
+import pytest
+
+from cp_request import Sample, Value
+from cp_request.design import (
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentValueReference
+)
+from cp_request.measurement import CannotCreateSampleException
+
+np = pytest.importorskip('numpy')
+from cp_request.design.design_matrix import (  # noqa: E402
+    MISSING_CODE, design_matrix
+)
+
+
+def decode_row(matrix, row):
+    """
+    Rebuilds the sample for a row of the design matrix.
+    """
+    subject = None
+    treatments = list()
+    for column, code in enumerate(row):
+        if code == MISSING_CODE:
+            continue
+        level = matrix.levels[column][code]
+        if column == 0:
+            subject = level
+        elif isinstance(level, Value):
+            treatments.append((matrix.factors[column], level))
+        else:
+            treatments.append((matrix.factors[column], None))
+    return subject, sorted(treatments, key=lambda pair: pair[0])
+
+
+def sample_row(sample: Sample):
+    treatments = dict()
+    for treatment in sample.treatments:
+        value = None
+        if isinstance(treatment, TreatmentValueReference):
+            value = treatment.value
+        treatments[treatment.treatment_name] = value
+    return sample.subject, sorted(treatments.items(),
+                                  key=lambda pair: pair[0])
+
+
+class TestDesignMatrix:
+
+    def test_strain_block(self, strain_block, nand_circuit,
+                          empty_landing_pads, kan):
+        matrix = design_matrix(strain_block)
+        assert matrix.factors == ['subject', 'Kan']
+        assert matrix.codes.tolist() == [[0, 0], [1, MISSING_CODE]]
+        assert matrix.levels == [
+            {0: nand_circuit, 1: empty_landing_pads},
+            {0: kan}
+        ]
+
+    def test_matches_samples(self, experiment_block, iptg,
+                             micromolar_unit):
+        matrix = design_matrix(experiment_block)
+        assert matrix.codes.shape == (experiment_block.cardinality(), 4)
+        assert matrix.factors == ['subject', 'Kan', 'IPTG', 'L-arabinose']
+        assert matrix.levels[2] == {
+            0: Value(value=0, unit=micromolar_unit),
+            1: Value(value=25, unit=micromolar_unit),
+            2: Value(value=250, unit=micromolar_unit)
+        }
+        for row, sample in zip(matrix.codes, experiment_block.samples()):
+            assert decode_row(matrix, row) == sample_row(sample)
+
+    def test_column(self, experiment_block):
+        matrix = design_matrix(experiment_block)
+        assert np.count_nonzero(matrix.column('IPTG') == 1) == 2 * 3 * 2
+        assert np.count_nonzero(matrix.column('Kan') == 0) == 3 * 3 * 2
+        assert np.count_nonzero(
+            matrix.column('L-arabinose') == MISSING_CODE) == 2 * 3 * 3
+
+    def test_replicate_multiplicities(self, experiment_block):
+        matrix = design_matrix(experiment_block, expand_replicates=False)
+        runs = list(experiment_block.definition.runs(
+            0, experiment_block.cardinality()))
+        assert matrix.codes.shape[0] == len(runs)
+        assert matrix.multiplicities.tolist() == [
+            count for _, _, count in runs]
+        expanded = design_matrix(experiment_block)
+        assert np.repeat(matrix.codes, matrix.multiplicities,
+                         axis=0).tolist() == expanded.codes.tolist()
+        assert expanded.multiplicities.tolist() == [1] * len(expanded.codes)
+
+    def test_repeated_factor(self, iptg, nand_circuit, micromolar_unit):
+        values = GenerateBlock(
+            treatment=iptg,
+            attribute_name='concentration',
+            values=[Value(value=0, unit=micromolar_unit),
+                    Value(value=25, unit=micromolar_unit)])
+        block = DesignBlock(
+            label='repeated',
+            definition=ProductBlock(block_list=[values, values]))
+        with pytest.raises(CannotCreateSampleException):
+            design_matrix(block)
+
+        subjects = DesignBlock(
+            label='subjects',
+            definition=ProductBlock(block_list=[
+                SubjectReference(entity=nand_circuit),
+                SubjectReference(entity=nand_circuit)
+            ]))
+        with pytest.raises(CannotCreateSampleException):
+            design_matrix(subjects)
+
+    def test_repeated_in_some_terms(self, iptg, nand_circuit,
+                                   micromolar_unit):
+        block = DesignBlock(
+            label='branches',
+            definition=ProductBlock(block_list=[
+                SumBlock(block_list=[
+                    SubjectReference(entity=nand_circuit),
+                    TreatmentValueReference(
+                        treatment=iptg,
+                        value=Value(value=0, unit=micromolar_unit))
+                ]),
+                SumBlock(block_list=[
+                    TreatmentValueReference(
+                        treatment=iptg,
+                        value=Value(value=25, unit=micromolar_unit)),
+                    SubjectReference(entity=nand_circuit)
+                ])
+            ]))
+        with pytest.raises(CannotCreateSampleException):
+            design_matrix(block)
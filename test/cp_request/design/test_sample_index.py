@@ -0,0 +1,105 @@
+from cp_request import Sample, Unit, Value
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    ReplicateBlock,
+    SampleIndex,
+    SumBlock,
+    TreatmentReference,
+    TreatmentValueReference,
+    quantize,
+    sample_key
+)
+
+
+class TestSampleIndex:
+
+    def test_indexes(self, experiment_block):
+        index = SampleIndex(block=experiment_block)
+        assert len(index) == experiment_block.cardinality() // 3
+        for position, sample in enumerate(experiment_block.samples()):
+            indexes = index.indexes(sample)
+            assert position in indexes
+            assert len(indexes) == 3
+            assert all(experiment_block.sample_at(other) == sample
+                       for other in indexes)
+
+    def test_lookup(self, experiment_block, nand_circuit, micromolar_unit):
+        index = SampleIndex(block=experiment_block)
+        indexes = index.lookup(
+            subject='MG1655_NAND_Circuit',
+            treatments={
+                'Kan': None,
+                'IPTG': Value(value=25.000000000001, unit=micromolar_unit),
+                'L-arabinose': Value(value=5, unit=micromolar_unit)
+            })
+        assert len(indexes) == 3
+        sample = experiment_block.sample_at(indexes[0])
+        assert sample.subject == nand_circuit
+        assert index.lookup(
+            subject='MG1655_empty_landing_pads',
+            treatments={
+                'IPTG': Value(value=0.0, unit=micromolar_unit)
+            }) != []
+
+    def test_missing(self, experiment_block, micromolar_unit, nand_circuit):
+        index = SampleIndex(block=experiment_block)
+        assert index.lookup(
+            subject='MG1655_NAND_Circuit',
+            treatments={
+                'IPTG': Value(value=25, unit=micromolar_unit)
+            }) == []
+        assert index.lookup(
+            subject='MG1655_NAND_Circuit',
+            treatments={
+                'Kan': None,
+                'IPTG': Value(
+                    value=25,
+                    unit=Unit(reference='http://purl.obolibrary.org/obo/UO_0000065'))
+            }) == []
+        assert index.indexes(Sample(subject=nand_circuit)) == []
+
+    def test_duplicates(self, strain_block, nand_circuit, kan):
+        block = DesignBlock(
+            label='duplicates',
+            definition=SumBlock(block_list=[
+                BlockReference(block=strain_block),
+                ReplicateBlock(
+                    count=2,
+                    block=BlockReference(block=strain_block))
+            ]))
+        index = SampleIndex(block=block)
+        assert index.indexes(Sample(
+            subject=nand_circuit,
+            treatments=[TreatmentReference(treatment=kan)])) == [0, 2, 3]
+        assert index.duplicates() == {
+            ('MG1655_NAND_Circuit', (('Kan', None, None),)): [0, 2, 3],
+            ('MG1655_empty_landing_pads', ()): [1, 4, 5]
+        }
+        assert SampleIndex(block=strain_block).duplicates() == {}
+
+
+class TestSampleKey:
+
+    def test_quantize(self):
+        assert quantize(0.1 + 0.2) == quantize(0.3)
+        assert quantize(25) == 25.0
+        assert quantize(0) == quantize(-0.0)
+        assert quantize(1.5, digits=1) == 2.0
+
+    def test_treatment_order(self, nand_circuit, kan, iptg, micromolar_unit):
+        treatments = [
+            TreatmentReference(treatment=kan),
+            TreatmentValueReference(
+                treatment=iptg,
+                value=Value(value=25, unit=micromolar_unit))
+        ]
+        key = sample_key(subject=nand_circuit, treatments=treatments)
+        assert key == sample_key(subject=nand_circuit,
+                                 treatments=list(reversed(treatments)))
+        assert key == ('MG1655_NAND_Circuit', (
+            ('IPTG', 'http://purl.obolibrary.org/obo/UO_0000064', 25.0),
+            ('Kan', None, None)
+        ))
+        assert hash(key) == hash(sample_key(subject=nand_circuit,
+                                            treatments=treatments))
@@ -233,13 +233,14 @@ def experiment_block(strain_block, temperature_block, condition_block, timepoint
 
 
 @pytest.fixture
-def dummy_measurement_decoder(nand_circuit, empty_landing_pads, timepoint, experiment_block):
+def dummy_measurement_decoder(nand_circuit, empty_landing_pads, timepoint, iptg, experiment_block):
     class DummyMeasurementDecoder(json.JSONDecoder):
         def __init__(self):
             self.__symbol_table = dict()
             self.__add_symbol(nand_circuit)
             self.__add_symbol(empty_landing_pads)
             self.__add_symbol(timepoint)
+            self.__add_symbol(iptg)
             self.__add_symbol(experiment_block)
             super().__init__(object_hook=self.convert)
 
@@ -254,13 +255,14 @@ def dummy_measurement_decoder(nand_circuit, empty_landing_pads, timepoint, exper
     return DummyMeasurementDecoder
 
 @pytest.fixture
-def dummy_sample_decoder(nand_circuit, empty_landing_pads, timepoint):
+def dummy_sample_decoder(nand_circuit, empty_landing_pads, timepoint, iptg):
     class DummySampleDecoder(json.JSONDecoder):
         def __init__(self):
             self.__symbol_table = dict()
             self.__add_symbol(nand_circuit)
             self.__add_symbol(empty_landing_pads)
             self.__add_symbol(timepoint)
+            self.__add_symbol(iptg)
             super().__init__(object_hook=self.convert)
 
         def convert(self, d):
@@ -272,13 +274,14 @@ def dummy_sample_decoder(nand_circuit, empty_landing_pads, timepoint):
 
 
 @pytest.fixture
-def dummy_control_decoder(nand_circuit, empty_landing_pads, timepoint):
+def dummy_control_decoder(nand_circuit, empty_landing_pads, timepoint, iptg):
     class DummyControlDecoder(json.JSONDecoder):
         def __init__(self):
             self.__symbol_table = dict()
             self.__add_symbol(nand_circuit)
             self.__add_symbol(empty_landing_pads)
             self.__add_symbol(timepoint)
+            self.__add_symbol(iptg)
             super().__init__(object_hook=self.convert)
 
         def convert(self, d):
@@ -458,6 +461,35 @@ class TestSample:
         assert repr(
             s1) == "Sample(subject=NamedEntity(name='MG1655_NAND_Circuit', reference='https://hub.sd2e.org/user/sd2e/design/MG1655_NAND_Circuit/1'), treatments=[TreatmentValueReference(treatment=AttributeTreatment(attribute=UnboundAttribute(name='timepoint', unit=Unit(reference='http://purl.obolibrary.org/obo/UO_0000032'))), value=Value(value=18, unit=Unit(reference='http://purl.obolibrary.org/obo/UO_0000032'))), TreatmentValueReference(treatment=EntityTreatment(entity=NamedEntity(name='IPTG', reference='https://hub.sd2e.org/user/sd2e/design/IPTG/1', attributes=[UnboundAttribute(name='concentration', unit=Unit(reference='http://purl.obolibrary.org/obo/UO_0000064'))])), value=Value(value=0, unit=Unit(reference='http://purl.obolibrary.org/obo/UO_0000064')))])"
 
+    def test_sample_key(self, nand_circuit, timepoint, iptg):
+        hour = Unit(reference='http://purl.obolibrary.org/obo/UO_0000032')
+        micromolar = Unit(
+            reference='http://purl.obolibrary.org/obo/UO_0000064')
+        s1 = Sample(
+            subject=nand_circuit,
+            treatments=[
+                TreatmentReference.create_from(
+                    treatment=timepoint,
+                    value=Value(value=18, unit=hour)),
+                TreatmentReference.create_from(
+                    treatment=iptg,
+                    value=Value(value=0.1 + 0.2, unit=micromolar))
+            ]
+        )
+        s2 = Sample(
+            subject=nand_circuit,
+            treatments=list(reversed(s1.treatments[:1])) + [
+                TreatmentReference.create_from(
+                    treatment=iptg,
+                    value=Value(value=0.3, unit=micromolar))
+            ]
+        )
+        assert s1 != s2
+        assert s1.key() == s2.key()
+        assert len({s1.key(), s2.key()}) == 1
+        assert s1.key(digits=20) != s2.key(digits=20)
+        assert Sample(subject=nand_circuit).key() != s1.key()
+
     def test_sample_serialization(self, nand_circuit, timepoint, iptg, dummy_sample_decoder):
         s1 = Sample(
             subject=nand_circuit,
@@ -0,0 +1,114 @@
+import json
+from cp_request import (
+    ExperimentalRequest,
+    ExperimentEncoder,
+    ExperimentDecoder,
+    RequestDecoder,
+    Version
+)
+from cp_request.design import BlockDefinitionDecoder, BlockDefinitionEncoder
+
+
+class TestRequestDecoder:
+
+    def test_request(self, request_object):
+        request_json = json.dumps(request_object, cls=ExperimentEncoder)
+        decoded = RequestDecoder().convert(json.loads(request_json))
+        assert decoded == request_object
+        assert json.loads(request_json, cls=ExperimentDecoder) == decoded
+
+    def test_symbol_table(self, request_object):
+        decoder = RequestDecoder()
+        decoder.convert(json.loads(
+            json.dumps(request_object, cls=ExperimentEncoder)))
+        assert set(decoder.symbol_table) == {
+            'MG1655_NAND_Circuit', 'Kan', 'timepoint', 'strains',
+            'experiment'}
+        assert decoder.symbol_table['experiment'] == \
+            request_object.designs[1]
+
+    def test_block(self, request_object, nand_circuit, bound_kan, timepoint):
+        symbol_table = {
+            'MG1655_NAND_Circuit': nand_circuit,
+            'Kan': bound_kan,
+            'timepoint': timepoint,
+            'strains': request_object.designs[0]
+        }
+        definition = request_object.designs[1].definition
+        block_json = json.dumps(definition, cls=BlockDefinitionEncoder)
+        assert RequestDecoder(symbol_table).convert(
+            json.loads(block_json)) == definition
+        assert json.loads(block_json, cls=BlockDefinitionDecoder,
+                          symbol_table=symbol_table) == definition
+
+    def test_unchanged(self):
+        decoder = RequestDecoder()
+        unknown = {'object_type': 'unknown', 'name': 'x'}
+        assert decoder.convert(unknown) is unknown
+        incomplete = {'object_type': 'value', 'value': 1}
+        assert decoder.convert(incomplete) is incomplete
+        untyped = {'name': 'x'}
+        assert decoder.convert(untyped) is untyped
+        missing = {'block_type': 'subject_reference', 'reference': 'x'}
+        assert decoder.convert(missing) is missing
+        assert decoder.convert(3) == 3
+
+    def test_version(self):
+        assert RequestDecoder().version(
+            {'major': 1, 'minor': 2, 'patch': 3}) == Version(
+                major=1, minor=2, patch=3)
+
+
+class TestLazyDecoding:
+
+    def test_header(self, request_object):
+        request_json = json.dumps(request_object, cls=ExperimentEncoder)
+        decoded = RequestDecoder(lazy=True).convert(json.loads(request_json))
+        assert not decoded.is_loaded()
+        assert decoded.challenge_problem == 'NOVEL_CHASSIS'
+        assert decoded.experiment_version == Version(major=1, minor=0,
+                                                     patch=0)
+        assert decoded.subjects == request_object.subjects
+        assert decoded.treatments == request_object.treatments
+        assert not decoded.is_loaded()
+
+    def test_measurements_first(self, request_object):
+        request_json = json.dumps(request_object, cls=ExperimentEncoder)
+        decoded = json.loads(request_json, cls=ExperimentDecoder, lazy=True)
+        assert decoded.measurements == request_object.measurements
+        assert decoded.is_loaded()
+        assert decoded.measurements[0].block.block is decoded.designs[1]
+        assert decoded == request_object
+
+    def test_loaders(self, request_object):
+        calls = list()
+
+        def designs():
+            calls.append('designs')
+            return request_object.designs
+
+        def measurements():
+            calls.append('measurements')
+            return request_object.measurements
+
+        request = ExperimentalRequest(
+            cp_name='NOVEL_CHASSIS',
+            reference_name='NovelChassis-NAND-Ecoli-Titration',
+            reference_url='https://example.org/titration',
+            version=Version(major=1, minor=0, patch=0),
+            designs=designs,
+            measurements=measurements)
+        assert request.measurements == request_object.measurements
+        assert request.designs == request_object.designs
+        assert calls == ['designs', 'measurements']
+
+        request = ExperimentalRequest(
+            cp_name='NOVEL_CHASSIS',
+            reference_name='NovelChassis-NAND-Ecoli-Titration',
+            reference_url='https://example.org/titration',
+            version=Version(major=1, minor=0, patch=0),
+            designs=designs)
+        request.designs = []
+        assert request.designs == []
+        assert request.is_loaded()
+        assert calls == ['designs', 'measurements']
@@ -0,0 +1,143 @@
+import io
+import json
+import pytest
+from cp_request import (
+    ExperimentalRequest,
+    ExperimentEncoder,
+    MeasurementEncoder,
+    NamedEntityEncoder,
+    RequestEncoder,
+    dump_stream,
+    TreatmentEncoder,
+    Value,
+    ValueEncoder
+)
+from cp_request.design import (
+    BlockDefinitionEncoder,
+    DesignBlock,
+    ReplicateBlock,
+    SubjectReference
+)
+
+
+class RecordingFile(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class CountedReplicateBlock(ReplicateBlock):
+    pass
+
+
+class TestRequestEncoder:
+
+    def test_request(self, request_object):
+        assert json.dumps(request_object, cls=RequestEncoder) == \
+            json.dumps(request_object, cls=ExperimentEncoder)
+
+    def test_parts(self, request_object, nand_circuit, bound_kan, hour_unit):
+        encoder = RequestEncoder()
+        measurement = request_object.measurements[0]
+        assert encoder.convert(measurement) == \
+            MeasurementEncoder().default(measurement)
+        assert encoder.convert(nand_circuit) == \
+            NamedEntityEncoder().default(nand_circuit)
+        assert encoder.convert(bound_kan) == TreatmentEncoder().default(bound_kan)
+        value = Value(value=5, unit=hour_unit)
+        assert encoder.convert(value) == ValueEncoder().default(value)
+
+    def test_block(self, request_object):
+        definition = request_object.designs[1].definition
+        assert json.dumps(definition, cls=RequestEncoder) == (
+            '{"block_type": "product_block", "block_list": ['
+            '{"block_type": "replicate_block", "count": 2, "block": '
+            '{"block_type": "block_reference", "reference": "strains"}}, '
+            '{"block_type": "generate_block", "treatment_name": "timepoint", '
+            '"attribute_name": "timepoint", "values": ['
+            '{"object_type": "value", "value": 5, "unit": {"object_type": '
+            '"unit", "reference": '
+            '"http://purl.obolibrary.org/obo/UO_0000032"}}, '
+            '{"object_type": "value", "value": 6.5, "unit": {"object_type": '
+            '"unit", "reference": '
+            '"http://purl.obolibrary.org/obo/UO_0000032"}}]}]}')
+        assert json.dumps(definition, cls=BlockDefinitionEncoder) == \
+            json.dumps(definition, cls=RequestEncoder)
+
+    def test_subclass(self, nand_circuit):
+        block = CountedReplicateBlock(
+            count=3, block=SubjectReference(entity=nand_circuit))
+        assert RequestEncoder().convert(block) == {
+            'block_type': 'replicate_block',
+            'count': 3,
+            'block': {
+                'block_type': 'subject_reference',
+                'reference': 'MG1655_NAND_Circuit'
+            }
+        }
+
+    def test_unknown(self):
+        with pytest.raises(TypeError):
+            RequestEncoder().convert(object())
+
+
+class TestDumpStream:
+
+    def test_request(self, request_object):
+        fp = io.StringIO()
+        dump_stream(request_object, fp)
+        assert fp.getvalue() == json.dumps(request_object,
+                                           cls=ExperimentEncoder)
+
+    @pytest.mark.parametrize('options', [
+        {'indent': 2},
+        {'separators': (',', ':')},
+        {'sort_keys': True}
+    ])
+    def test_options(self, request_object, options):
+        fp = io.StringIO()
+        dump_stream(request_object, fp, **options)
+        assert fp.getvalue() == json.dumps(request_object,
+                                           cls=RequestEncoder, **options)
+
+    def test_chunks(self, request_object):
+        chunks = list(RequestEncoder().iterencode(request_object))
+        assert len(chunks) > len(request_object.designs)
+        assert ''.join(chunks) == json.dumps(request_object,
+                                             cls=RequestEncoder)
+        fp = RecordingFile()
+        dump_stream(request_object, fp, buffer_size=64)
+        assert fp.writes > 1
+        assert fp.getvalue() == ''.join(chunks)
+
+    def test_experiment_encoder(self, request_object, monkeypatch):
+        converted = list()
+        convert = RequestEncoder.convert
+
+        def recording_convert(self, obj):
+            converted.append(type(obj))
+            return convert(self, obj)
+
+        monkeypatch.setattr(RequestEncoder, 'convert', recording_convert)
+        fp = io.StringIO()
+        json.dump(request_object, fp, cls=ExperimentEncoder)
+        assert ExperimentalRequest not in converted
+        assert DesignBlock not in converted
+        monkeypatch.undo()
+        assert fp.getvalue() == json.dumps(request_object,
+                                           cls=RequestEncoder)
+        assert json.dumps(request_object, cls=ExperimentEncoder,
+                          indent=2) == json.dumps(request_object,
+                                                  cls=RequestEncoder,
+                                                  indent=2)
+
+    def test_block(self, request_object):
+        fp = io.StringIO()
+        definition = request_object.designs[0].definition
+        dump_stream(definition, fp)
+        assert fp.getvalue() == json.dumps(definition,
+                                           cls=BlockDefinitionEncoder)
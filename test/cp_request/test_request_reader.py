@@ -0,0 +1,84 @@
+import io
+import json
+import pytest
+from cp_request import (
+    ExperimentEncoder,
+    RequestReader,
+    Unit,
+    read_request
+)
+
+
+# overrides the shared unit with a reference whose UTF-8 encoding has a
+# character of several bytes, which a binary chunk may split
+@pytest.fixture
+def hour_unit():
+    return Unit(reference='http://purl.obolibrary.org/obo/UO_0000032#µh')
+
+
+def encoded(request, **kwargs):
+    return json.dumps(request, cls=ExperimentEncoder, **kwargs)
+
+
+class TestRequestReader:
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+    def test_text(self, request_object, chunk_size):
+        fp = io.StringIO(encoded(request_object, indent=2))
+        assert read_request(fp, chunk_size=chunk_size) == request_object
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+    def test_binary(self, request_object, chunk_size):
+        fp = io.BytesIO(encoded(request_object,
+                                ensure_ascii=False).encode('utf-8'))
+        assert read_request(fp, chunk_size=chunk_size) == request_object
+
+    def test_elements(self, request_object):
+        reader = RequestReader(io.StringIO(encoded(request_object)),
+                               chunk_size=16)
+        elements = iter(reader)
+        strains = next(elements)
+        assert strains == request_object.designs[0]
+        assert reader.subjects == request_object.subjects
+        assert reader.treatments == request_object.treatments
+        assert reader.fields['challenge_problem'] == 'NOVEL_CHASSIS'
+        assert reader.symbol_table['strains'] is strains
+        assert list(elements) == (request_object.designs[1:]
+                                  + request_object.measurements)
+
+    def test_reordered(self, request_object):
+        rep = json.loads(encoded(request_object))
+        reordered = {
+            key: rep[key]
+            for key in ['measurements', 'designs', 'object_type',
+                        'treatments', 'subjects', 'challenge_problem',
+                        'experiment_reference', 'experiment_reference_url',
+                        'experiment_version', 'derived_from']
+        }
+        fp = io.StringIO(json.dumps(reordered))
+        assert read_request(fp, chunk_size=5) == request_object
+
+    def test_numbers(self, request_object):
+        # a number split between chunks is read whole
+        for chunk_size in range(1, 12):
+            fp = io.StringIO('{"experiment_version": {"major": 12345, '
+                             '"minor": 0, "patch": 10}}')
+            reader = RequestReader(fp, chunk_size=chunk_size)
+            assert list(reader) == []
+            assert reader.fields['experiment_version']['major'] == 12345
+
+    def test_not_request(self):
+        fp = io.StringIO('{"object_type": "measurement", "designs": []}')
+        with pytest.raises(ValueError):
+            list(RequestReader(fp))
+
+    def test_truncated(self, request_object):
+        text = encoded(request_object)
+        with pytest.raises(ValueError):
+            read_request(io.StringIO(text[:len(text) // 2]))
+        with pytest.raises(ValueError):
+            read_request(io.StringIO('[]'))
+
+    def test_missing_field(self):
+        with pytest.raises(ValueError):
+            read_request(io.StringIO('{"designs": []}'))
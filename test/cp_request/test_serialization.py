@@ -0,0 +1,58 @@
+import json
+import pytest
+from cp_request import ExperimentEncoder, dumps, loads
+from cp_request.serialization import BACKENDS, available_backends
+
+
+class TestSerialization:
+
+    @pytest.mark.parametrize('backend', available_backends())
+    def test_request(self, request_object, backend):
+        text = dumps(request_object, backend=backend)
+        assert json.loads(text) == json.loads(
+            json.dumps(request_object, cls=ExperimentEncoder))
+        assert loads(text, backend=backend) == request_object
+
+    @pytest.mark.parametrize('backend', available_backends())
+    def test_block(self, request_object, nand_circuit, bound_kan, timepoint,
+                   backend):
+        symbol_table = {
+            'MG1655_NAND_Circuit': nand_circuit,
+            'Kan': bound_kan,
+            'timepoint': timepoint,
+            'strains': request_object.designs[0]
+        }
+        block = request_object.designs[1]
+        assert loads(dumps(block, backend=backend), backend=backend,
+                     symbol_table=symbol_table) == block
+
+    def test_json_backend(self, request_object):
+        assert dumps(request_object, backend='json') == json.dumps(
+            request_object, cls=ExperimentEncoder)
+
+    def test_default_backend(self, request_object):
+        assert available_backends()[-1] == 'json'
+        assert loads(dumps(request_object)) == request_object
+
+    def test_unknown_backend(self, request_object):
+        with pytest.raises(ValueError):
+            dumps(request_object, backend='yaml')
+        with pytest.raises(ValueError):
+            loads('{}', backend='yaml')
+
+    @pytest.mark.parametrize('backend', [
+        name for name in BACKENDS if name not in available_backends()
+    ])
+    def test_missing_backend(self, request_object, backend):
+        with pytest.raises(ValueError):
+            dumps(request_object, backend=backend)
+
+    @pytest.mark.parametrize('backend', available_backends())
+    def test_lazy(self, request_object, backend):
+        request = loads(dumps(request_object, backend=backend),
+                        backend=backend, lazy=True)
+        assert not request.is_loaded()
+        assert request.experiment_reference == \
+            'NovelChassis-NAND-Ecoli-Titration'
+        assert request == request_object
+        assert request.is_loaded()
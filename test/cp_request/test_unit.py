@@ -1,5 +1,7 @@
+import gc
 import json
 import pytest
+import weakref
 from cp_request import Unit
 from cp_request.unit import UnitEncoder, UnitDecoder
 
@@ -21,3 +23,28 @@ class TestUnit:
         u_json = json.dumps(u, cls=UnitEncoder)
         u2 = json.loads(u_json, cls=UnitDecoder)
         assert u == u2
+
+    def test_intern(self):
+        u1 = Unit.intern(reference="http://purl.obolibrary.org/obo/UO_0000064")
+        u2 = Unit.intern(reference="http://purl.obolibrary.org/obo/UO_0000064")
+        assert u1 is u2
+        assert u1 == Unit(reference="http://purl.obolibrary.org/obo/UO_0000064")
+        assert Unit.intern(
+            reference="http://purl.obolibrary.org/obo/UO_0000027") is not u1
+
+    def test_intern_weak(self):
+        u1 = Unit.intern(reference="http://example.org/unused")
+        u1_ref = weakref.ref(u1)
+        del u1
+        gc.collect()
+        # the registry does not keep units that are no longer used
+        assert u1_ref() is None
+        u2 = Unit.intern(reference="http://example.org/unused")
+        assert u2.reference == "http://example.org/unused"
+
+    def test_decoded_interned(self):
+        u_json = json.dumps(
+            Unit(reference="http://purl.obolibrary.org/obo/UO_0000064"),
+            cls=UnitEncoder)
+        assert json.loads(u_json, cls=UnitDecoder) is json.loads(
+            u_json, cls=UnitDecoder)
@@ -21,4 +21,30 @@ class TestValue:
             reference='http://purl.obolibrary.org/obo/UO_0000027'))
         v_json = json.dumps(v1, cls=ValueEncoder)
         v2 = json.loads(v_json, cls=ValueDecoder)
-        assert v1 == v2
\ No newline at end of file
+        assert v1 == v2
+
+    def test_intern(self):
+        unit = Unit(reference='http://purl.obolibrary.org/obo/UO_0000027')
+        v1 = Value.intern(value=37, unit=unit)
+        v2 = Value.intern(value=37, unit=Unit(
+            reference='http://purl.obolibrary.org/obo/UO_0000027'))
+        assert v1 is v2
+        assert v1 == Value(value=37, unit=unit)
+        assert v1.unit is Unit.intern(
+            reference='http://purl.obolibrary.org/obo/UO_0000027')
+
+    def test_intern_types(self):
+        unit = Unit(reference='http://purl.obolibrary.org/obo/UO_0000027')
+        assert Value.intern(value=37, unit=unit) is not Value.intern(
+            value=37.0, unit=unit)
+        assert repr(Value.intern(value=-0.0, unit=unit).value) == '-0.0'
+        assert repr(Value.intern(value=0.0, unit=unit).value) == '0.0'
+        assert Value.intern(value=[1], unit=unit).value == [1]
+
+    def test_decoded_interned(self):
+        v_json = json.dumps(Value(value=37, unit=Unit(
+            reference='http://purl.obolibrary.org/obo/UO_0000027')),
+            cls=ValueEncoder)
+        v1 = json.loads(v_json, cls=ValueDecoder)
+        v2 = json.loads(v_json, cls=ValueDecoder)
+        assert v1 is v2
@@ -0,0 +1,83 @@
+import pytest
+
+from cp_request import (
+    ExperimentalRequest,
+    Measurement,
+    Value,
+    Version
+)
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock
+)
+
+
+@pytest.fixture
+def experiment_block(strain_block, iptg, timepoint,
+                     micromolar_unit, hour_unit):
+    return DesignBlock(
+        label='experiment',
+        definition=ProductBlock(block_list=[
+            ReplicateBlock(
+                count=2,
+                block=ProductBlock(block_list=[
+                    BlockReference(block=strain_block),
+                    GenerateBlock(
+                        treatment=iptg,
+                        attribute_name='concentration',
+                        values=[
+                            Value(value=0, unit=micromolar_unit),
+                            Value(value=25, unit=micromolar_unit),
+                            Value(value=250, unit=micromolar_unit)
+                        ])
+                ])
+            ),
+            GenerateBlock(
+                treatment=timepoint,
+                attribute_name='timepoint',
+                values=[
+                    Value(value=5, unit=hour_unit),
+                    Value(value=18, unit=hour_unit)
+                ])
+        ])
+    )
+
+
+@pytest.fixture
+def titration_block(strain_block, condition_block):
+    return DesignBlock(
+        label='experiment',
+        definition=ReplicateBlock(
+            count=4,
+            block=ProductBlock(block_list=[
+                BlockReference(block=strain_block),
+                BlockReference(block=condition_block)
+            ]))
+    )
+
+
+@pytest.fixture
+def request_object(strain_block, experiment_block, nand_circuit,
+                   empty_landing_pads, kan, iptg, timepoint):
+    return ExperimentalRequest(
+        cp_name='NOVEL_CHASSIS',
+        reference_name='NovelChassis-NAND-Ecoli-Titration',
+        reference_url='https://docs.google.com/document/d/1oMC5VM3XcFn6zscxLKLUe4U-TXbBsz8H6OQwHal1h4g',
+        version=Version(major=1, minor=0, patch=0),
+        subjects=[nand_circuit, empty_landing_pads],
+        treatments=[iptg, kan, timepoint],
+        designs=[strain_block, experiment_block],
+        measurements=[
+            Measurement(
+                type='FLOW',
+                block=BlockReference(block=experiment_block),
+                performers=['Ginkgo']),
+            Measurement(
+                type='PLATE_READER',
+                block=BlockReference(block=experiment_block),
+                performers=['Ginkgo'])
+        ]
+    )
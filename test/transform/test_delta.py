@@ -0,0 +1,119 @@
+import collections
+
+from cp_request import Value
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference
+)
+from transform import design_delta
+
+
+def sample_counts(samples):
+    return collections.Counter(repr(sample) for sample in samples)
+
+
+def check_delta(old, new):
+    delta = design_delta(old, new)
+    counts = sample_counts(old.samples())
+    counts.subtract(sample_counts(delta.removed_samples()))
+    assert all(count >= 0 for count in counts.values())
+    counts.update(sample_counts(delta.added_samples()))
+    assert +counts == sample_counts(new.samples())
+    return delta
+
+
+def revise(block, definition):
+    return DesignBlock(label=block.label, definition=definition)
+
+
+class TestDesignDelta:
+
+    def test_unchanged(self, titration_block):
+        delta = check_delta(titration_block, titration_block)
+        assert delta.added.cardinality() == 0
+        assert delta.removed.cardinality() == 0
+
+    def test_appended_value(self, titration_block, strain_block,
+                            iptg, l_arabinose, micromolar_unit):
+        condition_block = DesignBlock(
+            label='conditions',
+            definition=ProductBlock(block_list=[
+                GenerateBlock(
+                    treatment=iptg,
+                    attribute_name='concentration',
+                    values=[
+                        Value(value=value, unit=micromolar_unit)
+                        for value in [0, 0.25, 2.5, 25, 250]
+                    ]),
+                GenerateBlock(
+                    treatment=l_arabinose,
+                    attribute_name='concentration',
+                    values=[
+                        Value(value=value, unit=micromolar_unit)
+                        for value in [0, 5, 50, 500, 5000, 25000, 50000]
+                    ])
+            ])
+        )
+        new = revise(titration_block, ReplicateBlock(
+            count=4,
+            block=ProductBlock(block_list=[
+                BlockReference(block=strain_block),
+                BlockReference(block=condition_block)
+            ])))
+        delta = check_delta(titration_block, new)
+        assert delta.added.cardinality() == 4 * 2 * 5
+        assert delta.removed.cardinality() == 0
+        assert all(
+            sample.treatments[-1].value.value == 50000
+            for sample in delta.added_samples())
+
+    def test_replicate_count(self, titration_block):
+        more = revise(titration_block, ReplicateBlock(
+            count=6, block=titration_block.definition.block))
+        delta = check_delta(titration_block, more)
+        assert delta.added.cardinality() == 2 * 60
+        assert delta.removed.cardinality() == 0
+        delta = check_delta(more, titration_block)
+        assert delta.added.cardinality() == 0
+        assert delta.removed.cardinality() == 2 * 60
+
+    def test_changed_values(self, condition_block, iptg, l_arabinose,
+                            micromolar_unit):
+        new = revise(condition_block, ProductBlock(block_list=[
+            GenerateBlock(
+                treatment=iptg,
+                attribute_name='concentration',
+                values=[
+                    Value(value=value, unit=micromolar_unit)
+                    for value in [0, 2.5, 25, 100]
+                ]),
+            GenerateBlock(
+                treatment=l_arabinose,
+                attribute_name='concentration',
+                values=[
+                    Value(value=value, unit=micromolar_unit)
+                    for value in [0, 5, 50, 500, 5000, 25000, 1]
+                ])
+        ]))
+        delta = check_delta(condition_block, new)
+        assert delta.removed.cardinality() == 2 * 6
+        assert delta.added.cardinality() == 1 * 7 + 3 * 1
+
+    def test_sum_and_types(self, strain_block, nand_circuit, kan):
+        new = revise(strain_block, SumBlock(block_list=[
+            SubjectReference(entity=nand_circuit),
+            strain_block.definition.block_list[1],
+            ProductBlock(block_list=[
+                SubjectReference(entity=nand_circuit),
+                TreatmentReference(treatment=kan)
+            ])
+        ]))
+        delta = check_delta(strain_block, new)
+        assert delta.added.cardinality() == 2
+        assert delta.removed.cardinality() == 1
@@ -0,0 +1,116 @@
+from cp_request import Value
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference,
+    TreatmentValueReference
+)
+from transform import FingerprintTransformer, designs_equivalent
+
+
+class TestEquivalence:
+
+    def test_same_block(self, titration_block):
+        assert designs_equivalent(titration_block, titration_block)
+
+    def test_reordered(self, titration_block, strain_block, condition_block,
+                       iptg, l_arabinose, micromolar_unit):
+        rewritten = DesignBlock(
+            label='rewritten',
+            definition=ProductBlock(block_list=[
+                GenerateBlock(
+                    treatment=l_arabinose,
+                    attribute_name='concentration',
+                    values=[
+                        Value(value=value, unit=micromolar_unit)
+                        for value in [25000, 5000, 500, 50, 5, 0]
+                    ]),
+                SumBlock(block_list=[
+                    ReplicateBlock(
+                        count=2,
+                        block=SumBlock(block_list=list(reversed(
+                            strain_block.definition.block_list)))),
+                    ReplicateBlock(
+                        count=2,
+                        block=BlockReference(block=strain_block))
+                ]),
+                ProductBlock(block_list=[
+                    SumBlock(block_list=[
+                        TreatmentValueReference(
+                            treatment=iptg,
+                            value=Value(value=value, unit=micromolar_unit))
+                        for value in [250, 25, 2.5]
+                    ]),
+                    ProductBlock(block_list=[])
+                ])
+            ]))
+        extra_values = DesignBlock(
+            label='extra',
+            definition=ProductBlock(block_list=[
+                rewritten.definition.block_list[0],
+                rewritten.definition.block_list[1],
+                GenerateBlock(
+                    treatment=iptg,
+                    attribute_name='concentration',
+                    values=[
+                        Value(value=value, unit=micromolar_unit)
+                        for value in [0, 0.25]
+                    ])
+            ]))
+        combined = DesignBlock(
+            label='combined',
+            definition=SumBlock(block_list=[
+                rewritten.definition, extra_values.definition]))
+        assert combined.cardinality() == titration_block.cardinality()
+        assert designs_equivalent(titration_block, combined)
+        assert designs_equivalent(combined.definition,
+                                  titration_block.definition)
+
+    def test_different(self, titration_block, strain_block, condition_block,
+                       nand_circuit, kan):
+        assert not designs_equivalent(titration_block, condition_block)
+        moved = DesignBlock(
+            label='strains',
+            definition=SumBlock(block_list=[
+                SubjectReference(entity=nand_circuit),
+                ProductBlock(block_list=[
+                    SubjectReference(
+                        entity=strain_block.definition.block_list[1].entity),
+                    TreatmentReference(treatment=kan)
+                ])
+            ]))
+        assert moved.cardinality() == strain_block.cardinality()
+        assert not designs_equivalent(strain_block, moved)
+        assert not designs_equivalent(
+            DesignBlock(
+                label='experiment',
+                definition=ReplicateBlock(
+                    count=4,
+                    block=ProductBlock(block_list=[
+                        BlockReference(block=moved),
+                        BlockReference(block=condition_block)
+                    ]))),
+            titration_block)
+
+    def test_rounding(self, iptg, micromolar_unit):
+        def block(values):
+            return GenerateBlock(
+                treatment=iptg,
+                attribute_name='concentration',
+                values=[Value(value=value, unit=micromolar_unit)
+                        for value in values])
+        assert designs_equivalent(block([0.3, 1]), block([1, 0.1 + 0.2]))
+        assert not designs_equivalent(block([0.3, 1]), block([1, 0.31]))
+        assert not designs_equivalent(block([0.3, 1]),
+                                      block([1, 0.1 + 0.2]), digits=17)
+
+    def test_fingerprint_rounds(self, titration_block):
+        fingerprint = titration_block.transform(
+            FingerprintTransformer(rounds=3))
+        assert len(fingerprint) == 3
+        assert len(set(fingerprint)) == 3
@@ -0,0 +1,129 @@
+from cp_request import Value
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    ProductBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentValueReference
+)
+from transform import (
+    Factor, FactoredForm, FactoredTerm, FactorTransformer
+)
+
+
+class TestFactoredForm:
+
+    def test_reference(self, nand_circuit):
+        reference = SubjectReference(entity=nand_circuit)
+        form = DesignBlock(
+            label='subject', definition=reference).transform(
+                FactorTransformer())
+        assert form == FactoredForm(term_list=[
+            FactoredTerm(factors=[Factor(levels=[(reference,)])])
+        ])
+        assert form.cardinality() == 1
+
+    def test_generate_block(self, condition_block, iptg, micromolar_unit):
+        form = condition_block.transform(FactorTransformer())
+        assert len(form.term_list) == 1
+        factors = form.term_list[0].factors
+        assert [factor.cardinality() for factor in factors] == [5, 6]
+        assert factors[0].levels[3] == (TreatmentValueReference(
+            treatment=iptg, value=Value(value=25, unit=micromolar_unit)),)
+        assert form.cardinality() == 30
+
+    def test_experiment(self, titration_block):
+        form = titration_block.transform(FactorTransformer())
+        assert [
+            [factor.cardinality() for factor in term.factors]
+            for term in form.term_list
+        ] == [[2, 5, 6]]
+        assert [term.multiplicity for term in form.term_list] == [4]
+        assert form.cardinality() == titration_block.cardinality()
+
+    def test_expansion(self, titration_block):
+        form = titration_block.transform(FactorTransformer())
+        samples = sorted(repr(sample) for sample in form.samples())
+        expected = sorted(
+            repr(sample) for sample in titration_block.samples())
+        assert samples == expected
+
+    def test_marginal(self, titration_block, nand_circuit,
+                      empty_landing_pads, iptg, micromolar_unit):
+        form = titration_block.transform(FactorTransformer())
+        assert form.marginal('MG1655_NAND_Circuit') == [
+            (SubjectReference(entity=nand_circuit), 120)
+        ]
+        assert form.marginal('MG1655_empty_landing_pads') == [
+            (SubjectReference(entity=empty_landing_pads), 120)
+        ]
+        assert form.marginal('IPTG') == [
+            (TreatmentValueReference(
+                treatment=iptg,
+                value=Value(value=value, unit=micromolar_unit)), 48)
+            for value in [0, 0.25, 2.5, 25, 250]
+        ]
+        assert form.marginal('Kan')[0][1] == 120
+        assert form.marginal('timepoint') == []
+
+    def test_product_of_sums(self, nand_circuit, empty_landing_pads, iptg,
+                             micromolar_unit):
+        block = DesignBlock(
+            label='product',
+            definition=ProductBlock(block_list=[
+                SumBlock(block_list=[
+                    SubjectReference(entity=nand_circuit),
+                    SubjectReference(entity=empty_landing_pads)
+                ]),
+                SumBlock(block_list=[
+                    TreatmentValueReference(
+                        treatment=iptg,
+                        value=Value(value=value, unit=micromolar_unit))
+                    for value in [0, 25, 250]
+                ])
+            ]))
+        form = block.transform(FactorTransformer())
+        assert [
+            [factor.cardinality() for factor in term.factors]
+            for term in form.term_list
+        ] == [[2, 3]]
+        assert list(form.samples()) == list(block.samples())
+
+    def test_mixed_sum(self, strain_block, nand_circuit):
+        block = DesignBlock(
+            label='mixed',
+            definition=SumBlock(block_list=[
+                BlockReference(block=strain_block),
+                ProductBlock(block_list=[
+                    BlockReference(block=strain_block),
+                    BlockReference(block=strain_block)
+                ])
+            ]))
+        form = block.transform(FactorTransformer())
+        assert [
+            [factor.cardinality() for factor in term.factors]
+            for term in form.term_list
+        ] == [[2], [2, 2]]
+        assert form.cardinality() == block.cardinality()
+
+    def test_shared_block(self, strain_block):
+        block = DesignBlock(
+            label='shared',
+            definition=ProductBlock(block_list=[
+                BlockReference(block=strain_block),
+                BlockReference(block=strain_block)
+            ]))
+        transformer = FactorTransformer()
+        form = block.transform(transformer)
+        assert form.cardinality() == 4
+        factors = form.term_list[0].factors
+        assert factors[0] is factors[1]
+        assert 'strains' in transformer.symbol_table
+
+    def test_replicates_adjacent(self, titration_block):
+        form = titration_block.transform(FactorTransformer())
+        terms = list(form.terms())
+        assert len(terms) == 4 * 60
+        for index in range(0, len(terms), 4):
+            assert terms[index:index + 4] == [terms[index]] * 4
@@ -0,0 +1,134 @@
+from cp_request import Sample, Value
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    SumBlock,
+    TreatmentReference
+)
+from transform import (
+    FilterTransformer,
+    SubjectPredicate,
+    TreatmentPredicate,
+    filter_design,
+    subject_is,
+    value_between
+)
+
+
+def sample_value(sample: Sample, treatment_name: str):
+    for treatment in sample.treatments:
+        if treatment.treatment_name == treatment_name:
+            return treatment.value.value
+    return None
+
+
+class TestFilter:
+
+    def test_subject(self, titration_block, nand_circuit):
+        filtered = filter_design(
+            titration_block,
+            predicates=[subject_is('MG1655_NAND_Circuit')])
+        assert filtered.label == 'experiment'
+        assert filtered.cardinality() == 4 * 30
+        assert list(filtered.samples()) == [
+            sample for sample in titration_block.samples()
+            if sample.subject == nand_circuit
+        ]
+
+    def test_value(self, titration_block, micromolar_unit):
+        filtered = filter_design(
+            titration_block,
+            predicates=[value_between('IPTG', minimum=25,
+                                      unit=micromolar_unit)])
+        assert filtered.cardinality() == 4 * 2 * 2 * 6
+        assert list(filtered.samples()) == [
+            sample for sample in titration_block.samples()
+            if sample_value(sample, 'IPTG') >= 25
+        ]
+
+    def test_conjunction(self, titration_block, empty_landing_pads):
+        filtered = filter_design(
+            titration_block,
+            predicates=[
+                subject_is('MG1655_empty_landing_pads'),
+                value_between('IPTG', maximum=1),
+                value_between('L-arabinose', minimum=50, maximum=5000)
+            ])
+        assert list(filtered.samples()) == [
+            sample for sample in titration_block.samples()
+            if sample.subject == empty_landing_pads
+            and sample_value(sample, 'IPTG') <= 1
+            and 50 <= sample_value(sample, 'L-arabinose') <= 5000
+        ]
+        assert filtered.cardinality() == 4 * 2 * 3
+
+    def test_no_match(self, titration_block, micromolar_unit):
+        filtered = filter_design(
+            titration_block,
+            predicates=[value_between('IPTG', minimum=1000)])
+        assert filtered.cardinality() == 0
+        assert list(filtered.samples()) == []
+
+    def test_missing_treatment(self, strain_block, kan, nand_circuit):
+        filtered = filter_design(
+            strain_block,
+            predicates=[TreatmentPredicate(
+                treatment_name='Kan', test=lambda reference: True)])
+        assert list(filtered.samples()) == [
+            Sample(subject=nand_circuit,
+                   treatments=[TreatmentReference(treatment=kan)])
+        ]
+
+    def test_unconstrained_blocks_shared(self, titration_block,
+                                         condition_block):
+        matching, lacking, kept = titration_block.transform(
+            FilterTransformer(predicate=subject_is('MG1655_NAND_Circuit')))
+        assert lacking is None
+        product = matching.block
+        assert product.block_list[1] == BlockReference(block=condition_block)
+        assert product.block_list[1].block is condition_block
+        assert kept == matching
+
+        _, lacking, kept = titration_block.transform(
+            FilterTransformer(predicate=SubjectPredicate(
+                test=lambda reference: True)))
+        assert lacking is None
+        assert kept is titration_block.definition
+
+    def test_repeated_treatment(self, iptg, strain_block, micromolar_unit):
+        block = DesignBlock(
+            label='repeated',
+            definition=ProductBlock(block_list=[
+                SumBlock(block_list=[
+                    GenerateBlock(
+                        treatment=iptg,
+                        attribute_name='concentration',
+                        values=[Value(value=value, unit=micromolar_unit)
+                                for value in [0, 25, 250]]),
+                    BlockReference(block=strain_block)
+                ]),
+                SumBlock(block_list=[
+                    ProductBlock(block_list=[]),
+                    GenerateBlock(
+                        treatment=iptg,
+                        attribute_name='concentration',
+                        values=[Value(value=value, unit=micromolar_unit)
+                                for value in [5, 50]])
+                ])
+            ]))
+        filtered = filter_design(
+            block, predicates=[value_between('IPTG', minimum=10)])
+
+        def accepted(sample):
+            values = [
+                treatment.value.value for treatment in sample.treatments
+                if treatment.treatment_name == 'IPTG'
+            ]
+            return values and all(value >= 10 for value in values)
+
+        assert sorted(repr(sample) for sample in filtered.samples()) == \
+            sorted(repr(sample) for sample in block.samples()
+                   if accepted(sample))
+        assert filtered.cardinality() == 2 * 1 + 2 * 1 + 2 * 1
@@ -0,0 +1,152 @@
+import json
+
+from cp_request import (
+    ExperimentDecoder,
+    ExperimentEncoder,
+    ExperimentalRequest,
+    Measurement,
+    Value,
+    Version
+)
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference
+)
+from transform import HoistTransformer, hoist_common_blocks
+
+
+def templated_block(nand_circuit, kan, iptg, micromolar_unit):
+    def strain():
+        return ProductBlock(block_list=[
+            SubjectReference(entity=nand_circuit),
+            TreatmentReference(treatment=kan)
+        ])
+
+    def conditions():
+        return GenerateBlock(
+            treatment=iptg,
+            attribute_name='concentration',
+            values=[
+                Value(value=0, unit=micromolar_unit),
+                Value(value=25, unit=micromolar_unit)
+            ])
+
+    return DesignBlock(
+        label='templated',
+        definition=SumBlock(block_list=[
+            ProductBlock(block_list=[strain(), conditions()]),
+            ReplicateBlock(
+                count=2,
+                block=ProductBlock(block_list=[strain(), conditions()])),
+            ProductBlock(block_list=[conditions(), strain()])
+        ]))
+
+
+def templated_request(block, *designs):
+    return ExperimentalRequest(
+        cp_name='NOVEL_CHASSIS',
+        reference_name='NovelChassis-NAND-Ecoli-Titration',
+        reference_url='https://example.org/titration',
+        version=Version(major=1, minor=0, patch=0),
+        subjects=[],
+        treatments=[],
+        designs=list(designs) + [block],
+        measurements=[
+            Measurement(
+                type='FLOW',
+                block=BlockReference(block=block),
+                performers=['Ginkgo'])
+        ]
+    )
+
+
+def encoded(request):
+    return json.dumps(request, cls=ExperimentEncoder)
+
+
+class TestHoist:
+
+    def test_hoisted_blocks(self, nand_circuit, kan, iptg, micromolar_unit):
+        block = templated_block(nand_circuit, kan, iptg, micromolar_unit)
+        transformer = HoistTransformer()
+        hoisted = templated_request(block).transform(transformer)
+        labels = [design.label for design in hoisted.designs]
+        assert labels == ['shared-1', 'shared-2', 'shared-3', 'templated']
+        assert transformer.hoisted_blocks == hoisted.designs[:3]
+        strain, conditions, product, templated = hoisted.designs
+        assert strain.definition.block_list[0] == SubjectReference(
+            entity=nand_circuit)
+        assert conditions.definition.treatment == iptg
+        assert product.definition.block_list == [
+            BlockReference(block=strain), BlockReference(block=conditions)]
+        assert templated.definition.block_list == [
+            BlockReference(block=product),
+            ReplicateBlock(count=2, block=BlockReference(block=product)),
+            ProductBlock(block_list=[
+                BlockReference(block=conditions),
+                BlockReference(block=strain)
+            ])
+        ]
+        assert hoisted.measurements[0].block.block is templated
+        assert list(templated.samples()) == list(block.samples())
+
+    def test_smaller_encoding(self, nand_circuit, kan, iptg,
+                              micromolar_unit):
+        request = templated_request(
+            templated_block(nand_circuit, kan, iptg, micromolar_unit))
+        hoisted = hoist_common_blocks(request)
+        assert len(encoded(hoisted)) < len(encoded(request))
+
+    def test_decode(self, nand_circuit, kan, iptg, micromolar_unit):
+        request = templated_request(
+            templated_block(nand_circuit, kan, iptg, micromolar_unit))
+        request.subjects.append(nand_circuit)
+        request.treatments.extend([kan, iptg])
+        hoisted = hoist_common_blocks(request)
+        decoded = json.loads(encoded(hoisted), cls=ExperimentDecoder)
+        assert decoded == hoisted
+        assert list(decoded.designs[-1].samples()) == list(
+            request.designs[-1].samples())
+
+    def test_design_reused(self, nand_circuit, kan):
+        def strain():
+            return ProductBlock(block_list=[
+                SubjectReference(entity=nand_circuit),
+                TreatmentReference(treatment=kan)
+            ])
+
+        strain_block = DesignBlock(label='strain', definition=strain())
+        block = DesignBlock(
+            label='twice',
+            definition=SumBlock(block_list=[strain(), strain()]))
+        hoisted = hoist_common_blocks(templated_request(block, strain_block))
+        assert [design.label for design in hoisted.designs] == [
+            'strain', 'twice']
+        strain_block, block = hoisted.designs
+        assert block.definition.block_list == [
+            BlockReference(block=strain_block),
+            BlockReference(block=strain_block)
+        ]
+
+    def test_minimum_size(self, nand_circuit, kan, iptg, micromolar_unit):
+        request = templated_request(
+            templated_block(nand_circuit, kan, iptg, micromolar_unit))
+        assert hoist_common_blocks(request, minimum_size=100) == request
+        hoisted = hoist_common_blocks(request, minimum_size=4)
+        assert [design.label for design in hoisted.designs] == [
+            'shared-1', 'templated']
+
+    def test_labels(self, nand_circuit, kan, iptg, micromolar_unit):
+        block = templated_block(nand_circuit, kan, iptg, micromolar_unit)
+        other = DesignBlock(label='shared-2', definition=SumBlock(
+            block_list=[]))
+        hoisted = hoist_common_blocks(templated_request(block, other),
+                                      label_prefix='shared')
+        assert [design.label for design in hoisted.designs] == [
+            'shared-2', 'shared-1', 'shared-3', 'shared-4', 'templated']
@@ -0,0 +1,126 @@
+from cp_request import Value
+from cp_request.design import (
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference
+)
+from transform import InternTransformer, NormalizeTransformer
+
+
+def templated_block(nand_circuit, kan, iptg, micromolar_unit):
+    def strain():
+        return ProductBlock(block_list=[
+            SubjectReference(entity=nand_circuit),
+            TreatmentReference(treatment=kan)
+        ])
+
+    def conditions():
+        return GenerateBlock(
+            treatment=iptg,
+            attribute_name='concentration',
+            values=[
+                Value(value=0, unit=micromolar_unit),
+                Value(value=25, unit=micromolar_unit)
+            ])
+
+    return DesignBlock(
+        label='templated',
+        definition=SumBlock(block_list=[
+            ProductBlock(block_list=[strain(), conditions()]),
+            ReplicateBlock(
+                count=2,
+                block=ProductBlock(block_list=[strain(), conditions()])),
+            ProductBlock(block_list=[conditions(), strain()])
+        ]))
+
+
+class CountingNormalizeTransformer(NormalizeTransformer):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.generate_blocks = 0
+
+    def transform_generate_block(self, block):
+        self.generate_blocks += 1
+        return super().transform_generate_block(block)
+
+
+class TestIntern:
+
+    def test_shared_subtrees(self, nand_circuit, kan, iptg,
+                             micromolar_unit):
+        block = templated_block(nand_circuit, kan, iptg, micromolar_unit)
+        interner = InternTransformer()
+        interned = block.transform(interner)
+        assert interned.label == 'templated'
+        assert list(interned.samples()) == list(block.samples())
+        first, replicated, last = interned.definition.block_list
+        assert first is replicated.block
+        assert first.block_list[0] is last.block_list[1]
+        assert first.block_list[1] is last.block_list[0]
+        assert interner.occurrences(first) == 2
+        assert interner.occurrences(last.block_list[0]) == 3
+        assert interner.structural_hash(first) != interner.structural_hash(
+            last)
+        assert first in interner.shared_blocks()
+        assert last not in interner.shared_blocks()
+
+    def test_first_occurrence_kept(self, nand_circuit, kan, iptg,
+                                   micromolar_unit):
+        block = templated_block(nand_circuit, kan, iptg, micromolar_unit)
+        interned = block.transform(InternTransformer())
+        assert interned.definition.block_list[0] is \
+            block.definition.block_list[0]
+        assert interned.definition.block_list[1] is not \
+            block.definition.block_list[1]
+
+    def test_structural_hash(self, nand_circuit, kan, iptg, micromolar_unit):
+        interner = InternTransformer()
+        one = templated_block(nand_circuit, kan, iptg, micromolar_unit)
+        two = templated_block(nand_circuit, kan, iptg, micromolar_unit)
+        interned = one.transform(interner)
+        assert two.transform(interner) is interned
+        assert interner.structural_hash(interned.definition) == \
+            interner.structural_hash(two.transform(interner).definition)
+        size = len(interner)
+        one.transform(interner)
+        assert len(interner) == size
+
+    def test_structural_hash_across_transformers(self, nand_circuit, kan,
+                                                 iptg, micromolar_unit):
+        one = InternTransformer()
+        two = InternTransformer()
+        first = templated_block(
+            nand_circuit, kan, iptg, micromolar_unit).transform(one)
+        second = templated_block(
+            nand_circuit, kan, iptg, micromolar_unit).transform(two)
+        assert first is not second
+        assert one.structural_hash(first.definition) == \
+            two.structural_hash(second.definition)
+        replicated = first.definition.block_list[1]
+        assert one.structural_hash(replicated) != \
+            one.structural_hash(replicated.block)
+
+    def test_shared_normal_form(self, nand_circuit, kan, iptg,
+                                micromolar_unit):
+        block = templated_block(nand_circuit, kan, iptg, micromolar_unit)
+        interner = InternTransformer()
+        interned = block.transform(interner)
+        plain = CountingNormalizeTransformer()
+        expected = list(interned.transform(plain))
+        shared = CountingNormalizeTransformer(
+            shared_blocks=interner.shared_blocks())
+        assert list(interned.transform(shared)) == expected
+        assert plain.generate_blocks == 3
+        assert shared.generate_blocks == 0
+
+    def test_request(self, request_object):
+        interned = request_object.transform(InternTransformer())
+        strains, experiment = interned.designs
+        for measurement in interned.measurements:
+            assert measurement.block.block is experiment
+        replicated = experiment.definition.block_list[0].block
+        assert replicated.block_list[0].block is strains
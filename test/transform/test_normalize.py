@@ -0,0 +1,264 @@
+import pytest
+
+from cp_request import Sample, Value
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentReference,
+    TreatmentValueReference
+)
+from transform import NormalizeTransformer
+from transform.normalize import COLLAPSE_DUPLICATES, REPORT_DUPLICATES
+
+
+@pytest.fixture
+def overlapping_block(strain_block, nand_circuit, kan, iptg,
+                      micromolar_unit):
+    return DesignBlock(
+        label='overlapping',
+        definition=SumBlock(block_list=[
+            ProductBlock(block_list=[
+                BlockReference(block=strain_block),
+                GenerateBlock(
+                    treatment=iptg,
+                    attribute_name='concentration',
+                    values=[
+                        Value(value=0, unit=micromolar_unit),
+                        Value(value=25, unit=micromolar_unit)
+                    ])
+            ]),
+            ReplicateBlock(
+                count=2,
+                block=ProductBlock(block_list=[
+                    TreatmentValueReference(
+                        treatment=iptg,
+                        value=Value(value=25.0000000001,
+                                    unit=micromolar_unit)),
+                    TreatmentReference(treatment=kan),
+                    SubjectReference(entity=nand_circuit)
+                ]))
+        ])
+    )
+
+
+class TestNormalize:
+
+    def test_subject_reference(self, nand_circuit):
+        block = DesignBlock(
+            label='subject',
+            definition=SubjectReference(entity=nand_circuit))
+        terms = list(block.transform(NormalizeTransformer()))
+        assert terms == [
+            ProductBlock(block_list=[SubjectReference(entity=nand_circuit)])
+        ]
+
+    def test_sum_block(self, strain_block, nand_circuit,
+                       empty_landing_pads, kan):
+        terms = list(strain_block.transform(NormalizeTransformer()))
+        assert terms == [
+            ProductBlock(block_list=[
+                SubjectReference(entity=nand_circuit),
+                TreatmentReference(treatment=kan)
+            ]),
+            ProductBlock(block_list=[
+                SubjectReference(entity=empty_landing_pads)
+            ])
+        ]
+
+    def test_generate_block(self, iptg, micromolar_unit):
+        values = [
+            Value(value=0, unit=micromolar_unit),
+            Value(value=25, unit=micromolar_unit)
+        ]
+        block = DesignBlock(
+            label='iptg',
+            definition=GenerateBlock(
+                treatment=iptg,
+                attribute_name='concentration',
+                values=values))
+        terms = list(block.transform(NormalizeTransformer()))
+        assert terms == [
+            ProductBlock(block_list=[
+                TreatmentValueReference(treatment=iptg, value=value)
+            ])
+            for value in values
+        ]
+
+    def test_replicate_block(self, nand_circuit):
+        block = DesignBlock(
+            label='replicates',
+            definition=ReplicateBlock(
+                count=3,
+                block=SubjectReference(entity=nand_circuit)))
+        terms = list(block.transform(NormalizeTransformer()))
+        assert len(terms) == 3
+        assert all(
+            term == ProductBlock(block_list=[
+                SubjectReference(entity=nand_circuit)
+            ])
+            for term in terms)
+        assert terms[0] is terms[2]
+
+    def test_replicate_multiplicity(self, nand_circuit, experiment_block):
+        block = DesignBlock(
+            label='replicates',
+            definition=ReplicateBlock(
+                count=3,
+                block=ReplicateBlock(
+                    count=2,
+                    block=SubjectReference(entity=nand_circuit))))
+        transformer = NormalizeTransformer(expand_replicates=False)
+        assert list(block.transform(transformer)) == [
+            (ProductBlock(block_list=[
+                SubjectReference(entity=nand_circuit)
+            ]), 6)
+        ]
+        weighted = list(experiment_block.transform(
+            NormalizeTransformer(expand_replicates=False)))
+        assert sum(count for _, count in weighted) == \
+            experiment_block.cardinality()
+        assert [
+            term for term, count in weighted for _ in range(count)
+        ] == list(experiment_block.transform(NormalizeTransformer()))
+
+    def test_empty_blocks(self, nand_circuit):
+        empty_sum = DesignBlock(
+            label='empty-sum', definition=SumBlock(block_list=[]))
+        assert list(empty_sum.transform(NormalizeTransformer())) == []
+        empty_product = DesignBlock(
+            label='empty-product', definition=ProductBlock(block_list=[]))
+        assert list(empty_product.transform(NormalizeTransformer())) == [
+            ProductBlock(block_list=[])
+        ]
+
+    def test_experiment(self, experiment_block, nand_circuit,
+                        empty_landing_pads, kan, iptg, timepoint,
+                        micromolar_unit, hour_unit):
+        terms = experiment_block.transform(NormalizeTransformer())
+        first = next(terms)
+        assert first == ProductBlock(block_list=[
+            SubjectReference(entity=nand_circuit),
+            TreatmentReference(treatment=kan),
+            TreatmentValueReference(
+                treatment=iptg,
+                value=Value(value=0, unit=micromolar_unit)),
+            TreatmentValueReference(
+                treatment=timepoint,
+                value=Value(value=5, unit=hour_unit))
+        ])
+        rest = list(terms)
+        assert len(rest) == 2 * 2 * 3 * 2 - 1
+        assert len(rest) + 1 == experiment_block.cardinality()
+        assert rest[-1] == ProductBlock(block_list=[
+            SubjectReference(entity=empty_landing_pads),
+            TreatmentValueReference(
+                treatment=iptg,
+                value=Value(value=250, unit=micromolar_unit)),
+            TreatmentValueReference(
+                treatment=timepoint,
+                value=Value(value=18, unit=hour_unit))
+        ])
+        for term in rest:
+            assert all(
+                isinstance(block, (SubjectReference, TreatmentReference))
+                for block in term.block_list)
+
+    def test_sample_at(self, experiment_block):
+        terms = experiment_block.transform(NormalizeTransformer())
+        for index, term in enumerate(terms):
+            assert experiment_block.sample_at(index) == Sample.create_from(
+                block_list=term.block_list)
+
+    def test_samples(self, experiment_block):
+        terms = experiment_block.transform(NormalizeTransformer())
+        assert list(experiment_block.samples()) == [
+            Sample.create_from(block_list=term.block_list) for term in terms
+        ]
+
+    def test_referenced_block_kept(self, strain_block, iptg,
+                                   micromolar_unit):
+        block = DesignBlock(
+            label='shared',
+            definition=ProductBlock(block_list=[
+                GenerateBlock(
+                    treatment=iptg,
+                    attribute_name='concentration',
+                    values=[
+                        Value(value=0, unit=micromolar_unit),
+                        Value(value=25, unit=micromolar_unit),
+                        Value(value=250, unit=micromolar_unit)
+                    ]),
+                BlockReference(block=strain_block),
+                ReplicateBlock(
+                    count=2,
+                    block=BlockReference(block=strain_block))
+            ])
+        )
+        transformer = NormalizeTransformer()
+        terms = list(block.transform(transformer))
+        assert len(terms) == block.cardinality()
+        assert terms == [
+            ProductBlock(block_list=list(term)) for term in block.definition.terms(0, block.cardinality())
+        ]
+        assert transformer.symbol_table['strains'] is strain_block
+
+    def test_measurement(self, request_object, experiment_block):
+        transformer = NormalizeTransformer()
+        terms = [
+            list(measurement.transform(transformer))
+            for measurement in request_object.measurements
+        ]
+        assert terms[0] == terms[1]
+        assert terms[0] == list(
+            experiment_block.transform(NormalizeTransformer()))
+        assert 'experiment' in transformer.symbol_table
+
+    def test_request(self, request_object, experiment_block):
+        transformer = NormalizeTransformer()
+        normalized = request_object.transform(transformer)
+        assert normalized.subjects == request_object.subjects
+        assert normalized.treatments == request_object.treatments
+        assert [block.label for block in normalized.designs] == [
+            'strains', 'experiment']
+        strains, experiment = normalized.designs
+        assert isinstance(experiment.definition, SumBlock)
+        assert experiment.definition.block_list == [
+            ReplicateBlock(count=count, block=product)
+            for product, count in experiment_block.transform(
+                NormalizeTransformer(expand_replicates=False))
+        ]
+        assert list(experiment.samples()) == list(experiment_block.samples())
+        assert strains.cardinality() == 2
+        for measurement in normalized.measurements:
+            assert measurement.block.block is experiment
+
+    def test_report_duplicates(self, overlapping_block):
+        transformer = NormalizeTransformer(deduplicate=REPORT_DUPLICATES)
+        terms = list(overlapping_block.transform(transformer))
+        assert terms == list(
+            overlapping_block.transform(NormalizeTransformer()))
+        duplicates = transformer.duplicates['overlapping']
+        assert list(duplicates.values()) == [[1, 2]]
+        key = list(duplicates.keys())[0]
+        assert key == Sample.create_from(block_list=terms[1].block_list).key()
+
+    def test_collapse_duplicates(self, overlapping_block):
+        transformer = NormalizeTransformer(
+            deduplicate=COLLAPSE_DUPLICATES, expand_replicates=False)
+        terms = list(overlapping_block.transform(transformer))
+        assert [count for _, count in terms] == [1, 3, 1, 1]
+        assert len(transformer.duplicates['overlapping']) == 1
+        keys = [
+            Sample.create_from(block_list=term.block_list).key()
+            for term, _ in terms
+        ]
+        assert len(set(keys)) == len(keys)
+
+    def test_unknown_deduplicate_mode(self):
+        with pytest.raises(ValueError):
+            NormalizeTransformer(deduplicate='drop')
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cp_request import Value
+from cp_request.design import DesignBlock, GenerateBlock
+from transform import (
+    NormalizeTransformer,
+    dependency_levels,
+    normalize_request
+)
+from transform.normalize import COLLAPSE_DUPLICATES
+
+
+@pytest.fixture
+def independent_block(iptg, micromolar_unit):
+    return DesignBlock(
+        label='independent',
+        definition=GenerateBlock(
+            treatment=iptg,
+            attribute_name='concentration',
+            values=[
+                Value(value=0, unit=micromolar_unit),
+                Value(value=25, unit=micromolar_unit)
+            ]))
+
+
+def definitions(request):
+    return [block.definition for block in request.designs]
+
+
+class TestParallelNormalize:
+
+    def test_dependency_levels(self, strain_block, experiment_block,
+                               independent_block):
+        levels = dependency_levels([experiment_block, independent_block])
+        assert [[block.label for block in level] for level in levels] == [
+            ['independent', 'strains'], ['experiment']]
+        assert dependency_levels([]) == []
+
+    def test_normalize_request(self, request_object, independent_block):
+        request_object.designs.append(independent_block)
+        expected = request_object.transform(NormalizeTransformer())
+        normalized = normalize_request(request_object, max_workers=2)
+        assert [block.label for block in normalized.designs] == [
+            'strains', 'experiment', 'independent']
+        assert definitions(normalized) == definitions(expected)
+        for measurement in normalized.measurements:
+            assert measurement.block.block is normalized.designs[1]
+
+    def test_executor(self, request_object):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            normalized = normalize_request(
+                request_object, executor=executor,
+                deduplicate=COLLAPSE_DUPLICATES)
+        assert definitions(normalized) == definitions(
+            request_object.transform(NormalizeTransformer()))
@@ -0,0 +1,119 @@
+from cp_request import Value
+from cp_request.design import (
+    BlockReference,
+    DesignBlock,
+    GenerateBlock,
+    ProductBlock,
+    ReplicateBlock,
+    SubjectReference,
+    SumBlock,
+    TreatmentValueReference
+)
+from transform import SimplifyTransformer, designs_equivalent
+
+
+def simplify(block):
+    simplified = block.transform(SimplifyTransformer())
+    assert simplified.label == block.label
+    assert list(simplified.samples()) == list(block.samples())
+    return simplified.definition
+
+
+class TestSimplify:
+
+    def test_flatten(self, strain_block, iptg, timepoint, micromolar_unit,
+                     hour_unit, nand_circuit):
+        value = TreatmentValueReference(
+            treatment=iptg, value=Value(value=0, unit=micromolar_unit))
+        time = TreatmentValueReference(
+            treatment=timepoint, value=Value(value=5, unit=hour_unit))
+        subject = SubjectReference(entity=nand_circuit)
+        block = DesignBlock(
+            label='nested',
+            definition=ProductBlock(block_list=[
+                ProductBlock(block_list=[
+                    subject,
+                    ProductBlock(block_list=[]),
+                    SumBlock(block_list=[value])
+                ]),
+                ProductBlock(block_list=[time])
+            ]))
+        assert simplify(block) == ProductBlock(
+            block_list=[subject, value, time])
+
+        block = DesignBlock(
+            label='nested',
+            definition=SumBlock(block_list=[
+                SumBlock(block_list=[value, SumBlock(block_list=[])]),
+                ProductBlock(block_list=[SumBlock(block_list=[time])])
+            ]))
+        assert simplify(block) == SumBlock(block_list=[value, time])
+
+    def test_empty(self, strain_block, nand_circuit):
+        block = DesignBlock(
+            label='empty',
+            definition=ProductBlock(block_list=[
+                BlockReference(block=strain_block),
+                ReplicateBlock(count=3, block=SumBlock(block_list=[]))
+            ]))
+        assert simplify(block) == SumBlock(block_list=[])
+        block = DesignBlock(
+            label='unit',
+            definition=ProductBlock(block_list=[
+                ProductBlock(block_list=[]), SumBlock(block_list=[
+                    ProductBlock(block_list=[])])
+            ]))
+        assert simplify(block) == ProductBlock(block_list=[])
+
+    def test_replicates(self, strain_block):
+        reference = BlockReference(block=strain_block)
+        block = DesignBlock(
+            label='replicates',
+            definition=ReplicateBlock(
+                count=2,
+                block=ReplicateBlock(
+                    count=1,
+                    block=ReplicateBlock(count=3, block=reference))))
+        simplified = simplify(block)
+        assert simplified == ReplicateBlock(count=6, block=reference)
+        assert simplified.block.block is not strain_block
+        assert simplified.block.block == strain_block
+
+    def test_merge_generate(self, iptg, timepoint, micromolar_unit,
+                            hour_unit):
+        def generate(treatment, unit, values):
+            return GenerateBlock(
+                treatment=treatment,
+                attribute_name='concentration',
+                values=[Value(value=value, unit=unit) for value in values])
+
+        block = DesignBlock(
+            label='generated',
+            definition=SumBlock(block_list=[
+                generate(iptg, micromolar_unit, [0, 25]),
+                SumBlock(block_list=[
+                    generate(iptg, micromolar_unit, [250]),
+                    generate(timepoint, hour_unit, [5])
+                ]),
+                generate(iptg, micromolar_unit, [500]),
+                generate(iptg, micromolar_unit, [])
+            ]))
+        assert simplify(block) == SumBlock(block_list=[
+            generate(iptg, micromolar_unit, [0, 25, 250]),
+            generate(timepoint, hour_unit, [5]),
+            generate(iptg, micromolar_unit, [500])
+        ])
+
+    def test_experiment(self, experiment_block):
+        simplified = simplify(experiment_block)
+        assert designs_equivalent(simplified, experiment_block.definition)
+
+    def test_request(self, request_object):
+        simplified = request_object.transform(SimplifyTransformer())
+        assert [block.label for block in simplified.designs] == [
+            'strains', 'experiment']
+        for measurement in simplified.measurements:
+            assert measurement.block.block is simplified.designs[1]
+        experiment = simplified.designs[1]
+        replicated = experiment.definition.block_list[0].block
+        assert replicated.block_list[0].block is simplified.designs[0]